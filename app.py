@@ -0,0 +1,286 @@
+import time
+import streamlit as st
+from src import instrumentation
+from src.advisor_engine import generate_recommendation, load_heuristics, load_pricing, load_resource_configs
+from src.catalog import catalog_version
+from src.justification import MODEL_SIZES, TASK_TYPES
+from src.recommendation_ids import recommendation_id
+from src.simulator import create_animated_recommendation
+from src.time_model import DATASET_MULTIPLIERS
+
+PRIORITIES = ["Minimize Cost", "Balanced", "Minimize Time"]
+
+CHARTS = ["Cost vs. Time", "Resources", "Performance", "Sensitivity"]
+
+QUANTIZATIONS = ["fp16", "int8", "int4"]
+
+# Inputs that do not change the recommendation and are left out of cache keys
+DISPLAY_ONLY_INPUTS = ("framework",)
+
+@st.cache_resource
+def load_catalogs():
+    """
+    Load the resource catalog, heuristics and pricing once per server process
+
+    The engine reuses the parsed catalogs across sessions and reruns; they
+    are never mutated.
+
+    Returns:
+        dict: "resources", "heuristics", "pricing" and their "version"
+    """
+    resources = load_resource_configs()
+    pricing = load_pricing()
+    return {
+        "resources": resources,
+        "heuristics": load_heuristics(),
+        "pricing": pricing,
+        "version": f"{catalog_version(resources)}+{catalog_version(pricing)}"
+    }
+
+def normalize_inputs(input_data):
+    """
+    Reduce user inputs to a canonical, hashable cache key
+
+    Unset optional values are dropped, zero budgets and deadlines mean "no
+    limit", and numbers are rounded so that equivalent widget states share
+    one cache entry.
+
+    Args:
+        input_data: Dictionary of user inputs
+
+    Returns:
+        tuple: Sorted (name, value) pairs
+    """
+    normalized = {}
+    for name, value in input_data.items():
+        if name in DISPLAY_ONLY_INPUTS or value is None:
+            continue
+        if name in ("budget_limit", "deadline") and not value:
+            continue
+        if isinstance(value, float):
+            value = round(value, 4)
+        normalized[name] = value
+    return tuple(sorted(normalized.items()))
+
+def display_inputs(input_data):
+    """
+    Get the inputs that normalize_inputs leaves out of cache keys
+
+    Args:
+        input_data: Dictionary of user inputs
+
+    Returns:
+        dict: The DISPLAY_ONLY_INPUTS that are set
+    """
+    return {name: input_data[name] for name in DISPLAY_ONLY_INPUTS if input_data.get(name) is not None}
+
+def engine_input(key, display=None):
+    """
+    Rebuild the engine input dictionary from a normalized key
+
+    Args:
+        key: Result of normalize_inputs
+        display: Result of display_inputs (optional)
+
+    Returns:
+        dict: Input data with every key the engine requires
+    """
+    input_data = {"budget_limit": None, "deadline": None}
+    input_data.update(key)
+    input_data.update(display or {})
+    return input_data
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def cached_recommendation(key, version, _display=None):
+    """
+    Generate a recommendation, memoized on normalized inputs and catalogs
+
+    Args:
+        key: Result of normalize_inputs
+        version: Catalog version from load_catalogs
+        _display: Result of display_inputs; sent to the engine but, like
+            every underscored argument, left out of the cache key
+
+    Returns:
+        dict: Recommendation
+    """
+    catalogs = load_catalogs()
+    return generate_recommendation(engine_input(key, _display), catalogs["resources"], catalogs["pricing"])
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def cached_chart(chart, key, version):
+    """
+    Build one chart for a recommendation, memoized like the recommendation
+
+    Args:
+        chart: Chart name from CHARTS
+        key: Result of normalize_inputs
+        version: Catalog version from load_catalogs
+
+    Returns:
+        Plotly figure object, or None if the chart does not apply
+    """
+    from src import visualizations
+
+    recommendation = cached_recommendation(key, version)
+    alternatives = recommendation["alternatives"]
+
+    if chart == "Cost vs. Time":
+        return visualizations.create_cost_time_comparison(recommendation, alternatives)
+    if chart == "Resources":
+        return visualizations.create_resource_comparison_chart(recommendation, alternatives)
+    if chart == "Performance":
+        return visualizations.create_performance_radar_chart(recommendation, alternatives, load_catalogs()["resources"])
+
+    input_data = engine_input(key)
+    if input_data["task_type"] == "Real-time Inference":
+        return None
+
+    from src.sensitivity import sweep_budget
+    sweep = sweep_budget(input_data, resources=load_catalogs()["resources"])
+    return visualizations.create_sensitivity_chart(sweep)
+
+def report_server_time(name, start):
+    """
+    Show and record the server time of one interaction
+
+    Args:
+        name: Name of the rerun fragment
+        start: perf_counter value when the fragment started
+    """
+    seconds = time.perf_counter() - start
+    if instrumentation.is_enabled():
+        instrumentation.record(f"app.{name}", seconds)
+    st.caption(f"Server time: {seconds * 1000:.1f} ms")
+
+def workload_form(resources, heuristics):
+    """
+    Render the workload inputs
+
+    Args:
+        resources: Resource configuration data
+        heuristics: Heuristic rules, whose dataset size adjustments list
+            the dataset sizes offered
+
+    Returns:
+        dict: User inputs
+    """
+    left, right = st.columns(2)
+    with left:
+        task_type = st.selectbox("Task type", TASK_TYPES, key="task_type")
+        model_size = st.selectbox("Model size", MODEL_SIZES, index=1, key="model_size")
+        # Smallest first; the time model also accepts older aliases
+        dataset_sizes = [size for size in DATASET_MULTIPLIERS if size in heuristics["dataset_size_adjustments"]]
+        dataset_size = st.selectbox("Dataset size", dataset_sizes, index=1, key="dataset_size")
+        framework = st.selectbox("Framework", resources["frameworks"], key="framework")
+    with right:
+        priority = st.radio("Priority", PRIORITIES, index=1, key="priority")
+        budget_limit = st.number_input("Hourly budget ($, 0 for none)", min_value=0.0, step=1.0, key="budget_limit")
+        deadline = st.number_input("Deadline (hours, 0 for none)", min_value=0.0, step=1.0, key="deadline")
+        constraints = st.text_area(
+            "Hard constraints (one per line)", placeholder="gpu_type != H100\nregion in europe-west", key="constraints"
+        )
+
+    input_data = {
+        "task_type": task_type,
+        "model_size": model_size,
+        "dataset_size": dataset_size,
+        "framework": framework,
+        "priority": priority,
+        "budget_limit": budget_limit,
+        "deadline": deadline
+    }
+
+    # A tuple keeps the input hashable for the cache key
+    clauses = tuple(line.strip() for line in constraints.splitlines() if line.strip())
+    if clauses:
+        input_data["constraints"] = clauses
+
+    if task_type == "Real-time Inference":
+        rate = st.number_input("Requests per second (0 to size by heuristics)", min_value=0.0, step=1.0, key="request_rate")
+        if rate:
+            input_data["request_rate"] = rate
+            input_data["latency_target_ms"] = st.number_input(
+                "Latency target (ms)", min_value=10.0, value=1000.0, step=50.0, key="latency_target_ms"
+            )
+            scale_out = st.number_input("Scale-out target (s, 0 for none)", min_value=0.0, step=30.0, key="scale_out_seconds")
+            if scale_out:
+                input_data["scale_out_seconds"] = scale_out
+
+    if task_type == "Batch Inference":
+        items = st.number_input("Items to process (0 to size by heuristics)", min_value=0, step=1000, key="item_count")
+        if items:
+            input_data["item_count"] = items
+            input_data["quantization"] = st.selectbox("Weight quantization", QUANTIZATIONS, key="quantization")
+
+    return input_data
+
+@st.fragment
+def advisor_panel():
+    """
+    Inputs and recommendation; an input change reruns only this fragment
+    """
+    start = time.perf_counter()
+    catalogs = load_catalogs()
+
+    st.header("Workload")
+    input_data = workload_form(catalogs["resources"], catalogs["heuristics"])
+    key = normalize_inputs(input_data)
+    display = display_inputs(input_data)
+
+    try:
+        recommendation = cached_recommendation(key, catalogs["version"], display)
+    except ValueError as error:
+        # Invalid or unsatisfiable hard constraints
+        st.error(str(error))
+        return
+
+    st.header("Recommendation")
+    st.markdown(create_animated_recommendation(recommendation), unsafe_allow_html=True)
+    if "estimated_total_cost" in recommendation:
+        st.metric("Estimated total cost", f"${recommendation['estimated_total_cost']:,.2f}")
+    for line in recommendation["justification"]:
+        st.markdown(f"- {line}")
+    # The ID hashes exactly what the engine was sent, as the API would
+    identifier = recommendation_id(engine_input(key, display), catalogs["resources"], catalogs["pricing"])
+    st.markdown(f"Recommendation ID: `{identifier}`")
+
+    report_server_time("advisor_panel", start)
+    chart_panel(key, catalogs["version"])
+
+@st.fragment
+def chart_panel(key, version):
+    """
+    Chart selector; switching charts reruns and builds only the chosen one
+
+    Args:
+        key: Result of normalize_inputs
+        version: Catalog version from load_catalogs
+    """
+    start = time.perf_counter()
+
+    st.header("Comparison")
+    chart = st.segmented_control("Chart", CHARTS, default=CHARTS[0], key="chart") or CHARTS[0]
+
+    figure = cached_chart(chart, key, version)
+    if figure is None:
+        st.info("This chart does not apply to the current workload.")
+    else:
+        st.plotly_chart(figure, width="stretch")
+
+    report_server_time("chart_panel", start)
+
+def main():
+    """
+    Render the advisor page
+    """
+    st.set_page_config(page_title="FlexAI Workload Configuration Advisor", page_icon="static/images/favicon.ico", layout="wide")
+
+    with open("static/css/advisor_style.css") as f:
+        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+
+    st.title("FlexAI Workload Configuration Advisor")
+    advisor_panel()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Microbenchmarks for the advisor engine, utilities and visualizations.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # compare against baseline
+    python benchmarks/run_benchmarks.py --update-baseline
+    python benchmarks/run_benchmarks.py --filter engine --threshold 0.3
+
+Every benchmark reports the median seconds per operation over several
+repeats. A benchmark regresses when its median is slower than the stored
+baseline by more than the threshold; the script then exits with status 1.
+Baselines are machine-specific, so refresh them when the reference
+machine changes.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+sys.path.insert(0, REPO_ROOT)
+
+TASK_TYPES = ["Training", "Fine-tuning", "Batch Inference", "Real-time Inference"]
+MODEL_SIZES = ["Small", "Medium", "Large", "XL"]
+DATASET_SIZES = ["Small (<1GB)", "Medium (1GB-10GB)", "Large (100GB-1TB)", "Very Large (>1TB)"]
+PRIORITIES = ["Minimize Cost", "Balanced", "Minimize Time"]
+BUDGET_LIMITS = [None, 10.0]
+
+# Thread counts of the threaded throughput benchmarks
+THREAD_COUNTS = [1, 8, 64]
+
+def input_grid():
+    """
+    Build every combination of the categorical advisor inputs
+
+    Returns:
+        list: Input dictionaries
+    """
+    return [
+        {
+            "task_type": task_type,
+            "model_size": model_size,
+            "dataset_size": dataset_size,
+            "framework": "PyTorch",
+            "priority": priority,
+            "budget_limit": budget_limit,
+            "deadline": None
+        }
+        for task_type, model_size, dataset_size, priority, budget_limit in itertools.product(
+            TASK_TYPES, MODEL_SIZES, DATASET_SIZES, PRIORITIES, BUDGET_LIMITS
+        )
+    ]
+
+def build_benchmarks():
+    """
+    Create the benchmark cases
+
+    Returns:
+        dict: Benchmark name -> (callable, operations per call)
+    """
+    from src.advisor_engine import generate_recommendation, calculate_estimates, load_resource_configs
+    from src.utils import calculate_total_cost, get_alt_time_estimate
+    from src.sensitivity import sweep_budget
+    from src.recommendation_ids import canonical_json, entity_tag, recommendation_id, respond
+    from src import visualizations
+
+    grid = input_grid()
+    resources = load_resource_configs()
+    sample_input = {
+        "task_type": "Training",
+        "model_size": "Large",
+        "dataset_size": "Medium (1GB-10GB)",
+        "framework": "PyTorch",
+        "priority": "Balanced",
+        "budget_limit": None,
+        "deadline": None
+    }
+    recommendation = generate_recommendation(sample_input, resources)
+    alternatives = recommendation["alternatives"]
+    budget_option = alternatives[0]
+    sweep = sweep_budget(sample_input, resources=resources)
+    sample_tag = entity_tag(recommendation_id(sample_input, resources))
+
+    def run_grid():
+        for input_data in grid:
+            generate_recommendation(input_data)
+
+    def run_batch():
+        # Batch callers load the catalog once and pass it to every call
+        for input_data in grid:
+            generate_recommendation(input_data, resources)
+
+    def threaded(threads):
+        # The pool is created here so that starting threads is not timed
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+        chunks = [grid[start::threads] for start in range(threads)]
+
+        def run_chunk(chunk):
+            for input_data in chunk:
+                generate_recommendation(input_data, resources)
+
+        def run_threaded():
+            for future in [executor.submit(run_chunk, chunk) for chunk in chunks]:
+                future.result()
+
+        return run_threaded
+
+    def run_estimates():
+        config = {"gpu_type": "NVIDIA A100", "gpu_count": 4, "instance_type": "flex-standard"}
+        calculate_estimates(config, "Training", "Large", "Medium (1GB-10GB)", resources)
+
+    return {
+        "engine.generate_recommendation_grid": (run_grid, len(grid)),
+        # Stored as seconds per recommendation so that larger always means slower
+        "engine.batch_throughput": (run_batch, len(grid)),
+        **{
+            f"engine.threaded_throughput_{threads}": (threaded(threads), len(grid))
+            for threads in THREAD_COUNTS
+        },
+        "engine.calculate_estimates": (run_estimates, 1),
+        "engine.sweep_budget": (lambda: sweep_budget(sample_input, resources=resources), 1),
+        "ids.canonical_json": (lambda: canonical_json(recommendation), 1),
+        "ids.recommendation_id": (lambda: recommendation_id(sample_input, resources), 1),
+        # A dashboard poll whose copy is current
+        "ids.respond_not_modified": (lambda: respond(sample_input, sample_tag, resources), 1),
+        "utils.calculate_total_cost": (lambda: calculate_total_cost(5.78, "3.5 hours", return_numeric=True), 1),
+        "utils.get_alt_time_estimate": (lambda: get_alt_time_estimate(recommendation, budget_option), 1),
+        "viz.create_cost_time_comparison": (
+            lambda: visualizations.create_cost_time_comparison(recommendation, alternatives), 1
+        ),
+        "viz.create_resource_comparison_chart": (
+            lambda: visualizations.create_resource_comparison_chart(recommendation, alternatives), 1
+        ),
+        "viz.create_performance_radar_chart": (
+            lambda: visualizations.create_performance_radar_chart(recommendation, alternatives, resources), 1
+        ),
+        "viz.create_sensitivity_chart": (lambda: visualizations.create_sensitivity_chart(sweep), 1),
+    }
+
+def time_callable(func, ops_per_call, repeat, min_time=0.2):
+    """
+    Time a callable and return the median seconds per operation
+
+    Args:
+        func: Callable to time
+        ops_per_call: Number of operations performed by one call
+        repeat: Number of timing repeats
+        min_time: Minimum seconds per repeat used to pick the loop count
+
+    Returns:
+        float: Median seconds per operation
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    samples = timer.repeat(repeat=repeat, number=number)
+    return statistics.median(samples) / (number * ops_per_call)
+
+def time_cold_import(repeat, module="src"):
+    """
+    Time importing the package in a fresh interpreter
+
+    Args:
+        repeat: Number of interpreter launches
+        module: Module to import
+
+    Returns:
+        float: Median seconds for the import, excluding interpreter start-up
+    """
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        samples.append(float(output.strip()))
+    return statistics.median(samples)
+
+def run(name_filter=None, repeat=5):
+    """
+    Run all benchmarks matching the filter
+
+    Args:
+        name_filter: Substring that benchmark names must contain
+        repeat: Number of timing repeats
+
+    Returns:
+        dict: Benchmark name -> median seconds per operation
+    """
+    results = {}
+
+    cold_start = {
+        "import.cold_start_src": "src",
+        "import.cold_start_engine": "src.advisor_engine",
+    }
+    for name, module in cold_start.items():
+        if name_filter is None or name_filter in name:
+            results[name] = time_cold_import(repeat, module)
+
+    for name, (func, ops_per_call) in build_benchmarks().items():
+        if name_filter is None or name_filter in name:
+            results[name] = time_callable(func, ops_per_call, repeat)
+
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against stored baselines
+
+    Args:
+        results: Benchmark name -> seconds per operation
+        baseline: Benchmark name -> baseline seconds per operation
+        threshold: Allowed relative slowdown (0.2 means 20%)
+
+    Returns:
+        list: Names of regressed benchmarks
+    """
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            status = "new"
+        else:
+            ratio = seconds / reference
+            status = f"{ratio:.2f}x"
+            if ratio > 1 + threshold:
+                status += "  REGRESSION"
+                regressions.append(name)
+        print(f"{name:45s} {_format_seconds(seconds):>12s}  {status}")
+
+        if name == "engine.batch_throughput" or name.startswith("engine.threaded_throughput_"):
+            print(f"{'':45s} {1 / seconds:>10.0f}/s")
+
+    return regressions
+
+def _format_seconds(seconds):
+    """
+    Format a duration with an appropriate unit
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        str: Formatted duration
+    """
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run advisor microbenchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    args = parser.parse_args()
+
+    # Catalog paths are relative to the repository root
+    os.chdir(REPO_ROOT)
+
+    start = time.perf_counter()
+    results = run(args.filter, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    print(f"\n{len(results)} benchmarks in {time.perf_counter() - start:.1f}s")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(baseline.items()))
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,28 @@
 # Import main modules to make them available through the package
 from .advisor_engine import generate_recommendation, apply_heuristics, adjust_for_constraints
-from .visualizations import create_cost_time_comparison, create_resource_comparison_chart
-from .simulator import simulate_advisor_processing
-from .utils import calculate_total_cost, hex_to_rgba
\ No newline at end of file
+from .utils import calculate_total_cost, hex_to_rgba
+
+# Modules that pull in NumPy, plotly, pandas or streamlit are imported on
+# first attribute access so that headless consumers of the engine only pay
+# for the standard library
+_LAZY_ATTRIBUTES = {
+    "create_cost_time_comparison": ".visualizations",
+    "create_resource_comparison_chart": ".visualizations",
+    "create_sensitivity_chart": ".visualizations",
+    "simulate_advisor_processing": ".simulator",
+    "sweep_budget": ".sensitivity",
+    "sweep_deadline": ".sensitivity",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,8 +1,22 @@
-import json
 import os
 import datetime
 from .utils import calculate_total_cost
+from .instrumentation import timed
+from .catalog import SHARED_CATALOG_ENV, FrozenDict, load_catalog
+from .justification import render_justification
+from .time_model import MAX_GPU_COUNT, MAX_SERVING_GPU_COUNT, format_hours
+from .deadline import deadline_to_hours, solve_deadline, solve_flop_deadline
+from .flops import estimate_flop_hours, has_flop_inputs
+from .topology import estimate_cluster_hours, parallel_layout
+from .storage import dataset_gb, plan_storage
+from .placement import DEFAULT_DATA_REGION, budget_price_multiplier, plan_region
+from .techniques import flop_inputs, right_size, technique_factors
+from .startup import cold_start_hours, plan_warm_pool, startup_latency
 
+# Fields an alternative takes from the recommendation before changing them
+ALTERNATIVE_FIELDS = ("gpu_type", "gpu_count", "instance_type", "region", "estimated_cost", "estimated_time")
+
+@timed("catalog_load")
 def load_resource_configs(file_path="data/resource_configs.json"):
     """
     Load resource configurations from JSON file
@@ -14,8 +28,7 @@ def load_resource_configs(file_path="data/resource_configs.json"):
         dict: Resource configurations
     """
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return load_catalog(file_path)
     except FileNotFoundError:
         # Return default configs if file not found
         return {
@@ -26,6 +39,9 @@ def load_resource_configs(file_path="data/resource_configs.json"):
                     "relative_performance": 1.0,
                     "hourly_cost": 0.76,
                     "suitable_for": ["Inference", "Small Training"],
+                    "peak_tflops": {"fp32": 8.1, "fp16": 65, "int8": 130},
+                    "memory_gb_per_s": 320,
+                    "startup_seconds": 20,
                     "availability": "High"
                 },
                 "NVIDIA A10G": {
@@ -34,6 +50,9 @@ def load_resource_configs(file_path="data/resource_configs.json"):
                     "relative_performance": 2.5,
                     "hourly_cost": 1.40,
                     "suitable_for": ["Training", "Fine-tuning", "Inference"],
+                    "peak_tflops": {"fp32": 31.2, "tf32": 62.5, "fp16": 125, "bf16": 125, "int8": 250},
+                    "memory_gb_per_s": 600,
+                    "startup_seconds": 25,
                     "availability": "Medium"
                 },
                 "NVIDIA A100": {
@@ -42,6 +61,9 @@ def load_resource_configs(file_path="data/resource_configs.json"):
                     "relative_performance": 5.0,
                     "hourly_cost": 2.89,
                     "suitable_for": ["Large Model Training", "Fine-tuning"],
+                    "peak_tflops": {"fp32": 19.5, "tf32": 156, "fp16": 312, "bf16": 312, "int8": 624},
+                    "memory_gb_per_s": 2039,
+                    "startup_seconds": 45,
                     "availability": "Limited"
                 },
                 "NVIDIA H100": {
@@ -50,6 +72,9 @@ def load_resource_configs(file_path="data/resource_configs.json"):
                     "relative_performance": 8.0,
                     "hourly_cost": 5.76,
                     "suitable_for": ["XL Model Training", "Research"],
+                    "peak_tflops": {"fp32": 67, "tf32": 495, "fp16": 989, "bf16": 989, "fp8": 1979},
+                    "memory_gb_per_s": 3350,
+                    "startup_seconds": 60,
                     "availability": "Very Limited"
                 }
             },
@@ -58,27 +83,57 @@ def load_resource_configs(file_path="data/resource_configs.json"):
                     "description": "Preemptible instances with lower cost but potential interruptions",
                     "cpu_ram": "16-32 GB",
                     "cost_multiplier": 0.6,
+                    "preemptible": True,
                     "reliability": "Medium",
-                    "suitable_for": ["Batch processing", "Non-critical workloads"]
+                    "suitable_for": ["Batch processing", "Non-critical workloads"],
+                    "network_gb_per_s": 1.25,
+                    "startup_seconds": 240,
+                    "topology": {"gpus_per_node": 8, "intra_node_gb_per_s": 32, "inter_node_gb_per_s": 12.5}
                 },
                 "flex-standard": {
                     "description": "Standard reliable instances for most workloads",
                     "cpu_ram": "32-64 GB",
                     "cost_multiplier": 1.0,
+                    "preemptible": False,
                     "reliability": "High",
-                    "suitable_for": ["Training", "Fine-tuning", "Inference"]
+                    "suitable_for": ["Training", "Fine-tuning", "Inference"],
+                    "network_gb_per_s": 3.125,
+                    "startup_seconds": 120,
+                    "topology": {"gpus_per_node": 8, "intra_node_gb_per_s": 300, "inter_node_gb_per_s": 50}
                 },
                 "flex-performance": {
                     "description": "High-performance instances with optimized networking",
                     "cpu_ram": "64-128 GB",
                     "cost_multiplier": 1.4,
+                    "preemptible": False,
                     "reliability": "Very High",
-                    "suitable_for": ["Distributed training", "Critical workloads"]
+                    "suitable_for": ["Distributed training", "Critical workloads"],
+                    "network_gb_per_s": 12.5,
+                    "startup_seconds": 150,
+                    "topology": {"gpus_per_node": 8, "intra_node_gb_per_s": 600, "inter_node_gb_per_s": 400}
+                }
+            },
+            "storage_tiers": {
+                "standard": {
+                    "description": "Object storage streamed to each node",
+                    "read_gb_per_s": 1.0,
+                    "staging_hours": 0
+                },
+                "performance": {
+                    "description": "Parallel file system for data-hungry training",
+                    "read_gb_per_s": 5.0,
+                    "staging_hours": 0
+                },
+                "archive": {
+                    "description": "Cold storage that must be restored before reading",
+                    "read_gb_per_s": 0.2,
+                    "staging_hours": 12
                 }
             },
             "regions": [
                 "us-east", "us-west", "europe-west", "asia-east"
             ],
+            "region_transfer_gb_per_s": 1.25,
             "frameworks": [
                 "PyTorch", "TensorFlow", "JAX", "MXNet"
             ]
@@ -95,36 +150,102 @@ def load_heuristics(file_path="data/heuristics.json"):
         dict: Heuristic rules
     """
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return load_catalog(file_path)
     except FileNotFoundError:
         # Return empty dict if file not found
         return {}
 
-def generate_recommendation(input_data):
+def load_pricing(file_path="data/pricing.json"):
+    """
+    Load pricing data from JSON file
+    
+    Args:
+        file_path (str): Path to the pricing JSON file
+        
+    Returns:
+        dict: Pricing data
+    """
+    try:
+        return load_catalog(file_path)
+    except FileNotFoundError:
+        # Return empty dict if file not found; storage is then priced at zero
+        return {}
+
+def shared_resources(resources):
+    """
+    Follow the catalog published for this host, if there is one
+    
+    With FLEXAI_SHARED_CATALOG set, prices, performance and heuristic rules
+    come from the published arrays (see shared_catalog.published_resources),
+    so every worker switches to a new version as soon as it is published.
+    
+    Args:
+        resources: Resource configuration data
+        
+    Returns:
+        dict: Catalog with published values, or ``resources`` unchanged
+    """
+    if not os.environ.get(SHARED_CATALOG_ENV):
+        return resources
+    # NumPy is only needed for shared catalog arrays
+    from .shared_catalog import published_resources
+    return published_resources(resources)
+
+@timed("generate_recommendation", profile=True)
+def generate_recommendation(input_data, resources=None, pricing=None):
     """
     Generate resource recommendations based on user input.
     
+    Reentrant: the input is only read (through a read-only view), shared
+    catalogs and caches are immutable, and every call builds its result
+    from new objects, so concurrent calls from any number of threads give
+    the same results as serial ones.
+    
     Args:
         input_data: Dictionary containing user inputs
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
         
     Returns:
         Dictionary with recommendations
     """
     # Load resource configurations
-    resources = load_resource_configs()
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+    if pricing is None:
+        pricing = load_pricing()
+    
+    # Stages read the input; a read-only view makes that a guarantee
+    input_data = FrozenDict(input_data)
     
     # Extract input variables
     task_type = input_data["task_type"]
     model_size = input_data["model_size"]
     dataset_size = input_data["dataset_size"]
-    framework = input_data["framework"]
-    priority = input_data["priority"]
-    budget_limit = input_data["budget_limit"]
-    deadline = input_data["deadline"]
     
-    # Default recommendations
-    recommendation = {
+    # Select GPU type, count and instance type
+    recommendation = select_configuration(input_data, resources, pricing)
+    
+    # Calculate cost and time estimates
+    recommendation = calculate_estimates(recommendation, task_type, model_size, dataset_size, resources, input_data, pricing)
+    
+    # Generate justification
+    recommendation["justification"] = generate_justification(recommendation, input_data, resources)
+    
+    # Generate alternatives
+    recommendation["alternatives"] = generate_alternatives(recommendation, input_data, resources)
+    
+    return recommendation
+
+def default_recommendation():
+    """
+    Create the starting recommendation that heuristics are applied to
+    
+    Returns:
+        Dictionary with default recommendation values
+    """
+    return {
         "gpu_type": "NVIDIA A10G",
         "gpu_count": 2,
         "instance_type": "flex-standard",
@@ -134,42 +255,103 @@ def generate_recommendation(input_data):
         "justification": "",
         "alternatives": []
     }
+
+def select_configuration(input_data, resources, pricing=None):
+    """
+    Select the GPU type, GPU count and instance type for a workload
+    
+    Runs the heuristic, priority and constraint stages without computing
+    estimates, justification or alternatives. The hourly budget is checked
+    at the price of the region the job will be placed in (see
+    placement.budget_price_multiplier). Hard constraints are applied before
+    the deadline, traffic and batch stages, which then size within them.
+    
+    Args:
+        input_data: Dictionary containing user inputs
+        resources: Resource configuration data
+        pricing: Pricing data (loaded from disk if omitted)
+        
+    Returns:
+        Recommendation dict with the selected configuration
+    """
+    if pricing is None:
+        pricing = load_pricing()
+    
+    task_type = input_data["task_type"]
+    model_size = input_data["model_size"]
+    dataset_size = input_data["dataset_size"]
+    priority = input_data["priority"]
+    budget_limit = input_data["budget_limit"]
+    deadline = input_data["deadline"]
+    
+    recommendation = default_recommendation()
+    compiled = None
+    if input_data.get("constraints"):
+        # NumPy is only needed for constraint masks
+        from .constraints import compile_constraints
+        compiled = compile_constraints(input_data["constraints"], resources)
+    price_multiplier = budget_price_multiplier(
+        input_data.get("data_region", DEFAULT_DATA_REGION), resources, pricing, constrained_regions(input_data, resources)
+    )
     
     # Apply base heuristics
-    recommendation = apply_heuristics(recommendation, task_type, model_size, dataset_size)
+    recommendation = apply_heuristics(recommendation, task_type, model_size, dataset_size, resources)
     
     # Adjust based on priority
     recommendation = adjust_for_priority(recommendation, task_type, model_size, priority, resources)
     
+    # Shrink to the smaller footprint of efficient training techniques
+    factors = technique_factors(input_data, resources)
+    if factors is not None:
+        recommendation = adjust_for_techniques(recommendation, input_data, factors, resources)
+    
     # Apply constraints
-    recommendation = adjust_for_constraints(recommendation, budget_limit, deadline, resources)
+    recommendation = adjust_for_constraints(recommendation, budget_limit, deadline, resources, price_multiplier)
     
-    # Calculate cost and time estimates
-    recommendation = calculate_estimates(recommendation, task_type, model_size, dataset_size, resources)
+    # Enforce hard constraints on the hardware if any were given
+    if compiled is not None:
+        recommendation = adjust_for_filters(recommendation, input_data, resources, price_multiplier, compiled)
     
-    # Generate justification
-    recommendation["justification"] = generate_justification(recommendation, input_data, resources)
+    # Scale to meet the deadline if one was given
+    recommendation = adjust_for_deadline(
+        recommendation, task_type, model_size, dataset_size, deadline, budget_limit, resources, input_data,
+        price_multiplier, compiled
+    )
     
-    # Generate alternatives
-    recommendation["alternatives"] = generate_alternatives(recommendation, input_data, resources)
+    # Size real-time serving capacity from the traffic profile if one was given
+    recommendation = adjust_for_traffic(recommendation, input_data, resources, compiled)
+    
+    # Size batch inference from its item count if one was given
+    recommendation = adjust_for_batch(recommendation, input_data, resources, price_multiplier, compiled)
     
     return recommendation
 
-def apply_heuristics(recommendation, task_type, model_size, dataset_size):
+@timed("apply_heuristics")
+def apply_heuristics(recommendation, task_type, model_size, dataset_size, resources=None):
     """
     Apply basic heuristic rules based on workload characteristics
     
+    Rules carried by the catalog under "task_type_rules", as a published
+    shared catalog's are (see shared_resources), take precedence over the
+    built-in rules.
+    
     Args:
         recommendation: Initial recommendation dict
         task_type: Type of task (Training, Fine-tuning, etc.)
         model_size: Size of model (Small, Medium, Large, XL)
         dataset_size: Size of dataset
+        resources: Resource configuration data (optional)
         
     Returns:
         Updated recommendation dict
     """
+    rule = (resources or {}).get("task_type_rules", {}).get(task_type, {}).get(model_size)
+    
     # Apply heuristics based on task type
-    if task_type == "Training":
+    if rule is not None:
+        recommendation.update(rule)
+    
+    elif task_type == "Training":
         if model_size == "XL":
             recommendation["gpu_type"] = "NVIDIA H100"
             recommendation["gpu_count"] = 4
@@ -243,12 +425,13 @@ def apply_heuristics(recommendation, task_type, model_size, dataset_size):
     
     # Adjust based on dataset size
     if dataset_size == "Very Large (>1TB)":
-        recommendation["gpu_count"] = min(8, recommendation["gpu_count"] * 2)
+        recommendation["gpu_count"] = min(MAX_GPU_COUNT, recommendation["gpu_count"] * 2)
     elif dataset_size == "Large (100GB-1TB)":
         recommendation["gpu_count"] = min(4, recommendation["gpu_count"] + 1)
     
     return recommendation
 
+@timed("adjust_for_priority")
 def adjust_for_priority(recommendation, task_type, model_size, priority, resources):
     """
     Adjust recommendation based on user priority
@@ -291,71 +474,487 @@ def adjust_for_priority(recommendation, task_type, model_size, priority, resourc
             
         # Increase GPU count if large workload
         if task_type in ["Training", "Fine-tuning"] and model_size in ["Large", "XL"]:
-            recommendation["gpu_count"] = min(8, recommendation["gpu_count"] + 2)
+            recommendation["gpu_count"] = min(MAX_GPU_COUNT, recommendation["gpu_count"] + 2)
     
     return recommendation
 
-def adjust_for_constraints(recommendation, budget_limit, deadline, resources):
+@timed("adjust_for_techniques")
+def adjust_for_techniques(recommendation, input_data, factors, resources):
+    """
+    Adjust recommendation to the training techniques the input enables
+    
+    Techniques such as mixed precision, LoRA/QLoRA and activation
+    checkpointing are enabled by input flags and scale the memory
+    footprint and throughput. Unless minimizing time, the configuration is
+    shrunk to the cheapest one the reduced footprint fits. The factors are
+    stored under ``recommendation["techniques"]`` for the later stages.
+    
+    Args:
+        recommendation: Current recommendation dict
+        input_data: User input data
+        factors: Result of techniques.technique_factors
+        resources: Resource configuration data
+        
+    Returns:
+        Updated recommendation dict
+    """
+    recommendation["techniques"] = factors
+    if input_data["priority"] != "Minimize Time":
+        recommendation = right_size(
+            recommendation, input_data["task_type"], input_data["model_size"],
+            input_data["dataset_size"], factors, resources
+        )
+    
+    return recommendation
+
+@timed("adjust_for_constraints")
+def adjust_for_constraints(recommendation, budget_limit, deadline, resources, price_multiplier=1.0):
     """
     Adjust recommendation based on budget and deadline constraints
     
+    Over budget, the GPU count, GPU type and instance type are stepped down
+    in turn until the hourly cost, priced at the region multiplier, fits
+    or the cheapest configuration is reached.
+    
     Args:
         recommendation: Current recommendation dict
         budget_limit: Maximum hourly budget (if any)
         deadline: Deadline constraint (if any)
         resources: Resource configuration data
+        price_multiplier: Region price multiplier the budget is checked at
         
     Returns:
         Updated recommendation dict
     """
     # Apply budget limit if specified
     if budget_limit:
-        # Estimate cost
-        gpu_hourly_cost = resources["gpu_types"][recommendation["gpu_type"]]["hourly_cost"]
-        instance_multiplier = resources["instance_types"][recommendation["instance_type"]]["cost_multiplier"]
-        estimated_hourly_cost = gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier
+        def estimated_hourly_cost():
+            gpu_hourly_cost = resources["gpu_types"][recommendation["gpu_type"]]["hourly_cost"]
+            instance_multiplier = resources["instance_types"][recommendation["instance_type"]]["cost_multiplier"]
+            return gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier * price_multiplier
         
-        # If over budget, adjust
-        if estimated_hourly_cost > budget_limit:
+        # Step down while over budget, until nothing cheaper is left
+        while estimated_hourly_cost() > budget_limit:
+            before = (recommendation["gpu_type"], recommendation["gpu_count"], recommendation["instance_type"])
+            
             # Try reducing GPU count
             if recommendation["gpu_count"] > 1:
                 recommendation["gpu_count"] -= 1
-            # If still over budget, downgrade GPU type
-            gpu_hourly_cost = resources["gpu_types"][recommendation["gpu_type"]]["hourly_cost"]
-            estimated_hourly_cost = gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier
             
-            if estimated_hourly_cost > budget_limit:
-                if recommendation["gpu_type"] == "NVIDIA H100":
-                    recommendation["gpu_type"] = "NVIDIA A100"
-                elif recommendation["gpu_type"] == "NVIDIA A100":
-                    recommendation["gpu_type"] = "NVIDIA A10G"
-                elif recommendation["gpu_type"] == "NVIDIA A10G":
-                    recommendation["gpu_type"] = "NVIDIA T4"
+            # If still over budget, downgrade GPU type
+            if estimated_hourly_cost() > budget_limit:
+                recommendation["gpu_type"] = next_cheaper_gpu(recommendation["gpu_type"], resources)
             
             # If still over budget, downgrade instance type
-            gpu_hourly_cost = resources["gpu_types"][recommendation["gpu_type"]]["hourly_cost"]
-            estimated_hourly_cost = gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier
-            
-            if estimated_hourly_cost > budget_limit and recommendation["instance_type"] != "flex-economy":
+            if estimated_hourly_cost() > budget_limit and recommendation["instance_type"] != "flex-economy":
                 if recommendation["instance_type"] == "flex-performance":
                     recommendation["instance_type"] = "flex-standard"
                 elif recommendation["instance_type"] == "flex-standard":
                     recommendation["instance_type"] = "flex-economy"
+            
+            if (recommendation["gpu_type"], recommendation["gpu_count"], recommendation["instance_type"]) == before:
+                break
     
-    # Future enhancement: Add deadline-based adjustments
+    # Deadlines are handled by adjust_for_deadline, which needs the workload
     
     return recommendation
 
-def calculate_estimates(recommendation, task_type, model_size, dataset_size, resources):
+def next_cheaper_gpu(gpu_type, resources):
+    """
+    Get the next cheaper GPU type available in the catalog
+    
+    Args:
+        gpu_type: Current GPU type
+        resources: Resource configuration data
+        
+    Returns:
+        str: The most expensive GPU type cheaper than ``gpu_type``, or
+            ``gpu_type`` itself if it is already the cheapest
+    """
+    current_cost = resources["gpu_types"][gpu_type]["hourly_cost"]
+    cheaper = [
+        (gpu["hourly_cost"], name)
+        for name, gpu in resources["gpu_types"].items()
+        if gpu["hourly_cost"] < current_cost
+    ]
+    return max(cheaper)[1] if cheaper else gpu_type
+
+@timed("adjust_for_deadline")
+def adjust_for_deadline(recommendation, task_type, model_size, dataset_size, deadline, budget_limit, resources,
+                        input_data=None, price_multiplier=1.0, compiled=None):
+    """
+    Adjust recommendation so that the job finishes before the deadline
+    
+    If the current configuration is too slow, the cheapest GPU type and
+    count that meets the deadline (on the same instance type and within
+    the budget) is selected. Times include the startup latency of the
+    nodes and come from the same model as the final estimate: the FLOP
+    model when the input describes the job numerically, the size buckets
+    otherwise. The outcome is recorded under
+    ``recommendation["deadline_check"]``.
+    
+    Args:
+        recommendation: Current recommendation dict
+        task_type: Type of task
+        model_size: Size of model
+        dataset_size: Size of dataset
+        deadline: Deadline constraint (if any)
+        budget_limit: Maximum hourly budget (if any)
+        resources: Resource configuration data
+        input_data: User input data (optional, enables FLOP-based times)
+        price_multiplier: Region price multiplier the budget is checked at
+        compiled: Compiled hard constraints the solution must satisfy
+            (see constraints.compile_constraints)
+        
+    Returns:
+        Updated recommendation dict
+    """
+    deadline_hours = deadline_to_hours(deadline)
+    if deadline_hours is None or task_type == "Real-time Inference":
+        return recommendation
+    
+    factors = recommendation.get("techniques")
+    memory_factor = factors["memory_factor"] if factors else 1.0
+    
+    hours, _, _ = compute_hours(recommendation, task_type, model_size, dataset_size, resources, input_data)
+    hours += cold_start_hours(startup_latency(
+        model_size, recommendation["gpu_type"], recommendation["instance_type"], resources
+    ))
+    
+    deadline_check = {"deadline_hours": deadline_hours, "meets_deadline": True}
+    
+    if hours > deadline_hours:
+        # Reserve the slowest GPU type's startup so that any solution fits
+        startup_hours = max(
+            cold_start_hours(startup_latency(model_size, gpu_type, recommendation["instance_type"], resources))
+            for gpu_type in resources["gpu_types"]
+        )
+        if has_flop_inputs(input_data):
+            flop_input, throughput_factor = flop_inputs(input_data, factors) if factors else (input_data, 1.0)
+            solution = solve_flop_deadline(
+                flop_input, model_size, deadline_hours, resources,
+                instance_types=[recommendation["instance_type"]],
+                budget_limit=budget_limit,
+                memory_factor=memory_factor,
+                startup_hours=startup_hours,
+                throughput_factor=throughput_factor,
+                price_multiplier=price_multiplier,
+                compiled=compiled
+            )
+        else:
+            solution = solve_deadline(
+                task_type, model_size, dataset_size, deadline_hours, resources,
+                instance_types=[recommendation["instance_type"]],
+                budget_limit=budget_limit,
+                startup_hours=startup_hours,
+                throughput_factor=factors["throughput_factor"] if factors else 1.0,
+                price_multiplier=price_multiplier,
+                compiled=compiled,
+                memory_factor=memory_factor
+            )
+        
+        if solution["feasible"]:
+            recommendation["gpu_type"] = solution["best"]["gpu_type"]
+            recommendation["gpu_count"] = solution["best"]["gpu_count"]
+        else:
+            deadline_check["meets_deadline"] = False
+            deadline_check["fastest_hours"] = solution["fastest_hours"]
+    
+    recommendation["deadline_check"] = deadline_check
+    
+    return recommendation
+
+@timed("adjust_for_traffic")
+def adjust_for_traffic(recommendation, input_data, resources, compiled=None):
+    """
+    Size a real-time inference deployment from its traffic profile
+    
+    Applies when ``input_data`` has a "request_rate" (requests per second).
+    Optional keys: "tokens_per_request", "prompt_tokens",
+    "latency_target_ms" and "latency_percentile". The capacity plan is
+    stored under ``recommendation["capacity_plan"]``.
+    
+    With a "scale_out_seconds" target, a warm pool is sized for bursts up
+    to "peak_request_rate" (default: the request rate times the
+    heuristics' burst factor) and stored under
+    ``recommendation["warm_pool"]``.
+    
+    The pool is sized for the latency target even when it costs more than
+    the hourly budget; the justification then warns that the budget is
+    exceeded.
+    
+    Args:
+        recommendation: Current recommendation dict
+        input_data: User input data
+        resources: Resource configuration data
+        compiled: Compiled hard constraints the deployment must satisfy
+            (see constraints.compile_constraints)
+        
+    Returns:
+        Updated recommendation dict
+    """
+    if input_data["task_type"] != "Real-time Inference" or input_data.get("request_rate") is None:
+        return recommendation
+    
+    # NumPy is only needed for capacity planning
+    from .realtime import plan_realtime_capacity
+    
+    heuristics = load_heuristics()
+    defaults = heuristics["realtime_inference"]
+    
+    plan = plan_realtime_capacity(
+        input_data["model_size"],
+        input_data["request_rate"],
+        input_data.get("tokens_per_request", defaults["default_tokens_per_request"]),
+        input_data.get("latency_target_ms", defaults["default_latency_target_ms"]),
+        input_data.get("latency_percentile", defaults["default_latency_percentile"]),
+        input_data.get("prompt_tokens", 0),
+        resources,
+        heuristics,
+        instance_type=recommendation["instance_type"],
+        gpu_types=constrained_gpu_types(input_data, resources),
+        compiled=compiled
+    )
+    
+    if plan["feasible"]:
+        recommendation["gpu_type"] = plan["gpu_type"]
+        recommendation["gpu_count"] = plan["gpu_count"]
+        
+        if input_data.get("scale_out_seconds") is not None:
+            peak_plan = plan_realtime_capacity(
+                input_data["model_size"],
+                input_data.get("peak_request_rate", input_data["request_rate"] * defaults["default_burst_factor"]),
+                input_data.get("tokens_per_request", defaults["default_tokens_per_request"]),
+                plan["latency_target_ms"],
+                plan["percentile"],
+                input_data.get("prompt_tokens", 0),
+                resources,
+                heuristics,
+                instance_type=recommendation["instance_type"],
+                gpu_types=[plan["gpu_type"]]
+            )
+            startup = startup_latency(input_data["model_size"], plan["gpu_type"], recommendation["instance_type"], resources)
+            recommendation["warm_pool"] = plan_warm_pool(plan, peak_plan, startup, input_data["scale_out_seconds"], resources)
+    
+    recommendation["capacity_plan"] = plan
+    
+    return recommendation
+
+@timed("adjust_for_batch")
+def adjust_for_batch(recommendation, input_data, resources, price_multiplier=1.0, compiled=None):
+    """
+    Size a batch inference job from its throughput model
+    
+    Applies when ``input_data`` has an "item_count". Optional keys:
+    "tokens_per_item", "prompt_tokens", "quantization" ("fp16", "int8" or
+    "int4"), "batch_size" and "kv_cache_mb_per_token". The GPU type, batch
+    size and GPU count with the lowest cost per million items that fit the
+    budget and deadline are chosen; the plan is stored under
+    ``recommendation["batch_plan"]``.
+    
+    Args:
+        recommendation: Current recommendation dict
+        input_data: User input data
+        resources: Resource configuration data
+        price_multiplier: Region price multiplier the budget is checked at
+        compiled: Compiled hard constraints the plan must satisfy (see
+            constraints.compile_constraints)
+        
+    Returns:
+        Updated recommendation dict
+    """
+    if input_data["task_type"] != "Batch Inference" or input_data.get("item_count") is None:
+        return recommendation
+    
+    # NumPy is only needed for throughput planning
+    from .batch_inference import plan_batch_inference
+    
+    heuristics = load_heuristics()
+    defaults = heuristics["batch_inference"]
+    deadline_hours = deadline_to_hours(input_data["deadline"])
+    gpu_types = constrained_gpu_types(input_data, resources)
+    
+    def plan(deadline_hours, priority):
+        return plan_batch_inference(
+            input_data["model_size"],
+            input_data["item_count"],
+            input_data.get("tokens_per_item", defaults["default_tokens_per_item"]),
+            input_data.get("prompt_tokens", defaults["default_prompt_tokens"]),
+            input_data.get("quantization", defaults["default_quantization"]),
+            input_data.get("batch_size"),
+            deadline_hours,
+            input_data["budget_limit"],
+            priority,
+            resources,
+            heuristics,
+            instance_type=recommendation["instance_type"],
+            gpu_types=gpu_types,
+            kv_cache_mb_per_token=input_data.get("kv_cache_mb_per_token"),
+            price_multiplier=price_multiplier,
+            compiled=compiled
+        )
+    
+    batch_plan = plan(deadline_hours, input_data["priority"])
+    
+    # The plan supersedes the size-bucket deadline check unless no
+    # configuration fits the model at all; a missed deadline falls back to
+    # the fastest plan
+    if deadline_hours is not None and (batch_plan["feasible"] or "fastest_hours" in batch_plan):
+        deadline_check = {"deadline_hours": deadline_hours, "meets_deadline": batch_plan["feasible"]}
+        if not batch_plan["feasible"]:
+            deadline_check["fastest_hours"] = batch_plan["fastest_hours"]
+            batch_plan = plan(None, "Minimize Time")
+        recommendation["deadline_check"] = deadline_check
+    
+    if batch_plan["feasible"]:
+        recommendation["gpu_type"] = batch_plan["gpu_type"]
+        recommendation["gpu_count"] = batch_plan["gpu_count"]
+    
+    recommendation["batch_plan"] = batch_plan
+    
+    return recommendation
+
+@timed("adjust_for_filters")
+def adjust_for_filters(recommendation, input_data, resources, price_multiplier=1.0, compiled=None):
+    """
+    Keep the configuration within the input's hard constraints
+    
+    ``input_data["constraints"]`` is a list of clauses such as
+    "gpu_type != H100", "region in europe-west", "gpu_count <= 4" or
+    "preemptible == false" (see constraints.parse_constraint). An excluded
+    configuration is replaced by the cheapest allowed one that is at least
+    as fast (see constraints.nearest_allowed). The clauses, whether the
+    configuration was replaced and the allowed regions are stored under
+    ``recommendation["constraint_check"]``.
+    
+    Runs before the deadline, traffic and batch stages, which size within
+    the same compiled constraints; the allowed regions do not depend on the
+    hardware, so they stay valid after resizing.
+    
+    Args:
+        recommendation: Current recommendation dict
+        input_data: User input data
+        resources: Resource configuration data
+        price_multiplier: Region price multiplier the budget is checked at
+        compiled: Result of constraints.compile_constraints (compiled from
+            the input if omitted)
+        
+    Returns:
+        Updated recommendation dict
+        
+    Raises:
+        ValueError: If a constraint is invalid or no configuration is allowed
+    """
+    # NumPy is only needed for constraint masks
+    from .constraints import allowed_regions, compile_constraints, nearest_allowed
+    
+    if compiled is None:
+        compiled = compile_constraints(input_data["constraints"], resources)
+    regions = allowed_regions(compiled, recommendation["gpu_type"], recommendation["gpu_count"], recommendation["instance_type"])
+    replaced = not regions
+    
+    if replaced:
+        factors = recommendation.get("techniques")
+        recommendation = nearest_allowed(
+            recommendation, compiled, input_data["task_type"], input_data["model_size"], resources,
+            input_data["budget_limit"], factors["memory_factor"] if factors else 1.0, price_multiplier,
+            MAX_SERVING_GPU_COUNT if input_data["task_type"] == "Real-time Inference" else MAX_GPU_COUNT
+        )
+        regions = allowed_regions(compiled, recommendation["gpu_type"], recommendation["gpu_count"], recommendation["instance_type"])
+    
+    if recommendation["region"] not in regions:
+        recommendation["region"] = regions[0]
+    
+    recommendation["constraint_check"] = {
+        "constraints": list(compiled["constraints"]),
+        "replaced": replaced,
+        "regions": regions
+    }
+    
+    return recommendation
+
+def constrained_gpu_types(input_data, resources):
+    """
+    Get the GPU types the input's hard constraints allow
+    
+    Args:
+        input_data: User input data
+        resources: Resource configuration data
+        
+    Returns:
+        list or None: Allowed GPU types, or None without constraints
+    """
+    if not input_data.get("constraints"):
+        return None
+    from .constraints import allowed_gpu_types, compile_constraints
+    return allowed_gpu_types(compile_constraints(input_data["constraints"], resources))
+
+def constrained_regions(input_data, resources):
+    """
+    Get the regions the input's hard constraints allow
+    
+    Args:
+        input_data: User input data
+        resources: Resource configuration data
+        
+    Returns:
+        list or None: Allowed regions, or None without constraints
+    """
+    if not input_data.get("constraints") or "regions" not in resources:
+        return None
+    from .constraints import compile_constraints, usable_regions
+    return usable_regions(compile_constraints(input_data["constraints"], resources))
+
+@timed("calculate_estimates")
+def calculate_estimates(recommendation, task_type, model_size, dataset_size, resources, input_data=None, pricing=None):
     """
     Calculate cost and time estimates for the recommendation
     
+    When ``input_data`` has a parameter count and a token or byte count,
+    the time is estimated from FLOPs instead of the size buckets and the
+    FLOPs are stored under ``recommendation["estimated_flops"]``. The
+    parallelism layout, including multi-node communication overheads, is
+    stored under ``recommendation["parallelism"]``.
+    
+    If the catalog lists storage tiers, the job time becomes the slower of
+    compute and dataset I/O on the recommended tier; the tier and its cost
+    breakdown are stored under ``recommendation["storage_plan"]`` and the
+    job cost including storage and I/O under
+    ``recommendation["estimated_total_cost"]``.
+    
+    The job is then placed in the region with the lowest total cost (or
+    completion time when minimizing time), weighing cheaper compute against
+    moving the dataset out of its home region ("data_region" in the input).
+    The placement is stored under ``recommendation["placement"]``.
+    
+    Batch inference jobs sized by a throughput model take their time from
+    ``recommendation["batch_plan"]``.
+    
+    Training techniques recorded under ``recommendation["techniques"]``
+    scale the compute time by their throughput factor and the model's
+    footprint in the parallelism layout by their memory factor.
+    
+    The startup latency of the nodes (see startup.startup_latency) is stored
+    under ``recommendation["startup"]``; it precedes data loading and
+    compute, so it is added to the job time and billed at the hourly cost.
+    
+    With ``input_data["estimator"]`` set to "history", the job time is
+    instead the distance-weighted time of the most similar past jobs in a
+    history index (see history_index.history_estimate), stored under
+    ``recommendation["history_estimate"]``.
+    
+    Storage tiers and regions that miss the deadline are avoided when
+    possible, and ``recommendation["deadline_check"]`` is rechecked against
+    the final job time, which it records under "estimated_hours".
+    
     Args:
         recommendation: Current recommendation dict
         task_type: Type of task
         model_size: Size of model
         dataset_size: Size of dataset
         resources: Resource configuration data
+        input_data: User input data (optional, enables FLOP-based estimates)
+        pricing: Pricing data (loaded from disk if omitted)
         
     Returns:
         Updated recommendation dict with estimates
@@ -365,48 +964,138 @@ def calculate_estimates(recommendation, task_type, model_size, dataset_size, res
     instance_multiplier = resources["instance_types"][recommendation["instance_type"]]["cost_multiplier"]
     recommendation["estimated_cost"] = round(gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier, 2)
     
-    # Estimate time based on performance
-    base_hours = {
-        "Training": {"Small": 2, "Medium": 6, "Large": 24, "XL": 72},
-        "Fine-tuning": {"Small": 1, "Medium": 3, "Large": 10, "XL": 24},
-        "Batch Inference": {"Small": 0.5, "Medium": 1, "Large": 3, "XL": 8},
-        "Real-time Inference": {"Small": 0, "Medium": 0, "Large": 0, "XL": 0}  # Real-time is measured differently
-    }
-    
     if task_type == "Real-time Inference":
-        recommendation["estimated_time"] = "Low latency (ms)"
+        plan = recommendation.get("capacity_plan")
+        if plan and plan["feasible"]:
+            recommendation["estimated_time"] = f"p{plan['percentile'] * 100:g} latency {plan['tail_latency_ms']:.0f} ms"
+        else:
+            recommendation["estimated_time"] = "Low latency (ms)"
     else:
-        # Base time for the task and model size
-        base_time = base_hours[task_type][model_size]
-        
-        # Adjust for dataset size
-        dataset_multipliers = {
-            "Small (<1GB)": 0.5,
-            "Medium (1GB-10GB)": 1.0,
-            "Large (10GB-100GB)": 2.0,
-            "Very Large (>100GB)": 4.0
-        }
+        estimated_hours, recommendation["parallelism"], flops = compute_hours(
+            recommendation, task_type, model_size, dataset_size, resources, input_data
+        )
+        if flops is not None:
+            recommendation["estimated_flops"] = flops
+    
+    batch_plan = recommendation.get("batch_plan")
+    if batch_plan and batch_plan["feasible"]:
+        estimated_hours = batch_plan["job_hours"]
+    
+    startup = startup_latency(model_size, recommendation["gpu_type"], recommendation["instance_type"], resources)
+    recommendation["startup"] = startup
+    startup_hours = cold_start_hours(startup, batch_plan)
+    
+    if task_type != "Real-time Inference" and input_data and input_data.get("estimator") == "history":
+        from .history_index import history_estimate
+        history = history_estimate(input_data, recommendation, resources)
+        recommendation["history_estimate"] = history
+        estimated_hours = history["estimated_hours"]
+        # Recorded durations of past jobs already include their startup
+        startup_hours = 0.0
+    
+    if task_type != "Real-time Inference":
+        if pricing is None:
+            pricing = load_pricing()
+        deadline_hours = deadline_to_hours((input_data or {}).get("deadline"))
         
-        # Adjust for GPU performance and count
-        performance_factor = resources["gpu_types"][recommendation["gpu_type"]]["relative_performance"]
-        parallelization_efficiency = 0.7  # Diminishing returns with more GPUs
+        if "storage_tiers" in resources:
+            storage_plan = plan_storage(
+                dataset_size, estimated_hours, recommendation["estimated_cost"],
+                recommendation["parallelism"]["nodes"], recommendation["instance_type"],
+                resources, pricing, input_data, startup_hours, deadline_hours
+            )
+            recommendation["storage_plan"] = storage_plan
+            recommendation["estimated_total_cost"] = round(storage_plan["total_cost"], 2)
+            estimated_hours = storage_plan["job_hours"]
+            compute_cost = storage_plan["compute_cost"]
+            other_cost = storage_plan["storage_cost"] + storage_plan["io_cost"]
+        else:
+            estimated_hours += startup_hours
+            compute_cost = recommendation["estimated_cost"] * estimated_hours
+            other_cost = 0.0
         
-        gpu_perf_factor = performance_factor * (1 + (recommendation["gpu_count"] - 1) * parallelization_efficiency) / recommendation["gpu_count"]
+        if "regions" in resources:
+            input_data = input_data or {}
+            placement = plan_region(
+                compute_cost, other_cost, estimated_hours, dataset_gb(dataset_size, input_data),
+                input_data.get("data_region", DEFAULT_DATA_REGION), resources, pricing,
+                input_data.get("priority", "Balanced"), deadline_hours,
+                recommendation.get("constraint_check", {}).get("regions")
+            )
+            recommendation["placement"] = placement
+            recommendation["region"] = placement["region"]
+            recommendation["estimated_cost"] = round(
+                gpu_hourly_cost * recommendation["gpu_count"] * instance_multiplier * placement["price_multiplier"], 2
+            )
+            recommendation["estimated_total_cost"] = round(placement["total_cost"], 2)
+            estimated_hours = placement["job_hours"]
         
-        # Final time estimate
-        estimated_hours = base_time * dataset_multipliers[dataset_size] / gpu_perf_factor
+        recommendation["estimated_time"] = format_hours(estimated_hours)
         
-        if estimated_hours < 1:
-            recommendation["estimated_time"] = f"{int(estimated_hours * 60)} minutes"
-        else:
-            recommendation["estimated_time"] = f"{estimated_hours:.1f} hours"
+        # The deadline stages size compute; data loading, transfer and the
+        # history estimator can still move the job past the deadline
+        deadline_check = recommendation.get("deadline_check")
+        if deadline_check is not None:
+            deadline_check = dict(deadline_check, estimated_hours=estimated_hours)
+            deadline_check["meets_deadline"] = estimated_hours <= deadline_check["deadline_hours"]
+            if deadline_check["meets_deadline"]:
+                deadline_check.pop("fastest_hours", None)
+            recommendation["deadline_check"] = deadline_check
     
     return recommendation
 
+def compute_hours(recommendation, task_type, model_size, dataset_size, resources, input_data=None):
+    """
+    Estimate the compute time of a configuration
+    
+    Uses the FLOP model when ``input_data`` has a parameter count and a
+    token or byte count, the size buckets otherwise; training techniques
+    recorded under ``recommendation["techniques"]`` scale the time by their
+    throughput factor and the model's footprint by their memory factor.
+    Startup, I/O and placement are not included.
+    
+    Args:
+        recommendation: Recommendation dict with the configuration
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        dataset_size: Size of dataset
+        resources: Resource configuration data
+        input_data: User input data (optional, enables FLOP-based estimates)
+        
+    Returns:
+        tuple: (hours, parallelism layout, total FLOPs or None)
+    """
+    factors = recommendation.get("techniques")
+    memory_factor = factors["memory_factor"] if factors else 1.0
+    throughput_factor = factors["throughput_factor"] if factors else 1.0
+    
+    if not has_flop_inputs(input_data):
+        hours, layout = estimate_cluster_hours(
+            task_type, model_size, dataset_size, recommendation["gpu_type"],
+            recommendation["gpu_count"], recommendation["instance_type"], resources, memory_factor
+        )
+        return hours / throughput_factor, layout, None
+    
+    layout = parallel_layout(
+        task_type, model_size, recommendation["gpu_type"],
+        recommendation["gpu_count"], recommendation["instance_type"], resources, memory_factor
+    )
+    flop_input = input_data
+    if factors:
+        flop_input, throughput_factor = flop_inputs(input_data, factors)
+    hours, flops = estimate_flop_hours(
+        flop_input, recommendation["gpu_type"], recommendation["gpu_count"], resources
+    )
+    return hours * layout["time_factor"] / throughput_factor, layout, flops
+
+@timed("generate_justification")
 def generate_justification(recommendation, input_data, resources):
     """
     Generate explanation for the recommendation
     
+    Set ``input_data["include_justification"]`` to False to skip rendering
+    entirely, e.g. for machine-to-machine batch calls.
+    
     Args:
         recommendation: Generated recommendation
         input_data: User input data
@@ -415,55 +1104,21 @@ def generate_justification(recommendation, input_data, resources):
     Returns:
         List of justification points
     """
-    task_type = input_data["task_type"]
-    model_size = input_data["model_size"]
-    priority = input_data["priority"]
-    
-    gpu_type = recommendation["gpu_type"]
-    gpu_count = recommendation["gpu_count"]
-    instance_type = recommendation["instance_type"]
-    
-    justification = []
-    
-    # GPU type justification
-    gpu_desc = resources["gpu_types"][gpu_type]["description"]
-    justification.append(f"**GPU Selection ({gpu_type}):** {gpu_desc}")
-    
-    # GPU count justification
-    if gpu_count > 1:
-        if task_type in ["Training", "Fine-tuning"]:
-            justification.append(f"**Multiple GPUs ({gpu_count}):** Recommended for {model_size.lower()} model {task_type.lower()} to distribute the workload and reduce total processing time.")
-        else:
-            justification.append(f"**Multiple GPUs ({gpu_count}):** Recommended for high-throughput {task_type.lower()} of {model_size.lower()} models.")
-    else:
-        justification.append(f"**Single GPU:** Sufficient for {model_size.lower()} model {task_type.lower()} with your specified requirements.")
+    if not input_data.get("include_justification", True):
+        return []
     
-    # Instance type justification
-    instance_desc = resources["instance_types"][instance_type]["description"]
-    justification.append(f"**Instance Type ({instance_type}):** {instance_desc}")
-    
-    # Priority-based justification
-    if priority == "Minimize Cost":
-        justification.append(f"**Cost Optimization:** This configuration balances performance needs while keeping costs lower, as per your priority.")
-    elif priority == "Minimize Time":
-        justification.append(f"**Performance Optimization:** This configuration prioritizes speed and processing power, as per your priority.")
-    else:  # Balanced
-        justification.append(f"**Balanced Approach:** This configuration offers a good balance between cost efficiency and performance.")
-    
-    # Budget considerations
-    if input_data["budget_limit"]:
-        justification.append(f"**Budget Consideration:** Configuration designed to stay within your specified budget limit of ${input_data['budget_limit']}/hour.")
-    
-    # Deadline considerations
-    if input_data["deadline"]:
-        justification.append(f"**Deadline Consideration:** Configuration designed to help meet your specified deadline.")
-    
-    return justification
+    return render_justification(recommendation, input_data, resources)
 
+@timed("generate_alternatives")
 def generate_alternatives(recommendation, input_data, resources):
     """
     Generate alternative configurations
     
+    Alternatives are new dicts holding only the configuration fields, so
+    they share nothing with the recommendation. They run in the
+    recommendation's region and are priced there. Those excluded by the
+    input's hard constraints are left out.
+    
     Args:
         recommendation: Primary recommendation
         input_data: User input data
@@ -473,10 +1128,11 @@ def generate_alternatives(recommendation, input_data, resources):
         List of alternative configurations
     """
     alternatives = []
+    price_multiplier = recommendation.get("placement", {}).get("price_multiplier", 1.0)
     
     # Alternative 1: More cost-effective option
     if recommendation["gpu_type"] != "NVIDIA T4" or recommendation["instance_type"] != "flex-economy":
-        cost_effective = recommendation.copy()
+        cost_effective = {field: recommendation[field] for field in ALTERNATIVE_FIELDS}
         
         # Downgrade GPU if possible
         if cost_effective["gpu_type"] == "NVIDIA H100":
@@ -496,7 +1152,9 @@ def generate_alternatives(recommendation, input_data, resources):
         # Calculate new cost
         gpu_hourly_cost = resources["gpu_types"][cost_effective["gpu_type"]]["hourly_cost"]
         instance_multiplier = resources["instance_types"][cost_effective["instance_type"]]["cost_multiplier"]
-        cost_effective["estimated_cost"] = round(gpu_hourly_cost * cost_effective["gpu_count"] * instance_multiplier, 2)
+        cost_effective["estimated_cost"] = round(
+            gpu_hourly_cost * cost_effective["gpu_count"] * instance_multiplier * price_multiplier, 2
+        )
         
         # Add cost savings percentage
         original_cost = recommendation["estimated_cost"]
@@ -510,7 +1168,7 @@ def generate_alternatives(recommendation, input_data, resources):
     
     # Alternative 2: High-performance option
     if recommendation["gpu_type"] != "NVIDIA H100" or recommendation["instance_type"] != "flex-performance":
-        high_perf = recommendation.copy()
+        high_perf = {field: recommendation[field] for field in ALTERNATIVE_FIELDS}
         
         # Upgrade GPU if possible
         if high_perf["gpu_type"] == "NVIDIA T4":
@@ -530,11 +1188,24 @@ def generate_alternatives(recommendation, input_data, resources):
         # Calculate new cost
         gpu_hourly_cost = resources["gpu_types"][high_perf["gpu_type"]]["hourly_cost"]
         instance_multiplier = resources["instance_types"][high_perf["instance_type"]]["cost_multiplier"]
-        high_perf["estimated_cost"] = round(gpu_hourly_cost * high_perf["gpu_count"] * instance_multiplier, 2)
+        high_perf["estimated_cost"] = round(
+            gpu_hourly_cost * high_perf["gpu_count"] * instance_multiplier * price_multiplier, 2
+        )
         
         high_perf["name"] = "Performance Option"
         high_perf["description"] = "A higher-performance configuration for faster results."
         
         alternatives.append(high_perf)
     
+    # The ladders know nothing of hard constraints; drop what they exclude
+    if input_data.get("constraints"):
+        from .constraints import allowed_regions, compile_constraints
+        compiled = compile_constraints(input_data["constraints"], resources)
+        alternatives = [
+            alternative for alternative in alternatives
+            if alternative["region"] in allowed_regions(
+                compiled, alternative["gpu_type"], alternative["gpu_count"], alternative["instance_type"]
+            )
+        ]
+    
     return alternatives
\ No newline at end of file
@@ -0,0 +1,244 @@
+import numpy as np
+from .constraints import allowed_counts
+from .flops import DEFAULT_MFU
+from .time_model import MAX_GPU_COUNT, parallel_speedup
+from .topology import instance_topology
+from .utils import parse_vram_gb
+
+def peak_inference_tflops(gpu, precisions):
+    """
+    Get a GPU's peak TFLOPs for the first precision it supports
+
+    Args:
+        gpu: GPU entry from the catalog
+        precisions: Compute precisions in order of preference
+
+    Returns:
+        float: Peak TFLOPs, or the FP32 rate if none is supported
+    """
+    peak = gpu["peak_tflops"]
+    for precision in precisions:
+        if precision in peak:
+            return peak[precision]
+    return peak["fp32"]
+
+def batch_throughput(model_size, tokens_per_item, prompt_tokens, quantization, resources, heuristics,
+                     gpu_types=None, batch_sizes=None, kv_cache_mb_per_token=None):
+    """
+    Estimate items per second of one serving replica for every GPU type and batch size
+
+    A replica holds the fewest GPUs of a type whose usable VRAM fits the
+    quantized weights plus one item's KV cache; what is left bounds the
+    batch size. Each batch runs a compute-bound prefill of the prompts and
+    then one decode step per generated token, which takes the longer of
+    its compute (2 FLOPs per parameter per item) and reading the weights
+    and the batch's KV cache from memory. Larger batches amortize the
+    weight reads, so throughput grows with batch size until compute or
+    VRAM runs out.
+
+    Args:
+        model_size: Size of model
+        tokens_per_item: Generated tokens per item
+        prompt_tokens: Prompt tokens per item
+        quantization: Weight quantization ("fp16", "int8" or "int4")
+        resources: Resource configuration data
+        heuristics: Heuristic rules with a "batch_inference" section
+        gpu_types: GPU types to consider (defaults to all)
+        batch_sizes: Batch sizes to consider (defaults to the heuristics)
+        kv_cache_mb_per_token: KV-cache size per token in MB (defaults to
+            the heuristics for the model size)
+
+    Returns:
+        dict: Per-GPU "gpus_per_replica" and "max_batch_size", and
+            (GPU type, batch size) arrays of "items_per_second" (NaN where
+            the batch does not fit) and "memory_bound"
+
+    Raises:
+        ValueError: If the quantization is unknown
+    """
+    rules = heuristics["batch_inference"]
+    if quantization not in rules["quantization"]:
+        raise ValueError(f"Unknown quantization: {quantization}")
+    scheme = rules["quantization"][quantization]
+
+    if gpu_types is None:
+        gpu_types = list(resources["gpu_types"])
+    batch_sizes = np.asarray(batch_sizes or rules["batch_sizes"], dtype=float)
+    if kv_cache_mb_per_token is None:
+        kv_cache_mb_per_token = rules["kv_cache_mb_per_token"][model_size]
+
+    parameters = rules["parameters"][model_size]
+    weights_gb = parameters * scheme["bytes_per_weight"] / 1e9
+    # Peak KV cache of an item, and its average over the decode steps
+    kv_gb_per_item = kv_cache_mb_per_token * (prompt_tokens + tokens_per_item) / 1000
+    kv_gb_per_step = kv_cache_mb_per_token * (prompt_tokens + tokens_per_item / 2) / 1000
+
+    gpus = [resources["gpu_types"][gpu_type] for gpu_type in gpu_types]
+    usable_gb = np.array([parse_vram_gb(gpu["vram"]) for gpu in gpus]) * rules["usable_vram_fraction"]
+    flops_per_second = np.array([
+        peak_inference_tflops(gpu, scheme["precisions"]) for gpu in gpus
+    ]) * resources.get("mfu", DEFAULT_MFU)["Batch Inference"] * 1e12
+    bytes_per_second = np.array([
+        gpu.get("memory_gb_per_s", np.inf) for gpu in gpus
+    ]) * rules["memory_bandwidth_efficiency"] * 1e9
+
+    gpus_per_replica = np.ceil((weights_gb + kv_gb_per_item) / usable_gb).astype(int)
+    max_batch_size = np.floor((gpus_per_replica * usable_gb - weights_gb) / kv_gb_per_item).astype(int)
+    speedup = parallel_speedup(gpus_per_replica, resources.get("time_model"))[:, None]
+
+    batch = batch_sizes[None, :]
+    prefill_seconds = 2 * parameters * prompt_tokens * batch / (flops_per_second[:, None] * speedup)
+    compute_seconds = 2 * parameters * batch / (flops_per_second[:, None] * speedup)
+    memory_seconds = (weights_gb + batch * kv_gb_per_step) * 1e9 / (bytes_per_second[:, None] * speedup)
+    batch_seconds = prefill_seconds + tokens_per_item * np.maximum(compute_seconds, memory_seconds)
+
+    fits = batch <= max_batch_size[:, None]
+    return {
+        "gpu_types": gpu_types,
+        "batch_sizes": batch_sizes.astype(int),
+        "quantization": quantization,
+        "weights_gb": weights_gb,
+        "gpus_per_replica": gpus_per_replica,
+        "max_batch_size": max_batch_size,
+        "items_per_second": np.where(fits, batch / batch_seconds, np.nan),
+        "memory_bound": memory_seconds > compute_seconds
+    }
+
+def batch_job_hours(throughput, item_count, heuristics, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Estimate the duration of a batch job for every replica count
+
+    Replicas split the items evenly but each loads the weights before
+    starting.
+
+    Args:
+        throughput: Result of batch_throughput
+        item_count: Number of items to process
+        heuristics: Heuristic rules
+        max_gpu_count: Largest replica count to consider
+
+    Returns:
+        tuple: (items per second, weight load hours, job hours); the arrays
+            have axes GPU type, batch size and replica count (NaN where the
+            model does not fit)
+    """
+    replicas = np.arange(1, max_gpu_count + 1)[None, None, :]
+    items_per_second = throughput["items_per_second"][:, :, None] * replicas
+    load_hours = throughput["weights_gb"] / heuristics["batch_inference"]["weight_load_gb_per_s"] / 3600
+    with np.errstate(invalid="ignore"):
+        job_hours = load_hours + item_count / (items_per_second * 3600)
+    return items_per_second, load_hours, job_hours
+
+def plan_batch_inference(model_size, item_count, tokens_per_item, prompt_tokens=0, quantization="fp16",
+                         batch_size=None, deadline_hours=None, budget_limit=None, priority="Balanced",
+                         resources=None, heuristics=None, instance_type="flex-standard", gpu_types=None,
+                         max_gpu_count=MAX_GPU_COUNT, kv_cache_mb_per_token=None, price_multiplier=1.0,
+                         compiled=None):
+    """
+    Choose the GPU type, batch size and GPU count for a batch inference job
+
+    Every (GPU type, batch size, replica count) candidate is evaluated at
+    once. Replicas split the items evenly but each loads the weights before
+    starting, so more replicas finish sooner at a higher cost per item.
+    Candidates over the hourly budget, past the deadline or with a GPU
+    count the compiled constraints exclude are dropped; the cheapest
+    remaining one is chosen, or the fastest when minimizing time.
+
+    Args:
+        model_size: Size of model
+        item_count: Number of items to process
+        tokens_per_item: Generated tokens per item
+        prompt_tokens: Prompt tokens per item
+        quantization: Weight quantization ("fp16", "int8" or "int4")
+        batch_size: Fixed batch size (chosen by the plan if omitted)
+        deadline_hours: Deadline in hours (optional)
+        budget_limit: Maximum hourly budget (optional)
+        priority: User priority ("Minimize Time" picks the fastest plan)
+        resources: Resource configuration data (loaded from disk if omitted)
+        heuristics: Heuristic rules (loaded from disk if omitted)
+        instance_type: Instance type used for pricing and node size
+        gpu_types: GPU types to consider (defaults to all)
+        max_gpu_count: Largest GPU count to consider
+        kv_cache_mb_per_token: KV-cache size per token in MB (optional)
+        price_multiplier: Region price multiplier the budget is checked at;
+            reported costs stay at list prices
+        compiled: Result of constraints.compile_constraints (optional)
+
+    Returns:
+        dict: Chosen plan with its throughput, time and cost per million
+            items; "feasible" is False if no candidate meets the
+            constraints
+    """
+    if resources is None or heuristics is None:
+        from .advisor_engine import load_resource_configs, load_heuristics
+        resources = resources or load_resource_configs()
+        heuristics = heuristics or load_heuristics()
+
+    throughput = batch_throughput(
+        model_size, tokens_per_item, prompt_tokens, quantization, resources, heuristics,
+        gpu_types, [batch_size] if batch_size else None, kv_cache_mb_per_token
+    )
+    gpu_types = throughput["gpu_types"]
+    instance = resources["instance_types"][instance_type]
+    gpus_per_node = instance_topology(instance)["gpus_per_node"]
+
+    # Axes: GPU type, batch size, replica count
+    gpus_per_replica = throughput["gpus_per_replica"][:, None, None]
+    replicas = np.arange(1, max_gpu_count + 1)[None, None, :]
+    items_per_second, load_hours, job_hours = batch_job_hours(throughput, item_count, heuristics, max_gpu_count)
+
+    hourly_cost = np.broadcast_to(np.array([
+        resources["gpu_types"][gpu_type]["hourly_cost"] for gpu_type in gpu_types
+    ])[:, None, None] * gpus_per_replica * replicas * instance["cost_multiplier"], items_per_second.shape)
+    total_cost = hourly_cost * job_hours
+
+    valid = ~np.isnan(items_per_second) & (gpus_per_replica <= gpus_per_node) & (gpus_per_replica * replicas <= max_gpu_count)
+    if compiled is not None:
+        allowed = np.array([allowed_counts(compiled, gpu_type, instance_type) for gpu_type in gpu_types])
+        counts = np.clip(gpus_per_replica * replicas, 1, allowed.shape[1]) - 1
+        valid &= np.take_along_axis(allowed[:, None, :], counts, axis=2)
+    feasible = valid.copy()
+    if budget_limit:
+        feasible &= hourly_cost * price_multiplier <= budget_limit
+    if deadline_hours is not None:
+        feasible &= job_hours <= deadline_hours
+
+    plan = {
+        "item_count": item_count,
+        "tokens_per_item": tokens_per_item,
+        "prompt_tokens": prompt_tokens,
+        "quantization": quantization,
+        "instance_type": instance_type,
+        "feasible": False
+    }
+    if not feasible.any():
+        if valid.any():
+            plan["fastest_hours"] = float(job_hours[valid].min())
+        return plan
+
+    if priority == "Minimize Time":
+        order = np.lexsort((total_cost[feasible], job_hours[feasible]))
+    else:
+        order = np.lexsort((job_hours[feasible], total_cost[feasible]))
+    gpu_index, batch_index, replica_index = (axis[order[0]] for axis in np.nonzero(feasible))
+
+    replica_count = int(replica_index) + 1
+    per_replica = int(throughput["gpus_per_replica"][gpu_index])
+    cost = float(total_cost[gpu_index, batch_index, replica_index])
+    plan.update({
+        "feasible": True,
+        "gpu_type": gpu_types[gpu_index],
+        "batch_size": int(throughput["batch_sizes"][batch_index]),
+        "max_batch_size": int(throughput["max_batch_size"][gpu_index]),
+        "replicas": replica_count,
+        "gpus_per_replica": per_replica,
+        "gpu_count": replica_count * per_replica,
+        "items_per_second": float(items_per_second[gpu_index, batch_index, replica_index]),
+        "memory_bound": bool(throughput["memory_bound"][gpu_index, batch_index]),
+        "load_hours": load_hours,
+        "job_hours": float(job_hours[gpu_index, batch_index, replica_index]),
+        "hourly_cost": float(hourly_cost[gpu_index, batch_index, replica_index]),
+        "total_cost": cost,
+        "cost_per_million_items": cost / item_count * 1e6
+    })
+    return plan
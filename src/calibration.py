@@ -0,0 +1,291 @@
+import copy
+import csv
+import datetime
+import json
+import os
+import numpy as np
+from .catalog import _content_hash
+from .time_model import BASE_HOURS, DATASET_MULTIPLIERS, PARALLELIZATION_EFFICIENCY
+
+# Columns every job record must provide
+JOB_FIELDS = ("task_type", "model_size", "dataset_size", "gpu_type", "gpu_count", "instance_type", "actual_hours")
+
+# Candidate parallelization efficiencies searched during the fit
+EFFICIENCY_GRID = np.round(np.arange(0.05, 1.0001, 0.01), 2)
+
+def load_job_log(file_path):
+    """
+    Load completed jobs from a CSV or JSONL log
+
+    Real-time Inference jobs and jobs without a positive duration are
+    skipped, since they carry no information about batch job durations.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl file with JOB_FIELDS columns
+
+    Returns:
+        list: Job dictionaries with gpu_count as int and actual_hours as float
+
+    Raises:
+        ValueError: If a record is missing a field or has an unknown format
+    """
+    if file_path.endswith(".csv"):
+        with open(file_path, newline="") as f:
+            records = list(csv.DictReader(f))
+    elif file_path.endswith((".jsonl", ".ndjson")):
+        with open(file_path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        raise ValueError(f"Unsupported job log format: {file_path}")
+
+    jobs = []
+    for line_number, record in enumerate(records, start=1):
+        missing = [field for field in JOB_FIELDS if record.get(field) in (None, "")]
+        if missing:
+            raise ValueError(f"Job {line_number} in {file_path} is missing {', '.join(missing)}")
+
+        job = {field: record[field] for field in JOB_FIELDS}
+        job["gpu_count"] = int(job["gpu_count"])
+        job["actual_hours"] = float(job["actual_hours"])
+
+        if job["task_type"] == "Real-time Inference" or job["actual_hours"] <= 0:
+            continue
+        jobs.append(job)
+
+    return jobs
+
+def fit_time_model(jobs, resources, efficiency_grid=EFFICIENCY_GRID):
+    """
+    Fit base hours, GPU performance factors and parallelization efficiency
+
+    The time model is multiplicative, so in log space it is linear in
+    log(base hours) and log(relative performance) for a fixed efficiency:
+
+        log(hours) - log(dataset multiplier) + log(1 + (n - 1) * e)
+            = log(base[task][model]) - log(performance[gpu])
+
+    One least-squares solve with a right-hand side per candidate efficiency
+    fits every efficiency at once; the one with the smallest residual wins.
+    The reference GPU (the logged GPU type with relative_performance
+    closest to 1.0) is pinned to its catalog value so that base hours and
+    performance are identifiable. Table entries without observations keep
+    their current values.
+
+    Args:
+        jobs: Job dictionaries (see load_job_log)
+        resources: Resource configuration data being calibrated
+        efficiency_grid: Candidate parallelization efficiencies
+
+    Returns:
+        dict: Fitted "base_hours", "relative_performance" and
+            "parallelization_efficiency"
+
+    Raises:
+        ValueError: If there are no jobs, a job references an unknown GPU
+            type or dataset size, or the log cannot separate every logged
+            GPU type from the workloads it ran (e.g. two GPU types that
+            never ran a common workload, directly or through other GPUs)
+    """
+    if not jobs:
+        raise ValueError("Cannot calibrate the time model without jobs")
+
+    gpu_types = list(resources["gpu_types"])
+    unknown = {job["gpu_type"] for job in jobs} - set(gpu_types)
+    unknown |= {job["dataset_size"] for job in jobs} - set(DATASET_MULTIPLIERS)
+    if unknown:
+        raise ValueError(f"Jobs reference unknown GPU types or dataset sizes: {sorted(unknown)}")
+
+    # Only a logged GPU ties the fit to the catalog's performance scale
+    logged_gpus = sorted({job["gpu_type"] for job in jobs})
+    reference_gpu = min(logged_gpus, key=lambda g: abs(np.log(resources["gpu_types"][g]["relative_performance"])))
+    reference_log_performance = np.log(resources["gpu_types"][reference_gpu]["relative_performance"])
+
+    workloads = sorted({(job["task_type"], job["model_size"]) for job in jobs})
+    fitted_gpus = sorted({job["gpu_type"] for job in jobs} - {reference_gpu})
+    workload_index = {workload: i for i, workload in enumerate(workloads)}
+    gpu_index = {gpu_type: len(workloads) + i for i, gpu_type in enumerate(fitted_gpus)}
+
+    rows = np.arange(len(jobs))
+    design = np.zeros((len(jobs), len(workloads) + len(fitted_gpus)))
+    design[rows, [workload_index[(job["task_type"], job["model_size"])] for job in jobs]] = 1.0
+    gpu_columns = np.array([gpu_index.get(job["gpu_type"], -1) for job in jobs])
+    design[rows[gpu_columns >= 0], gpu_columns[gpu_columns >= 0]] = -1.0
+
+    gpu_count = np.array([job["gpu_count"] for job in jobs], dtype=float)
+    log_hours = np.log([job["actual_hours"] for job in jobs])
+    log_multiplier = np.log([DATASET_MULTIPLIERS[job["dataset_size"]] for job in jobs])
+    is_reference = gpu_columns < 0
+
+    # One column per candidate efficiency
+    efficiency_grid = np.asarray(efficiency_grid, dtype=float)
+    targets = (
+        (log_hours - log_multiplier)[:, None]
+        + np.log1p(np.outer(gpu_count - 1, efficiency_grid))
+        + np.where(is_reference, reference_log_performance, 0.0)[:, None]
+    )
+
+    solution, _, rank, _ = np.linalg.lstsq(design, targets, rcond=None)
+    if rank < design.shape[1]:
+        raise ValueError(
+            f"The job log cannot separate GPU performance from base hours; every GPU type in it "
+            f"must share workloads, directly or through other GPU types, with {reference_gpu}"
+        )
+    residuals = ((design @ solution - targets) ** 2).sum(axis=0)
+    best = int(np.argmin(residuals))
+    coefficients = solution[:, best]
+
+    base_hours = copy.deepcopy(BASE_HOURS)
+    for (task_type, model_size), index in workload_index.items():
+        base_hours.setdefault(task_type, {})[model_size] = round(float(np.exp(coefficients[index])), 4)
+
+    relative_performance = {gpu_type: gpu["relative_performance"] for gpu_type, gpu in resources["gpu_types"].items()}
+    for gpu_type, index in gpu_index.items():
+        relative_performance[gpu_type] = round(float(np.exp(coefficients[index])), 4)
+
+    return {
+        "base_hours": base_hours,
+        "relative_performance": relative_performance,
+        "parallelization_efficiency": float(efficiency_grid[best])
+    }
+
+def predict_hours(jobs, time_model, relative_performance):
+    """
+    Predict job durations with a time model, vectorized over jobs
+
+    Args:
+        jobs: Job dictionaries (see load_job_log)
+        time_model: Dict with "base_hours" and "parallelization_efficiency"
+        relative_performance: Mapping of GPU type to performance factor
+
+    Returns:
+        numpy.ndarray: Predicted hours per job
+    """
+    base = np.array([time_model["base_hours"][job["task_type"]][job["model_size"]] for job in jobs], dtype=float)
+    multiplier = np.array([DATASET_MULTIPLIERS[job["dataset_size"]] for job in jobs])
+    performance = np.array([relative_performance[job["gpu_type"]] for job in jobs], dtype=float)
+    gpu_count = np.array([job["gpu_count"] for job in jobs], dtype=float)
+
+    speedup = 1 + (gpu_count - 1) * time_model["parallelization_efficiency"]
+    return base * multiplier / (performance * speedup)
+
+def error_metrics(actual_hours, predicted_hours):
+    """
+    Summarize relative prediction errors
+
+    Args:
+        actual_hours: Array of observed durations
+        predicted_hours: Array of predicted durations
+
+    Returns:
+        dict: Mean and median absolute percentage error, and the share of
+            predictions off by more than 2x in either direction
+    """
+    actual = np.asarray(actual_hours, dtype=float)
+    predicted = np.asarray(predicted_hours, dtype=float)
+    ape = np.abs(predicted - actual) / actual
+    ratio = np.maximum(predicted / actual, actual / predicted)
+
+    return {
+        "jobs": int(actual.size),
+        "mape": round(float(ape.mean()), 4),
+        "median_ape": round(float(np.median(ape)), 4),
+        "off_by_2x": round(float((ratio > 2).mean()), 4)
+    }
+
+def calibrate(jobs, resources, holdout_fraction=0.2, seed=0):
+    """
+    Calibrate a catalog against job telemetry and report held-out error
+
+    A random ``holdout_fraction`` of the jobs is set aside to compare the
+    current and calibrated models on jobs the fit has not seen; the
+    returned catalog is then refit on all jobs.
+
+    Args:
+        jobs: Job dictionaries (see load_job_log)
+        resources: Resource configuration data being calibrated
+        holdout_fraction: Share of jobs used for held-out error reporting
+        seed: Seed for the holdout split
+
+    Returns:
+        dict: Calibrated catalog with "time_model" and "calibration" keys
+    """
+    baseline_model = resources.get("time_model") or {
+        "base_hours": BASE_HOURS,
+        "parallelization_efficiency": PARALLELIZATION_EFFICIENCY
+    }
+    baseline_performance = {gpu_type: gpu["relative_performance"] for gpu_type, gpu in resources["gpu_types"].items()}
+
+    order = np.random.default_rng(seed).permutation(len(jobs))
+    holdout_size = int(round(len(jobs) * holdout_fraction))
+    holdout = [jobs[i] for i in order[:holdout_size]]
+    train = [jobs[i] for i in order[holdout_size:]]
+
+    calibration = {
+        "calibrated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "jobs": len(jobs),
+        "base_version": resources.get("version")
+    }
+
+    if holdout:
+        train_fit = fit_time_model(train, resources)
+        actual = [job["actual_hours"] for job in holdout]
+        calibration["holdout"] = {
+            "baseline": error_metrics(actual, predict_hours(holdout, baseline_model, baseline_performance)),
+            "calibrated": error_metrics(actual, predict_hours(holdout, train_fit, train_fit["relative_performance"]))
+        }
+
+    fit = fit_time_model(jobs, resources)
+    calibrated = copy.deepcopy(resources)
+    calibrated.pop("version", None)
+    for gpu_type, performance in fit["relative_performance"].items():
+        calibrated["gpu_types"][gpu_type]["relative_performance"] = performance
+    calibrated["time_model"] = {
+        "base_hours": fit["base_hours"],
+        "parallelization_efficiency": fit["parallelization_efficiency"]
+    }
+
+    canonical = json.dumps(calibrated, sort_keys=True, separators=(",", ":"))
+    calibrated["version"] = f"calibrated-{_content_hash(canonical.encode('utf-8'))}"
+    calibrated["calibration"] = calibration
+    return calibrated
+
+def write_catalog(catalog, file_path):
+    """
+    Write a catalog atomically so running engines never read a partial file
+
+    Args:
+        catalog: Catalog dictionary
+        file_path (str): Destination path
+    """
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(catalog, f, indent=2)
+        f.write("\n")
+    os.replace(temp_path, file_path)
+
+def main(argv=None):
+    """
+    Command-line entry point: calibrate a catalog from a job log
+    """
+    import argparse
+    from .advisor_engine import load_resource_configs
+
+    parser = argparse.ArgumentParser(description="Calibrate the time model from completed jobs")
+    parser.add_argument("job_log", help="CSV or JSONL log of completed jobs")
+    parser.add_argument("--catalog", default="data/resource_configs.json", help="Catalog to calibrate")
+    parser.add_argument("--output", default="data/resource_configs.calibrated.json", help="Calibrated catalog path")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of jobs held out for error reporting")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the holdout split")
+    args = parser.parse_args(argv)
+
+    jobs = load_job_log(args.job_log)
+    calibrated = calibrate(jobs, load_resource_configs(args.catalog), args.holdout, args.seed)
+    write_catalog(calibrated, args.output)
+
+    print(f"Wrote {args.output} (version {calibrated['version']}) from {len(jobs)} jobs")
+    for model, metrics in calibrated["calibration"].get("holdout", {}).items():
+        print(f"  {model:<10} MAPE {metrics['mape']:.1%}  median APE {metrics['median_ape']:.1%}  "
+              f"off by >2x {metrics['off_by_2x']:.1%}  ({metrics['jobs']} held-out jobs)")
+
+if __name__ == "__main__":
+    main()
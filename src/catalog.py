@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+
+# Environment variable naming the published catalog file workers attach to
+# (see shared_catalog.publish_catalog)
+SHARED_CATALOG_ENV = "FLEXAI_SHARED_CATALOG"
+
+_cache = {}
+_lock = threading.Lock()
+
+class FrozenDict(dict):
+    """
+    Read-only dict shared between threads without locking
+
+    Reads are plain dict reads; every mutating method raises TypeError.
+    Copies (``copy.copy``, ``copy.deepcopy``, ``dict(...)``) are ordinary
+    mutable dicts, so callers can still derive modified catalogs.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalogs are shared between sessions and cannot be modified; modify a copy")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(value):
+    """
+    Make a parsed JSON value deeply immutable
+
+    Args:
+        value: Parsed JSON value
+
+    Returns:
+        The value with dicts as FrozenDict and lists as tuples
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """
+    Make a mutable deep copy of a frozen value
+
+    Args:
+        value: Result of freeze
+
+    Returns:
+        The value with mappings as dicts and tuples as lists
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+def load_catalog(file_path):
+    """
+    Load a JSON catalog, reusing the parsed copy until the file changes
+
+    The returned catalog carries a "version" key: the file's own "version"
+    field if present, otherwise a hash of the file contents. It is frozen
+    (see freeze), since every caller and thread shares the one copy.
+
+    Args:
+        file_path (str): Path to the JSON file
+
+    Returns:
+        FrozenDict: Parsed catalog
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+
+    catalog = json.loads(raw)
+    if "version" not in catalog:
+        catalog["version"] = _content_hash(raw)
+    catalog = freeze(catalog)
+
+    with _lock:
+        _cache[key] = (signature, catalog)
+
+    return catalog
+
+def catalog_version(resources):
+    """
+    Get the version identifier of a catalog
+
+    Args:
+        resources: Catalog dictionary
+
+    Returns:
+        str: Version from the catalog, or a hash of its contents
+    """
+    version = resources.get("version")
+    if version is not None:
+        return version
+
+    canonical = json.dumps(resources, sort_keys=True, separators=(",", ":"))
+    return _content_hash(canonical.encode("utf-8"))
+
+def _content_hash(data):
+    """
+    Hash catalog contents into a short version identifier
+
+    Args:
+        data (bytes): Catalog contents
+
+    Returns:
+        str: First 12 hex digits of the SHA-256 digest
+    """
+    # hashlib is imported here because it dominates the engine's import time
+    import hashlib
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def clear_cache():
+    """
+    Drop all cached catalogs so the next load re-reads from disk
+    """
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,227 @@
+import numpy as np
+from .advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from .utils import calculate_total_cost
+
+HOURS_PER_YEAR = 8760
+HOURS_PER_WEEK = 168
+
+# Prefix of the pricing keys of committed-use rates
+RESERVED_PREFIX = "reserved_"
+
+# Term name of the option that reserves nothing, chosen when no commitment
+# term is available
+NO_COMMITMENT = "none"
+
+def job_hours(recommendation):
+    """
+    Get the wall time of one run of a recommended job
+
+    Args:
+        recommendation: Recommendation dictionary
+
+    Returns:
+        float: Hours per run, including storage staging and data transfer
+            when the engine planned them
+    """
+    for plan in ("placement", "storage_plan"):
+        if plan in recommendation:
+            return recommendation[plan]["job_hours"]
+    return calculate_total_cost(1.0, recommendation["estimated_time"], return_numeric=True)
+
+def resolve_schedule(schedule, resources=None, pricing=None):
+    """
+    Attach a recommendation to every schedule entry that only has inputs
+
+    Args:
+        schedule: Recurring jobs; each has "recommendation" or advisor
+            "input", a "weekday" (0 = Monday) and "start_hour", and
+            optionally "interval_hours" (default weekly)
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+
+    Returns:
+        list: Entries with "gpu_type", "gpu_count", "hours", "start" (hour
+            of the week) and "interval_hours"
+    """
+    resolved = []
+    for entry in schedule:
+        recommendation = entry.get("recommendation")
+        if recommendation is None:
+            if resources is None:
+                resources = load_resource_configs()
+            if pricing is None:
+                pricing = load_pricing()
+            recommendation = generate_recommendation(entry["input"], resources, pricing)
+
+        resolved.append({
+            "name": entry.get("name"),
+            "gpu_type": recommendation["gpu_type"],
+            "gpu_count": recommendation["gpu_count"],
+            "hours": entry.get("hours", job_hours(recommendation)),
+            "start": entry.get("weekday", 0) * 24 + entry.get("start_hour", 0),
+            "interval_hours": entry.get("interval_hours", HOURS_PER_WEEK)
+        })
+    return resolved
+
+def demand_profile(entries, hours=HOURS_PER_YEAR):
+    """
+    Compute the GPUs in use in every hour of the calendar per GPU type
+
+    Each run adds its GPU count over [start, start + duration); partial
+    hours count fractionally. Runs are placed with one scatter-add of their
+    start and end events per GPU type and a cumulative sum, and work that
+    spills past the end of the calendar wraps to its start, so the profile
+    describes a steady-state year.
+
+    Args:
+        entries: Result of resolve_schedule
+        hours: Length of the calendar in hours
+
+    Returns:
+        dict: GPU type -> numpy.ndarray of GPUs in use per hour
+    """
+    events = {}
+    for entry in entries:
+        starts = np.arange(entry["start"], hours, entry["interval_hours"], dtype=float)
+        if not len(starts):
+            continue
+        times = np.concatenate((starts, starts + entry["hours"]))
+        weights = np.concatenate((
+            np.full(len(starts), float(entry["gpu_count"])),
+            np.full(len(starts), -float(entry["gpu_count"]))
+        ))
+        gpu_events = events.setdefault(entry["gpu_type"], ([], []))
+        gpu_events[0].append(times)
+        gpu_events[1].append(weights)
+
+    profiles = {}
+    for gpu_type, (times, weights) in events.items():
+        times = np.concatenate(times)
+        weights = np.concatenate(weights)
+        length = max(hours, int(np.ceil(times.max())) + 2)
+
+        # An event at time t contributes the covered fraction of its own
+        # hour and a full unit from the next hour on
+        bins = np.floor(times).astype(int)
+        fraction = bins + 1 - times
+        steps = np.zeros(length + 1)
+        np.add.at(steps, bins, weights * fraction)
+        np.add.at(steps, bins + 1, weights * (1 - fraction))
+        usage = np.cumsum(steps)[:length]
+
+        profile = usage[:hours].copy()
+        for offset in range(hours, length, hours):
+            spill = usage[offset:offset + hours]
+            profile[:len(spill)] += spill
+        profiles[gpu_type] = np.maximum(profile, 0.0)
+    return profiles
+
+def marginal_utilization(profile):
+    """
+    Get the utilization of the k-th reserved GPU for every k
+
+    GPU k (1-based) is busy in an hour for the part of the demand above
+    k - 1 GPUs, capped at one.
+
+    Args:
+        profile: GPUs in use per hour
+
+    Returns:
+        numpy.ndarray: Utilization of GPU 1 .. peak
+    """
+    peak = int(np.ceil(profile.max())) if len(profile) else 0
+    levels = np.arange(peak)
+    return np.clip(profile[None, :] - levels[:, None], 0.0, 1.0).mean(axis=1)
+
+def plan_commitments(schedule, resources=None, pricing=None, spot_fraction=0.0, terms=None, hours=HOURS_PER_YEAR):
+    """
+    Choose reserved capacity per GPU type for a recurring schedule
+
+    A reserved GPU is paid for every hour of the year, used or not, while
+    demand above the reservation runs on demand, or on spot for the share
+    ``spot_fraction`` of it that tolerates interruption. Reserving the k-th
+    GPU pays off when its utilization is at least the breakeven ratio
+    ``reserved rate / overflow rate``, and marginal utilization only falls
+    with k, so the optimal reservation is the number of GPUs above the
+    breakeven. Each commitment term is solved this way and the cheapest is
+    kept. Rates are the GPU rates from pricing; instance and region
+    premiums scale every option alike. Without any term, the plan runs
+    every GPU-hour as overflow under the term NO_COMMITMENT.
+
+    Args:
+        schedule: Recurring jobs (see resolve_schedule)
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data with "gpu_pricing" (loaded from disk if omitted)
+        spot_fraction: Share of overflow GPU-hours that may run on spot
+        terms: Commitment terms to consider, e.g. ("reserved_1yr",)
+            (defaults to every reserved rate in pricing; empty for none)
+        hours: Length of the calendar in hours
+
+    Returns:
+        dict: Per GPU type demand, options per term and chosen term, plus
+            yearly totals against an all on-demand baseline
+    """
+    if not 0.0 <= spot_fraction <= 1.0:
+        raise ValueError(f"spot_fraction must be between 0 and 1: {spot_fraction}")
+    if pricing is None:
+        pricing = load_pricing()
+
+    profiles = demand_profile(resolve_schedule(schedule, resources, pricing), hours)
+
+    plan = {"hours": hours, "gpu_types": {}, "on_demand_cost": 0.0, "total_cost": 0.0}
+    for gpu_type, profile in profiles.items():
+        rates = pricing["gpu_pricing"][gpu_type]
+        overflow_rate = (1 - spot_fraction) * rates["on_demand"] + spot_fraction * rates["spot"]
+        gpu_hours = profile.sum()
+        utilization = marginal_utilization(profile)
+        on_demand_cost = gpu_hours * rates["on_demand"]
+
+        options = {}
+        for term in terms if terms is not None else [name for name in rates if name.startswith(RESERVED_PREFIX)]:
+            breakeven = rates[term] / overflow_rate
+            reserved = int(np.count_nonzero(utilization >= breakeven))
+            reserved_hours = utilization[:reserved].sum() * hours
+
+            reserved_cost = reserved * hours * rates[term]
+            overflow_cost = (gpu_hours - reserved_hours) * overflow_rate
+            options[term] = {
+                "reserved_gpus": reserved,
+                "breakeven_utilization": breakeven,
+                # Hours per week a GPU must be busy for the commitment to pay off
+                "breakeven_hours_per_week": breakeven * HOURS_PER_WEEK,
+                "utilization": reserved_hours / (reserved * hours) if reserved else 0.0,
+                "reserved_cost": reserved_cost,
+                "overflow_cost": overflow_cost,
+                "total_cost": reserved_cost + overflow_cost,
+                "savings": on_demand_cost - reserved_cost - overflow_cost
+            }
+
+        if not options:
+            overflow_cost = gpu_hours * overflow_rate
+            options[NO_COMMITMENT] = {
+                "reserved_gpus": 0,
+                "breakeven_utilization": None,
+                "breakeven_hours_per_week": None,
+                "utilization": 0.0,
+                "reserved_cost": 0.0,
+                "overflow_cost": overflow_cost,
+                "total_cost": overflow_cost,
+                "savings": on_demand_cost - overflow_cost
+            }
+
+        best = min(options, key=lambda term: options[term]["total_cost"])
+        plan["gpu_types"][gpu_type] = {
+            "gpu_hours": gpu_hours,
+            "peak_gpus": float(profile.max()),
+            "average_gpus": gpu_hours / hours,
+            "marginal_utilization": utilization.tolist(),
+            "on_demand_cost": on_demand_cost,
+            "options": options,
+            "term": best,
+            **options[best]
+        }
+        plan["on_demand_cost"] += on_demand_cost
+        plan["total_cost"] += options[best]["total_cost"]
+
+    plan["savings"] = plan["on_demand_cost"] - plan["total_cost"]
+    return plan
@@ -0,0 +1,337 @@
+import re
+import threading
+import numpy as np
+from .catalog import FrozenDict, catalog_version
+from .placement import DEFAULT_DATA_REGION
+from .time_model import MAX_GPU_COUNT, MAX_SERVING_GPU_COUNT, parallel_speedup
+from .utils import estimate_memory_requirement, parse_vram_gb
+
+# Fields a constraint can test, with the candidate axis each one varies along
+FIELDS = {
+    "gpu_type": "gpu",
+    "gpu_count": "count",
+    "instance_type": "instance",
+    "region": "region",
+    "preemptible": "instance",
+    "vram_gb": "gpu"
+}
+
+# Fields compared as names; the others are numbers or booleans
+NAME_FIELDS = ("gpu_type", "instance_type", "region")
+
+# Number of compiled constraint sets cached before the cache is cleared
+MAX_CACHED_CONSTRAINTS = 1024
+
+_CLAUSE = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|<|>|\bnot in\b|\bin\b)\s*(.+?)\s*$")
+
+_COMPARISONS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal
+}
+
+_BOOLEANS = {"true": True, "yes": True, "false": False, "no": False}
+
+_compiled = {}
+_lock = threading.Lock()
+
+def parse_constraint(text):
+    """
+    Parse one constraint clause
+
+    A clause is ``field op value``, where op is one of ==, !=, <, <=, >, >=,
+    in and not in, and ``in`` takes a comma-separated list, e.g.
+    "gpu_type != H100", "region in europe-west, us-east", "gpu_count <= 4"
+    or "preemptible == false". Names may omit a common prefix ("H100" for
+    "NVIDIA H100").
+
+    Args:
+        text (str): Constraint clause
+
+    Returns:
+        tuple: (field, operator, list of value strings)
+
+    Raises:
+        ValueError: If the clause is malformed or names an unknown field
+    """
+    match = _CLAUSE.match(text)
+    if match is None:
+        raise ValueError(f"Cannot parse constraint: {text!r}")
+    field, operator, value = match.groups()
+    if field not in FIELDS:
+        raise ValueError(f"Unknown constraint field {field!r} in {text!r}; expected one of {', '.join(FIELDS)}")
+    if operator in ("in", "not in"):
+        return field, operator, [item.strip() for item in value.split(",") if item.strip()]
+    return field, operator, [value]
+
+def candidate_space(resources):
+    """
+    Enumerate the axes of the GPU x count x instance x region candidate space
+
+    Counts run up to the largest count any planner returns: real-time
+    deployments go beyond the job limit of the other planners.
+
+    Args:
+        resources: Resource configuration data
+
+    Returns:
+        dict: "gpu_types", "gpu_counts", "instance_types" and "regions"
+            (the default region if the catalog lists none)
+    """
+    return {
+        "gpu_types": list(resources["gpu_types"]),
+        "gpu_counts": np.arange(1, max(MAX_GPU_COUNT, MAX_SERVING_GPU_COUNT) + 1),
+        "instance_types": list(resources["instance_types"]),
+        "regions": list(resources.get("regions", [DEFAULT_DATA_REGION]))
+    }
+
+def compile_constraints(constraints, resources):
+    """
+    Compile constraint clauses into a boolean mask over the candidate space
+
+    Every clause tests one axis, so it becomes a vector over that axis; the
+    mask is their broadcast conjunction, computed in one vectorized step.
+    Results are cached per catalog version and constraint list and shared
+    between threads, so they are read-only.
+
+    Args:
+        constraints: Constraint clauses (see parse_constraint)
+        resources: Resource configuration data
+
+    Returns:
+        dict: Candidate space axes (see candidate_space), the clauses under
+            "constraints" and a (GPU, count, instance, region) "mask"
+
+    Raises:
+        ValueError: If a clause is invalid or names an unknown value
+    """
+    constraints = tuple(constraints)
+    key = (catalog_version(resources), constraints)
+    compiled = _compiled.get(key)
+    if compiled is not None:
+        return compiled
+
+    space = candidate_space(resources)
+    attributes = {
+        "gpu_type": np.array(space["gpu_types"], dtype=object),
+        "gpu_count": space["gpu_counts"],
+        "instance_type": np.array(space["instance_types"], dtype=object),
+        "region": np.array(space["regions"], dtype=object),
+        "preemptible": np.array([
+            resources["instance_types"][name].get("preemptible", False) for name in space["instance_types"]
+        ]),
+        "vram_gb": np.array([parse_vram_gb(resources["gpu_types"][name]["vram"]) for name in space["gpu_types"]])
+    }
+    axes = {
+        "gpu": np.ones(len(space["gpu_types"]), dtype=bool),
+        "count": np.ones(len(space["gpu_counts"]), dtype=bool),
+        "instance": np.ones(len(space["instance_types"]), dtype=bool),
+        "region": np.ones(len(space["regions"]), dtype=bool)
+    }
+
+    for text in constraints:
+        field, operator, values = parse_constraint(text)
+        column = attributes[field]
+        values = [_parse_value(field, value, column, text) for value in values]
+        if operator in ("in", "not in"):
+            matches = np.isin(column, values)
+            axes[FIELDS[field]] &= matches if operator == "in" else ~matches
+        elif field in NAME_FIELDS and operator not in ("==", "!="):
+            raise ValueError(f"Constraint {text!r} orders names; use ==, !=, in or not in")
+        else:
+            axes[FIELDS[field]] &= _COMPARISONS[operator](column, values[0])
+
+    mask = (
+        axes["gpu"][:, None, None, None]
+        & axes["count"][None, :, None, None]
+        & axes["instance"][None, None, :, None]
+        & axes["region"][None, None, None, :]
+    )
+    mask.flags.writeable = False
+    space["gpu_counts"].flags.writeable = False
+    compiled = FrozenDict(
+        gpu_types=tuple(space["gpu_types"]),
+        gpu_counts=space["gpu_counts"],
+        instance_types=tuple(space["instance_types"]),
+        regions=tuple(space["regions"]),
+        constraints=constraints,
+        mask=mask
+    )
+
+    with _lock:
+        if len(_compiled) >= MAX_CACHED_CONSTRAINTS:
+            _compiled.clear()
+        _compiled[key] = compiled
+    return compiled
+
+def allowed_regions(compiled, gpu_type, gpu_count, instance_type):
+    """
+    Get the regions a configuration may run in
+
+    Args:
+        compiled: Result of compile_constraints
+        gpu_type: GPU type
+        gpu_count: Number of GPUs
+        instance_type: Instance type
+
+    Returns:
+        list: Allowed region names (empty if the configuration is excluded)
+    """
+    if not 1 <= gpu_count <= len(compiled["gpu_counts"]):
+        return []
+    regions = compiled["mask"][
+        compiled["gpu_types"].index(gpu_type), gpu_count - 1, compiled["instance_types"].index(instance_type)
+    ]
+    return [region for region, allowed in zip(compiled["regions"], regions) if allowed]
+
+def allowed_counts(compiled, gpu_type, instance_type):
+    """
+    Get the GPU counts a GPU type may use on an instance type
+
+    Args:
+        compiled: Result of compile_constraints
+        gpu_type: GPU type
+        instance_type: Instance type
+
+    Returns:
+        numpy.ndarray: Boolean per count in ``compiled["gpu_counts"]``
+            (index count - 1), true if some region allows it
+    """
+    return compiled["mask"][
+        compiled["gpu_types"].index(gpu_type), :, compiled["instance_types"].index(instance_type)
+    ].any(axis=1)
+
+def allowed_gpu_types(compiled):
+    """
+    Get the GPU types that some allowed configuration uses
+
+    Args:
+        compiled: Result of compile_constraints
+
+    Returns:
+        list: GPU type names
+    """
+    usable = compiled["mask"].any(axis=(1, 2, 3))
+    return [gpu_type for gpu_type, allowed in zip(compiled["gpu_types"], usable) if allowed]
+
+def usable_regions(compiled):
+    """
+    Get the regions that some allowed configuration may run in
+
+    Args:
+        compiled: Result of compile_constraints
+
+    Returns:
+        list: Region names
+    """
+    usable = compiled["mask"].any(axis=(0, 1, 2))
+    return [region for region, allowed in zip(compiled["regions"], usable) if allowed]
+
+def nearest_allowed(recommendation, compiled, task_type, model_size, resources, budget_limit=None, memory_factor=1.0,
+                    price_multiplier=1.0, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Replace an excluded configuration with the closest allowed one
+
+    The instance type is kept unless the constraints exclude it, so an
+    on-demand or performance choice is not traded for a cheaper tier.
+    Candidates must hold the model in their combined VRAM. Among allowed
+    candidates at least as fast as the current configuration (relative
+    performance times parallel speedup) the cheapest is chosen, staying
+    within the hourly budget if possible; if none is as fast, the fastest
+    allowed one is.
+
+    Args:
+        recommendation: Current recommendation dict
+        compiled: Result of compile_constraints
+        task_type: Type of task
+        model_size: Size of model
+        resources: Resource configuration data
+        budget_limit: Maximum hourly budget (if any)
+        memory_factor: Scale of the model's memory footprint (e.g. from
+            training techniques)
+        price_multiplier: Region price multiplier the budget is checked at
+            (see placement.budget_price_multiplier)
+        max_gpu_count: Largest GPU count the task's planners size to
+
+    Returns:
+        Updated recommendation dict
+
+    Raises:
+        ValueError: If the constraints exclude every configuration
+    """
+    allowed = compiled["mask"].any(axis=3)
+    allowed = allowed & (compiled["gpu_counts"] <= max_gpu_count)[None, :, None]
+    if not allowed.any():
+        raise ValueError(f"No configuration satisfies the constraints: {'; '.join(compiled['constraints'])}")
+
+    instance_types = np.array(compiled["instance_types"])
+    same_instance = (instance_types == recommendation["instance_type"])[None, None, :]
+    if (allowed & same_instance).any():
+        allowed = allowed & same_instance
+
+    gpus = [resources["gpu_types"][name] for name in compiled["gpu_types"]]
+    counts = compiled["gpu_counts"][None, :, None]
+    vram_gb = np.array([parse_vram_gb(gpu["vram"]) for gpu in gpus])[:, None, None]
+    performance = np.array([gpu["relative_performance"] for gpu in gpus])[:, None, None]
+    hourly_cost = np.array([gpu["hourly_cost"] for gpu in gpus])[:, None, None] * counts * np.array([
+        resources["instance_types"][name]["cost_multiplier"] for name in compiled["instance_types"]
+    ])[None, None, :]
+    speed = np.broadcast_to(performance * parallel_speedup(counts, resources.get("time_model")), allowed.shape)
+
+    current = resources["gpu_types"][recommendation["gpu_type"]]["relative_performance"] * parallel_speedup(
+        recommendation["gpu_count"], resources.get("time_model")
+    )
+    fits = allowed & (counts * vram_gb >= estimate_memory_requirement(model_size, task_type) * memory_factor)
+    if not fits.any():
+        fits = allowed
+    within_budget = hourly_cost * price_multiplier <= budget_limit if budget_limit else None
+    if budget_limit and (fits & within_budget).any():
+        fits &= within_budget
+
+    fast_enough = fits & (speed >= current)
+    if fast_enough.any():
+        # Cheapest first, then fastest
+        order = np.lexsort((-speed[fast_enough], hourly_cost[fast_enough]))
+        gpu_index, count_index, instance_index = (axis[order[0]] for axis in np.nonzero(fast_enough))
+    else:
+        gpu_index, count_index, instance_index = np.unravel_index(np.argmax(np.where(fits, speed, -np.inf)), fits.shape)
+
+    recommendation["gpu_type"] = compiled["gpu_types"][gpu_index]
+    recommendation["gpu_count"] = int(compiled["gpu_counts"][count_index])
+    recommendation["instance_type"] = compiled["instance_types"][instance_index]
+    return recommendation
+
+def _parse_value(field, value, column, text):
+    """
+    Convert a constraint value to the type of its field
+
+    Args:
+        field: Field name
+        value (str): Value as written
+        column: Field values over its axis
+        text (str): Whole clause, for error messages
+
+    Returns:
+        Name, number or boolean
+
+    Raises:
+        ValueError: If the value is not valid for the field
+    """
+    if field in NAME_FIELDS:
+        if value in column:
+            return value
+        matches = [name for name in column if name.endswith(" " + value)]
+        if len(matches) == 1:
+            return matches[0]
+        raise ValueError(f"Unknown {field} {value!r} in constraint {text!r}")
+    if field == "preemptible":
+        if value.lower() not in _BOOLEANS:
+            raise ValueError(f"Constraint {text!r} needs true or false")
+        return _BOOLEANS[value.lower()]
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Constraint {text!r} needs a number") from None
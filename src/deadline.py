@@ -0,0 +1,318 @@
+import datetime
+from .time_model import MAX_GPU_COUNT, estimate_hours, workload_hours, min_gpus_for_speedup
+from .topology import estimate_cluster_hours, instance_topology, parallel_layout
+from .flops import estimate_flop_hours
+
+def deadline_to_hours(deadline, now=None):
+    """
+    Convert a deadline input to the number of hours available
+    
+    Args:
+        deadline: Hours (int/float/numeric string), timedelta, date,
+            datetime or ISO date string; falsy values mean no deadline
+        now: Reference time for dates (defaults to the current time)
+        
+    Returns:
+        float or None: Hours until the deadline
+    """
+    if not deadline:
+        return None
+    if isinstance(deadline, (int, float)):
+        return float(deadline)
+    if isinstance(deadline, datetime.timedelta):
+        return deadline.total_seconds() / 3600
+    
+    if isinstance(deadline, str):
+        try:
+            return float(deadline)
+        except ValueError:
+            deadline = datetime.datetime.fromisoformat(deadline)
+    
+    if now is None:
+        now = datetime.datetime.now(deadline.tzinfo) if isinstance(deadline, datetime.datetime) else datetime.datetime.now()
+    if not isinstance(deadline, datetime.datetime):
+        # A date deadline means the end of that day
+        deadline = datetime.datetime.combine(deadline + datetime.timedelta(days=1), datetime.time())
+    
+    return (deadline - now).total_seconds() / 3600
+
+def solve_deadline(task_type, model_size, dataset_size, deadline_hours, resources,
+                   instance_types=None, budget_limit=None, max_gpu_count=MAX_GPU_COUNT,
+                   startup_hours=0.0, throughput_factor=1.0, price_multiplier=1.0, compiled=None,
+                   memory_factor=1.0):
+    """
+    Find the cheapest configuration that finishes within a deadline
+    
+    Within a node the time model is inverted in closed form, so each GPU
+    type costs one evaluation: the minimum GPU count is the smallest count
+    whose speedup brings the single-GPU duration under the deadline. More
+    GPUs only add cost (each extra GPU is less than fully efficient), so the
+    minimum count is also the cheapest. Only when a full node is too slow
+    are multi-node counts scanned, using the topology model.
+    
+    A job takes its compute hours divided by the throughput factor, plus
+    the startup hours; the deadline is checked against that sum, in that
+    order, so callers that time jobs the same way agree exactly.
+    
+    With compiled constraints, only the GPU counts they allow are
+    considered; the smallest allowed count at or above the minimum is the
+    cheapest.
+    
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        dataset_size: Size of dataset
+        deadline_hours: Hours available
+        resources: Resource configuration data
+        instance_types: Instance types to consider (defaults to all)
+        budget_limit: Maximum hourly budget (if any)
+        max_gpu_count: Largest GPU count to consider
+        startup_hours: Hours every configuration spends starting up
+        throughput_factor: Speedup of the compute from training techniques
+        price_multiplier: Region price multiplier the budget is checked at
+        compiled: Result of constraints.compile_constraints (optional)
+        memory_factor: Scale of the model's memory footprint from training
+            techniques, which sets the multi-node layout
+        
+    Returns:
+        dict: Cheapest feasible option under "best" (None if infeasible),
+            every feasible option under "options", and the fastest possible
+            duration under "fastest_hours"
+    """
+    if instance_types is None:
+        instance_types = list(resources["instance_types"])
+    
+    time_model = resources.get("time_model")
+    reference_hours = workload_hours(task_type, model_size, dataset_size, time_model)
+    options = []
+    fastest_hours = None
+    
+    def job_hours(hours):
+        return hours / throughput_factor + startup_hours
+    
+    # Compute hours that fit in what startup leaves of the deadline; a
+    # deadline already spent cannot be met by any configuration
+    compute_hours = (deadline_hours - startup_hours) * throughput_factor
+    feasible_deadline = compute_hours > 0
+    
+    for gpu_type, gpu in resources["gpu_types"].items():
+        performance_factor = gpu["relative_performance"]
+        counts = {
+            instance_type: _allowed_counts(compiled, gpu_type, instance_type, max_gpu_count)
+            for instance_type in instance_types
+        }
+        
+        for instance_type in instance_types:
+            if not counts[instance_type]:
+                continue
+            gpu_fastest, _ = estimate_cluster_hours(
+                task_type, model_size, dataset_size, gpu_type, counts[instance_type][-1], instance_type, resources,
+                memory_factor
+            )
+            if fastest_hours is None or job_hours(gpu_fastest) < fastest_hours:
+                fastest_hours = job_hours(gpu_fastest)
+        
+        if not feasible_deadline:
+            continue
+        
+        gpu_count = min_gpus_for_speedup(reference_hours / (performance_factor * compute_hours), time_model)
+        # Guard against rounding at the boundary so the result agrees with
+        # a direct ``hours <= deadline`` check
+        if gpu_count > 1 and job_hours(estimate_hours(
+            task_type, model_size, dataset_size, performance_factor, gpu_count - 1, time_model
+        )) <= deadline_hours:
+            gpu_count -= 1
+        hours = job_hours(estimate_hours(task_type, model_size, dataset_size, performance_factor, gpu_count, time_model))
+        if hours > deadline_hours:
+            gpu_count += 1
+            hours = job_hours(estimate_hours(task_type, model_size, dataset_size, performance_factor, gpu_count, time_model))
+        
+        for instance_type in instance_types:
+            instance = resources["instance_types"][instance_type]
+            gpus_per_node = instance_topology(instance)["gpus_per_node"]
+            
+            # Within a node more GPUs are only faster; past it, or when no
+            # allowed count within reach is large enough, scan the nodes
+            option_count = next((count for count in counts[instance_type] if count >= gpu_count), None)
+            if option_count is not None and option_count <= gpus_per_node:
+                option_hours = hours if option_count == gpu_count else job_hours(estimate_hours(
+                    task_type, model_size, dataset_size, performance_factor, option_count, time_model
+                ))
+            else:
+                option_count, option_hours = _scan_multi_node(
+                    task_type, model_size, dataset_size, gpu_type, instance_type, deadline_hours,
+                    [count for count in counts[instance_type] if count > gpus_per_node], resources, job_hours,
+                    memory_factor
+                )
+                if option_count is None:
+                    continue
+            
+            if option_count > max_gpu_count or option_hours > deadline_hours:
+                continue
+            
+            hourly_cost = gpu["hourly_cost"] * option_count * instance["cost_multiplier"]
+            if budget_limit and hourly_cost * price_multiplier > budget_limit:
+                continue
+            
+            options.append({
+                "gpu_type": gpu_type,
+                "gpu_count": option_count,
+                "instance_type": instance_type,
+                "estimated_hours": option_hours,
+                "hourly_cost": hourly_cost,
+                "total_cost": hourly_cost * option_hours
+            })
+    
+    return _solution(deadline_hours, options, fastest_hours)
+
+def solve_flop_deadline(input_data, model_size, deadline_hours, resources,
+                        instance_types=None, budget_limit=None, max_gpu_count=MAX_GPU_COUNT, memory_factor=1.0,
+                        startup_hours=0.0, throughput_factor=1.0, price_multiplier=1.0, compiled=None):
+    """
+    Find the cheapest configuration that finishes a FLOP-described job within a deadline
+    
+    The counterpart of solve_deadline for jobs described by parameter and
+    token counts: times come from the FLOP model and the parallelism
+    layout, as in the engine's estimates. Communication overheads make the
+    time non-monotonic in the GPU count, so every count (that the compiled
+    constraints allow, if given) is evaluated and the smallest one that
+    meets the deadline is kept per GPU and instance type.
+    
+    Args:
+        input_data: Dictionary with the numeric workload inputs (see
+            flops.workload_flops)
+        model_size: Size of model (sizes the parallelism layout)
+        deadline_hours: Hours available
+        resources: Resource configuration data
+        instance_types: Instance types to consider (defaults to all)
+        budget_limit: Maximum hourly budget (if any)
+        max_gpu_count: Largest GPU count to consider
+        memory_factor: Scale of the model's memory footprint from training
+            techniques
+        startup_hours: Hours every configuration spends starting up
+        throughput_factor: Speedup of the compute from training techniques
+        price_multiplier: Region price multiplier the budget is checked at
+        compiled: Result of constraints.compile_constraints (optional)
+        
+    Returns:
+        dict: Same form as solve_deadline
+    """
+    if instance_types is None:
+        instance_types = list(resources["instance_types"])
+    
+    task_type = input_data["task_type"]
+    options = []
+    fastest_hours = None
+    
+    for gpu_type, gpu in resources["gpu_types"].items():
+        # The FLOP time without layout overheads does not depend on the
+        # instance type
+        base_hours = [
+            estimate_flop_hours(input_data, gpu_type, gpu_count, resources)[0]
+            for gpu_count in range(1, max_gpu_count + 1)
+        ]
+        
+        for instance_type in instance_types:
+            instance = resources["instance_types"][instance_type]
+            best = None
+            for gpu_count in _allowed_counts(compiled, gpu_type, instance_type, max_gpu_count):
+                hours = base_hours[gpu_count - 1]
+                layout = parallel_layout(
+                    task_type, model_size, gpu_type, gpu_count, instance_type, resources, memory_factor
+                )
+                hours = hours * layout["time_factor"] / throughput_factor + startup_hours
+                if fastest_hours is None or hours < fastest_hours:
+                    fastest_hours = hours
+                if best is None and hours <= deadline_hours:
+                    best = gpu_count, hours
+            if best is None:
+                continue
+            
+            option_count, option_hours = best
+            hourly_cost = gpu["hourly_cost"] * option_count * instance["cost_multiplier"]
+            if budget_limit and hourly_cost * price_multiplier > budget_limit:
+                continue
+            
+            options.append({
+                "gpu_type": gpu_type,
+                "gpu_count": option_count,
+                "instance_type": instance_type,
+                "estimated_hours": option_hours,
+                "hourly_cost": hourly_cost,
+                "total_cost": hourly_cost * option_hours
+            })
+    
+    return _solution(deadline_hours, options, fastest_hours)
+
+def _solution(deadline_hours, options, fastest_hours):
+    """
+    Rank the feasible options of a deadline solve
+    
+    Args:
+        deadline_hours: Hours available
+        options: Feasible options
+        fastest_hours: Fastest possible duration
+        
+    Returns:
+        dict: Result of solve_deadline
+    """
+    options.sort(key=lambda option: (option["total_cost"], option["estimated_hours"]))
+    
+    return {
+        "deadline_hours": deadline_hours,
+        "feasible": bool(options),
+        "best": options[0] if options else None,
+        "options": options,
+        "fastest_hours": fastest_hours
+    }
+
+def _allowed_counts(compiled, gpu_type, instance_type, max_gpu_count):
+    """
+    List the GPU counts a solver may use
+    
+    Args:
+        compiled: Result of constraints.compile_constraints, or None
+        gpu_type: GPU type
+        instance_type: Instance type
+        max_gpu_count: Largest GPU count to consider
+        
+    Returns:
+        list: Allowed counts in ascending order
+    """
+    if compiled is None:
+        return list(range(1, max_gpu_count + 1))
+    # NumPy is only needed for constraint masks
+    from .constraints import allowed_counts
+    allowed = allowed_counts(compiled, gpu_type, instance_type)[:max_gpu_count]
+    return [int(index) + 1 for index in allowed.nonzero()[0]]
+
+def _scan_multi_node(task_type, model_size, dataset_size, gpu_type, instance_type,
+                     deadline_hours, gpu_counts, resources, job_hours, memory_factor=1.0):
+    """
+    Find the smallest multi-node GPU count that meets a deadline
+    
+    Args:
+        task_type: Type of task
+        model_size: Size of model
+        dataset_size: Size of dataset
+        gpu_type: GPU type
+        instance_type: Instance type
+        deadline_hours: Hours available
+        gpu_counts: Multi-node GPU counts to try, in ascending order
+        resources: Resource configuration data
+        job_hours: Function from compute hours to job hours
+        memory_factor: Scale of the model's memory footprint from training
+            techniques
+        
+    Returns:
+        tuple: (GPU count, estimated job hours), or (None, None) if no
+            count meets the deadline
+    """
+    for gpu_count in gpu_counts:
+        hours, _ = estimate_cluster_hours(
+            task_type, model_size, dataset_size, gpu_type, gpu_count, instance_type, resources, memory_factor
+        )
+        hours = job_hours(hours)
+        if hours <= deadline_hours:
+            return gpu_count, hours
+    return None, None
@@ -0,0 +1,324 @@
+import heapq
+import json
+import numpy as np
+from .advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from .commitments import job_hours
+
+# Fields of a trace record that describe the submission rather than the workload
+SUBMISSION_FIELDS = ("submit_time", "hours", "priority_class", "preemptible", "job_id")
+
+# Number of distinct workloads whose decisions a policy keeps
+MAX_CACHED_DECISIONS = 65536
+
+# Completions sort before submissions at the same time, so freed GPUs are
+# available to jobs arriving at that instant
+_FINISH = 0
+_SUBMIT = 1
+
+def load_trace(file_path):
+    """
+    Load job submissions from a JSONL trace
+
+    Each line holds the advisor inputs of one job plus "submit_time" in
+    hours, and optionally "hours" (actual duration, overriding the policy's
+    estimate), "priority_class" (higher preempts lower, default 0) and
+    "preemptible" (default: the policy's decision, see simulate).
+
+    Args:
+        file_path (str): Path to a .jsonl file
+
+    Returns:
+        list: Submission dictionaries sorted by submit time
+
+    Raises:
+        ValueError: If the file is not JSONL or a record has no submit time
+    """
+    if not file_path.endswith((".jsonl", ".ndjson")):
+        raise ValueError(f"Unsupported trace format: {file_path}")
+
+    with open(file_path) as f:
+        trace = [json.loads(line) for line in f if line.strip()]
+
+    for line_number, record in enumerate(trace, start=1):
+        if record.get("submit_time") is None:
+            raise ValueError(f"Job {line_number} in {file_path} has no submit_time")
+
+    trace.sort(key=lambda record: record["submit_time"])
+    return trace
+
+def advisor_policy(name, resources=None, pricing=None, adjust_input=None, adjust_recommendation=None,
+                   recommend=generate_recommendation):
+    """
+    Build a placement policy that wraps the advisor
+
+    Rule changes are tried out by adjusting the inputs before, or the
+    recommendation after, the advisor runs, or by passing a modified
+    ``recommend`` function. Decisions are cached per distinct workload, so
+    a trace costs one advisor call per workload shape rather than per job.
+
+    Args:
+        name: Policy name used in reports
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+        adjust_input: Function mapping input data to the input the advisor
+            sees (optional)
+        adjust_recommendation: Function (recommendation, input data) ->
+            recommendation applied to every advisor result (optional)
+        recommend: Recommendation function with the signature of
+            generate_recommendation
+
+    Returns:
+        dict: Policy with "name" and "decide", a function from input data to
+            a decision with "gpu_type", "gpu_count", "instance_type",
+            "region", "hours", "hourly_cost" and "preemptible" (whether the
+            catalog marks the instance type preemptible)
+    """
+    if resources is None:
+        resources = load_resource_configs()
+    if pricing is None:
+        pricing = load_pricing()
+
+    decisions = {}
+
+    def decide(input_data):
+        key = tuple(sorted(input_data.items()))
+        decision = decisions.get(key)
+        if decision is None:
+            advisor_input = adjust_input(dict(input_data)) if adjust_input else dict(input_data)
+            advisor_input.setdefault("budget_limit", None)
+            advisor_input.setdefault("deadline", None)
+
+            recommendation = recommend(advisor_input, resources, pricing)
+            if adjust_recommendation:
+                recommendation = adjust_recommendation(recommendation, advisor_input)
+
+            instance_type = recommendation["instance_type"]
+            decision = {
+                "gpu_type": recommendation["gpu_type"],
+                "gpu_count": recommendation["gpu_count"],
+                "instance_type": instance_type,
+                "region": recommendation["region"],
+                "hours": job_hours(recommendation),
+                "hourly_cost": recommendation["estimated_cost"],
+                "preemptible": resources["instance_types"][instance_type].get("preemptible", False)
+            }
+            if len(decisions) >= MAX_CACHED_DECISIONS:
+                decisions.clear()
+            decisions[key] = decision
+        return decision
+
+    return {"name": name, "decide": decide}
+
+def uniform_inventory(resources, gpus_per_type):
+    """
+    Give every region the same number of GPUs of every type
+
+    Args:
+        resources: Resource configuration data with "regions"
+        gpus_per_type: GPUs of each type in each region
+
+    Returns:
+        dict: Region -> GPU type -> GPU count
+    """
+    return {
+        region: {gpu_type: gpus_per_type for gpu_type in resources["gpu_types"]}
+        for region in resources["regions"]
+    }
+
+def simulate(trace, policy, inventory):
+    """
+    Replay a trace of job submissions against finite GPU inventory
+
+    Event-driven: submissions and completions are processed in time order
+    from a heap. A job runs in the (region, GPU type) pool its policy picks
+    once enough GPUs are free, otherwise it waits in that pool's queue,
+    ordered by priority class and then submit time. A job that cannot start
+    may preempt preemptible jobs of a lower priority class in its pool,
+    which are requeued with their remaining work. A job is preemptible if
+    its trace record says so, otherwise if its decision does (the instance
+    type's catalog flag for advisor policies); decisions without the flag
+    count as preemptible. Jobs that need more GPUs than their pool has are
+    rejected.
+
+    Args:
+        trace: Submissions sorted by "submit_time" (see load_trace)
+        policy: Policy from advisor_policy or any dict with "name" and
+            "decide"
+        inventory: Region -> GPU type -> GPU count
+
+    Returns:
+        dict: Cost, queue waits, makespan, utilization per pool and job
+            counts for the policy
+    """
+    decide = policy["decide"]
+    capacity = {
+        (region, gpu_type): count
+        for region, gpus in inventory.items() for gpu_type, count in gpus.items()
+    }
+    free = dict(capacity)
+    queues = {pool: [] for pool in capacity}
+    running = {pool: {} for pool in capacity}
+    busy_gpu_hours = dict.fromkeys(capacity, 0.0)
+
+    jobs = []
+    events = []
+    sequence = 0
+    for record in trace:
+        events.append((record["submit_time"], _SUBMIT, sequence, len(jobs)))
+        jobs.append(record)
+        sequence += 1
+    heapq.heapify(events)
+
+    # Per-job state, indexed by job number
+    job_count = len(jobs)
+    pool_of = [None] * job_count
+    gpus_of = [0] * job_count
+    remaining = [0.0] * job_count
+    started_at = [0.0] * job_count
+    first_start = [None] * job_count
+    run_id = [0] * job_count
+    hourly_cost = [0.0] * job_count
+    priority_class = [0] * job_count
+    preemptible = [True] * job_count
+
+    total_cost = 0.0
+    waits = []
+    preemptions = 0
+    rejected = 0
+    completed = 0
+    first_submit = None
+    last_finish = 0.0
+
+    def start(job, now):
+        nonlocal sequence
+        pool = pool_of[job]
+        free[pool] -= gpus_of[job]
+        running[pool][job] = None
+        started_at[job] = now
+        if first_start[job] is None:
+            first_start[job] = now
+            waits.append(now - jobs[job]["submit_time"])
+        sequence += 1
+        heapq.heappush(events, (now + remaining[job], _FINISH, sequence, job, run_id[job]))
+
+    def stop(job, now):
+        nonlocal total_cost
+        pool = pool_of[job]
+        elapsed = now - started_at[job]
+        free[pool] += gpus_of[job]
+        del running[pool][job]
+        # Invalidates the pending completion of a preempted run
+        run_id[job] += 1
+        busy_gpu_hours[pool] += elapsed * gpus_of[job]
+        total_cost += elapsed * hourly_cost[job]
+        return elapsed
+
+    def enqueue(job):
+        nonlocal sequence
+        sequence += 1
+        heapq.heappush(queues[pool_of[job]], (-priority_class[job], jobs[job]["submit_time"], sequence, job))
+
+    def dispatch(pool, now):
+        queue = queues[pool]
+        while queue and gpus_of[queue[0][3]] <= free[pool]:
+            start(heapq.heappop(queue)[3], now)
+
+    def try_preempt(job, now):
+        nonlocal preemptions
+        pool = pool_of[job]
+        # Lowest class first, then the most recently started (least work lost)
+        victims = sorted(
+            (victim for victim in running[pool]
+             if priority_class[victim] < priority_class[job] and preemptible[victim]),
+            key=lambda victim: (priority_class[victim], -started_at[victim])
+        )
+        needed = gpus_of[job] - free[pool]
+        chosen = []
+        for victim in victims:
+            if needed <= 0:
+                break
+            chosen.append(victim)
+            needed -= gpus_of[victim]
+        if needed > 0:
+            return False
+
+        for victim in chosen:
+            remaining[victim] -= stop(victim, now)
+            preemptions += 1
+            enqueue(victim)
+        start(job, now)
+        return True
+
+    while events:
+        event = heapq.heappop(events)
+        now, kind, job = event[0], event[1], event[3]
+
+        if kind == _SUBMIT:
+            record = jobs[job]
+            if first_submit is None:
+                first_submit = now
+            input_data = {key: value for key, value in record.items() if key not in SUBMISSION_FIELDS}
+            decision = decide(input_data)
+            pool = (decision["region"], decision["gpu_type"])
+
+            if decision["gpu_count"] > capacity.get(pool, 0):
+                rejected += 1
+                continue
+
+            pool_of[job] = pool
+            gpus_of[job] = decision["gpu_count"]
+            remaining[job] = record.get("hours", decision["hours"])
+            hourly_cost[job] = decision["hourly_cost"]
+            priority_class[job] = record.get("priority_class", 0)
+            preemptible[job] = record.get("preemptible", decision.get("preemptible", True))
+
+            queue = queues[pool]
+            if gpus_of[job] <= free[pool]:
+                # Jobs only overtake the queue with a higher priority class
+                if not queue or priority_class[job] > -queue[0][0]:
+                    start(job, now)
+                else:
+                    enqueue(job)
+            elif not try_preempt(job, now):
+                enqueue(job)
+        else:
+            # Completions of runs that were preempted are stale
+            if event[4] != run_id[job]:
+                continue
+            stop(job, now)
+            completed += 1
+            last_finish = now
+            dispatch(pool_of[job], now)
+
+    makespan = last_finish - first_submit if first_submit is not None else 0.0
+    waits = np.array(waits)
+
+    return {
+        "policy": policy["name"],
+        "jobs": job_count,
+        "completed": completed,
+        "rejected": rejected,
+        "preemptions": preemptions,
+        "total_cost": total_cost,
+        "mean_wait_hours": float(waits.mean()) if len(waits) else 0.0,
+        "p95_wait_hours": float(np.percentile(waits, 95)) if len(waits) else 0.0,
+        "makespan_hours": makespan,
+        "utilization": {
+            f"{region}/{gpu_type}": busy_gpu_hours[(region, gpu_type)] / (count * makespan) if count and makespan else 0.0
+            for (region, gpu_type), count in capacity.items()
+        }
+    }
+
+def compare_policies(trace, policies, inventory):
+    """
+    Replay the same trace under several policies
+
+    Args:
+        trace: Submissions sorted by "submit_time"
+        policies: Policies (see advisor_policy)
+        inventory: Region -> GPU type -> GPU count
+
+    Returns:
+        dict: Policy name -> simulation result
+    """
+    return {policy["name"]: simulate(trace, policy, inventory) for policy in policies}
@@ -0,0 +1,159 @@
+from .time_model import parallel_speedup
+
+# FLOPs per parameter per token: forward pass 2, backward pass 4
+FLOPS_PER_PARAMETER_TOKEN = {
+    "Training": 6,
+    "Fine-tuning": 6,
+    "Batch Inference": 2
+}
+
+# Average bytes of raw text per token, used when only dataset bytes are known
+BYTES_PER_TOKEN = 4
+
+# Precision used when the input does not name one
+DEFAULT_PRECISION = "bf16"
+
+# Model FLOPs utilization by task when the catalog has no "mfu" table
+DEFAULT_MFU = {
+    "Training": 0.4,
+    "Fine-tuning": 0.35,
+    "Batch Inference": 0.3
+}
+
+def has_flop_inputs(input_data):
+    """
+    Check whether the input carries the numeric workload description
+
+    Args:
+        input_data: Dictionary containing user inputs
+
+    Returns:
+        bool: True if a parameter count and a token or byte count are given
+    """
+    if input_data is None or input_data["task_type"] not in FLOPS_PER_PARAMETER_TOKEN:
+        return False
+    has_data = input_data.get("training_tokens") or input_data.get("dataset_bytes")
+    return bool(input_data.get("parameters")) and bool(has_data)
+
+def workload_tokens(input_data):
+    """
+    Get the number of tokens a job processes
+
+    Args:
+        input_data: Dictionary with "training_tokens" or "dataset_bytes"
+            and optionally "epochs"
+
+    Returns:
+        float: Total tokens processed
+    """
+    tokens = input_data.get("training_tokens")
+    if not tokens:
+        tokens = input_data["dataset_bytes"] / BYTES_PER_TOKEN
+    return float(tokens) * input_data.get("epochs", 1)
+
+def workload_flops(input_data):
+    """
+    Estimate the compute of the job described by the numeric inputs
+
+    Args:
+        input_data: Dictionary with "parameters" and "training_tokens" or
+            "dataset_bytes"; optional "epochs", "sequence_length",
+            "num_layers" and "hidden_size"
+
+    Returns:
+        float: Total FLOPs
+    """
+    return estimate_flops(
+        input_data["task_type"],
+        float(input_data["parameters"]),
+        workload_tokens(input_data),
+        input_data.get("sequence_length"),
+        input_data.get("num_layers"),
+        input_data.get("hidden_size")
+    )
+
+def estimate_flops(task_type, parameters, tokens, sequence_length=None, num_layers=None, hidden_size=None):
+    """
+    Estimate the compute of a job in FLOPs
+
+    Uses the dense-transformer approximation of 6*N*D FLOPs for training
+    (2*N*D for inference). When the sequence length and architecture are
+    known, the attention term 2*L*S*d per token per forward pass is added.
+    Arguments may be NumPy arrays to estimate many workloads at once.
+
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        parameters: Parameter count N
+        tokens: Tokens processed D
+        sequence_length: Context length S
+        num_layers: Number of transformer layers L
+        hidden_size: Model width d
+
+    Returns:
+        float or array: Total FLOPs
+    """
+    flops_per_token = FLOPS_PER_PARAMETER_TOKEN[task_type] * parameters
+    if sequence_length and num_layers and hidden_size:
+        passes = FLOPS_PER_PARAMETER_TOKEN[task_type] / 2
+        flops_per_token = flops_per_token + passes * 2 * num_layers * sequence_length * hidden_size
+    return flops_per_token * tokens
+
+def sustained_tflops(gpu, precision, task_type, resources):
+    """
+    Get the TFLOPs a GPU sustains on a task at a precision
+
+    Precisions the GPU has no tensor-core support for run at its FP32 rate.
+
+    Args:
+        gpu: GPU entry from the catalog
+        precision: Numeric precision (e.g., "fp32", "tf32", "fp16", "bf16", "fp8")
+        task_type: Type of task
+        resources: Resource configuration data
+
+    Returns:
+        float: Peak TFLOPs times model FLOPs utilization
+    """
+    peak = gpu["peak_tflops"]
+    mfu = resources.get("mfu", DEFAULT_MFU)[task_type]
+    return peak.get(precision, peak["fp32"]) * mfu
+
+def flop_hours(flops, tflops, gpu_count, time_model=None):
+    """
+    Convert FLOPs into wall time on a set of GPUs
+
+    ``tflops`` and ``gpu_count`` may be NumPy arrays to time every
+    candidate configuration at once.
+
+    Args:
+        flops: Total FLOPs of the job
+        tflops: Sustained TFLOPs per GPU
+        gpu_count: Number of GPUs
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+
+    Returns:
+        float or array: Estimated hours
+    """
+    return flops / (tflops * 1e12 * parallel_speedup(gpu_count, time_model)) / 3600
+
+def estimate_flop_hours(input_data, gpu_type, gpu_count, resources):
+    """
+    Estimate the wall time of a job described by parameter and token counts
+
+    Args:
+        input_data: Dictionary with the numeric workload inputs (see
+            workload_flops) and optionally "precision"
+        gpu_type: GPU type
+        gpu_count: Number of GPUs
+        resources: Resource configuration data
+
+    Returns:
+        tuple: (estimated hours, total FLOPs)
+    """
+    flops = workload_flops(input_data)
+    tflops = sustained_tflops(
+        resources["gpu_types"][gpu_type],
+        input_data.get("precision", DEFAULT_PRECISION),
+        input_data["task_type"],
+        resources
+    )
+    return flop_hours(flops, tflops, gpu_count, resources.get("time_model")), flops
@@ -0,0 +1,447 @@
+import csv
+import heapq
+import json
+import math
+import os
+import threading
+import numpy as np
+from .catalog import catalog_version
+from .flops import BYTES_PER_TOKEN
+from .shared_catalog import map_arrays, write_arrays
+from .storage import dataset_gb
+
+# File type marker of saved indexes
+MAGIC = b"FLEXKNN1"
+
+# Environment variable naming the index the engine's history estimator uses
+HISTORY_INDEX_ENV = "FLEXAI_HISTORY_INDEX"
+
+# Columns every job record must provide
+HISTORY_FIELDS = ("task_type", "gpu_type", "gpu_count", "actual_hours")
+
+# Optional numeric columns, converted from strings when read from CSV
+NUMERIC_FIELDS = ("parameters", "training_tokens", "dataset_bytes", "epochs", "actual_cost")
+
+# Task types with a one-hot feature; Real-time Inference jobs have no duration
+TASK_TYPES = ("Training", "Fine-tuning", "Batch Inference")
+
+FEATURES = TASK_TYPES + ("log_parameters", "log_tokens", "log_gpu_count", "log_gpu_performance")
+
+# Distance between jobs of different task types, in standard deviations, so
+# neighbors come from another task type only when nothing else is close
+TASK_WEIGHT = 4.0
+
+# Parameter count assumed for inputs that only give a model size bucket
+BUCKET_PARAMETERS = {"Small": 1.3e9, "Medium": 7e9, "Large": 13e9, "XL": 34e9}
+
+# Points per leaf; leaves are scanned with one vectorized distance
+LEAF_SIZE = 64
+
+# Arrays describing the tree nodes
+_NODE_ARRAYS = ("node_start", "node_end", "split_dim", "left_max", "right_min", "right_child")
+
+# Neighbors averaged into an estimate
+DEFAULT_NEIGHBORS = 5
+
+_loaded = {}
+_lock = threading.Lock()
+
+def load_history(file_path):
+    """
+    Load completed jobs from a CSV or JSONL history file
+
+    Jobs are described by "parameters" (or a "model_size" bucket) and
+    "training_tokens" or "dataset_bytes" (or a "dataset_size" bucket) in
+    addition to HISTORY_FIELDS; "actual_cost" is optional. Real-time
+    Inference jobs and jobs without a positive duration are skipped.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl file
+
+    Returns:
+        list: Job dictionaries with numeric fields converted
+
+    Raises:
+        ValueError: If a record is missing a field or has an unknown format
+    """
+    if file_path.endswith(".csv"):
+        with open(file_path, newline="") as f:
+            records = list(csv.DictReader(f))
+    elif file_path.endswith((".jsonl", ".ndjson")):
+        with open(file_path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        raise ValueError(f"Unsupported job history format: {file_path}")
+
+    jobs = []
+    for line_number, record in enumerate(records, start=1):
+        missing = [field for field in HISTORY_FIELDS if record.get(field) in (None, "")]
+        if not record.get("parameters") and not record.get("model_size"):
+            missing.append("parameters")
+        if not any(record.get(field) for field in ("training_tokens", "dataset_bytes", "dataset_size")):
+            missing.append("training_tokens")
+        if missing:
+            raise ValueError(f"Job {line_number} in {file_path} is missing {', '.join(missing)}")
+
+        job = {field: value for field, value in record.items() if value not in (None, "")}
+        job["gpu_count"] = int(job["gpu_count"])
+        job["actual_hours"] = float(job["actual_hours"])
+        for field in NUMERIC_FIELDS:
+            if field in job:
+                job[field] = float(job[field])
+
+        if job["task_type"] not in TASK_TYPES or job["actual_hours"] <= 0:
+            continue
+        jobs.append(job)
+
+    return jobs
+
+def job_features(jobs, resources):
+    """
+    Compute the raw feature vector of jobs or workloads
+
+    Sizes enter on a log scale so that distances compare ratios: a 7B and
+    a 13B model are as far apart as 70B and 130B.
+
+    Args:
+        jobs: Dictionaries with "task_type", "gpu_type", "gpu_count" and a
+            model and data size (see load_history)
+        resources: Resource configuration data
+
+    Returns:
+        numpy.ndarray: (jobs, features) array in FEATURES order
+    """
+    features = np.zeros((len(jobs), len(FEATURES)))
+    for row, job in enumerate(jobs):
+        features[row, TASK_TYPES.index(job["task_type"])] = TASK_WEIGHT
+
+        parameters = job.get("parameters") or BUCKET_PARAMETERS[job["model_size"]]
+        tokens = job.get("training_tokens")
+        if not tokens:
+            tokens = dataset_gb(job.get("dataset_size"), job) * 1e9 / BYTES_PER_TOKEN
+        tokens *= job.get("epochs", 1)
+
+        features[row, len(TASK_TYPES):] = (
+            math.log10(parameters),
+            math.log10(tokens),
+            math.log2(job["gpu_count"]),
+            math.log2(resources["gpu_types"][job["gpu_type"]]["relative_performance"])
+        )
+    return features
+
+def job_cost(job, resources):
+    """
+    Get the cost of a completed job
+
+    Args:
+        job: Job dictionary
+        resources: Resource configuration data
+
+    Returns:
+        float: "actual_cost", or the list price of its hours if not recorded
+    """
+    if "actual_cost" in job:
+        return job["actual_cost"]
+    instance = resources["instance_types"].get(job.get("instance_type"), {})
+    hourly_cost = resources["gpu_types"][job["gpu_type"]]["hourly_cost"] * job["gpu_count"]
+    return hourly_cost * instance.get("cost_multiplier", 1.0) * job["actual_hours"]
+
+def build_index(jobs, resources, leaf_size=LEAF_SIZE):
+    """
+    Build a KD-tree over the normalized features of completed jobs
+
+    The tree is stored as flat arrays so that it can be memory-mapped:
+    points are reordered so that every node covers a contiguous range, and
+    nodes are numbered in preorder (a node's left child follows it). Each
+    node splits its widest dimension near the median, moved to the edge of
+    a run of equal values so that discrete features such as GPU count split
+    cleanly, and records the largest value on its left and the smallest on
+    its right. Ranges of at most ``leaf_size`` points are leaves. Numeric
+    features are standardized; the one-hot task features keep TASK_WEIGHT.
+
+    Args:
+        jobs: Job dictionaries (see load_history)
+        resources: Resource configuration data
+        leaf_size: Largest number of points in a leaf
+
+    Returns:
+        dict: Index header fields and arrays (see save_index)
+
+    Raises:
+        ValueError: If there are no jobs
+    """
+    if not jobs:
+        raise ValueError("Cannot build a history index without jobs")
+
+    raw = job_features(jobs, resources)
+    numeric = slice(len(TASK_TYPES), None)
+    mean = np.zeros(len(FEATURES))
+    scale = np.ones(len(FEATURES))
+    mean[numeric] = raw[:, numeric].mean(axis=0)
+    std = raw[:, numeric].std(axis=0)
+    scale[numeric] = np.where(std > 0, std, 1.0)
+    points = (raw - mean) / scale
+
+    order = np.arange(len(jobs))
+    nodes = {"node_start": [], "node_end": [], "split_dim": [], "left_max": [], "right_min": [], "right_child": []}
+
+    def build(low, high):
+        node = len(nodes["node_start"])
+        for name, value in (("node_start", low), ("node_end", high), ("split_dim", -1),
+                            ("left_max", 0.0), ("right_min", 0.0), ("right_child", -1)):
+            nodes[name].append(value)
+        if high - low <= leaf_size:
+            return
+
+        segment = order[low:high]
+        values = points[segment]
+        spread = values.max(axis=0) - values.min(axis=0)
+        dim = int(np.argmax(spread))
+        if spread[dim] == 0:
+            return
+
+        ranked = np.argsort(values[:, dim], kind="stable")
+        column = values[ranked, dim]
+        split = (high - low) // 2
+        if column[split - 1] == column[split]:
+            first = int(np.searchsorted(column, column[split], "left"))
+            last = int(np.searchsorted(column, column[split], "right"))
+            split = first if first > 0 and (split - first <= last - split or last == len(column)) else last
+
+        order[low:high] = segment[ranked]
+        nodes["split_dim"][node] = dim
+        nodes["left_max"][node] = float(column[split - 1])
+        nodes["right_min"][node] = float(column[split])
+        build(low, low + split)
+        nodes["right_child"][node] = len(nodes["node_start"])
+        build(low + split, high)
+
+    build(0, len(jobs))
+
+    return {
+        "catalog_version": catalog_version(resources),
+        "features": list(FEATURES),
+        "mean": mean.tolist(),
+        "scale": scale.tolist(),
+        "points": np.ascontiguousarray(points[order]),
+        "job_index": order.astype(np.int64),
+        "hours": np.array([jobs[i]["actual_hours"] for i in order]),
+        "cost": np.array([job_cost(jobs[i], resources) for i in order]),
+        "node_start": np.array(nodes["node_start"], dtype=np.int64),
+        "node_end": np.array(nodes["node_end"], dtype=np.int64),
+        "split_dim": np.array(nodes["split_dim"], dtype=np.int8),
+        "left_max": np.array(nodes["left_max"]),
+        "right_min": np.array(nodes["right_min"]),
+        "right_child": np.array(nodes["right_child"], dtype=np.int64)
+    }
+
+def save_index(index, file_path):
+    """
+    Save an index to a file that load_index memory-maps
+
+    Args:
+        index: Result of build_index
+        file_path (str): Destination path
+    """
+    arrays = {name: value for name, value in index.items() if isinstance(value, np.ndarray)}
+    header = {name: value for name, value in index.items() if name not in arrays and not name.startswith("_")}
+    write_arrays(file_path, MAGIC, header, arrays)
+
+def load_index(file_path):
+    """
+    Memory-map a saved index, reusing it until the file is replaced
+
+    Args:
+        file_path (str): Path of a file written by save_index
+
+    Returns:
+        dict: Index with read-only array views
+
+    Raises:
+        ValueError: If the file is not a saved index
+    """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    cached = _loaded.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    header, arrays = map_arrays(file_path, MAGIC)
+    del header["arrays"]
+    index = dict(header, **arrays)
+    # Built before the index is shared so that queries never modify it
+    _tree_lists(index)
+
+    with _lock:
+        _loaded[key] = (signature, index)
+
+    return index
+
+def nearest_jobs(index, workload, resources, k=DEFAULT_NEIGHBORS):
+    """
+    Find the completed jobs most similar to a workload
+
+    Descends to the workload's side of each split first and visits the
+    other side only if its cell is closer than the k-th best match so far.
+    The distance to a cell is kept incrementally from the per-dimension
+    offsets of the splits above it, which prunes far more than comparing
+    against a single splitting plane. Time and cost are averaged over the
+    matches weighted by inverse distance; exact matches, if any, are
+    averaged alone.
+
+    Args:
+        index: Result of build_index or load_index
+        workload: Dictionary with the fields of a history job except the
+            outcomes
+        resources: Resource configuration data
+        k: Number of neighbors
+
+    Returns:
+        dict: Neighbor "job_index" and "distances" (nearest first), their
+            "hours" and "costs", and the weighted "estimated_hours" and
+            "estimated_cost"
+    """
+    points = index["points"]
+    tree = _tree_lists(index)
+    node_start, node_end, split_dim, left_max, right_min, right_child = tree
+    query = (job_features([workload], resources)[0] - index["mean"]) / index["scale"]
+    query_list = query.tolist()
+    offsets = [0.0] * len(query_list)
+    k = min(k, len(points))
+
+    # Max-heap of (-squared distance, position) holding the best k so far
+    best = []
+
+    def scan(low, high):
+        difference = points[low:high] - query
+        distances = np.einsum("ij,ij->i", difference, difference)
+        if len(best) == k:
+            closer = np.flatnonzero(distances < -best[0][0])
+            positions, distances = (closer + low).tolist(), distances[closer].tolist()
+        else:
+            positions, distances = range(low, high), distances.tolist()
+        for position, distance in zip(positions, distances):
+            if len(best) < k:
+                heapq.heappush(best, (-distance, position))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, position))
+
+    def search(node, cell_distance):
+        dim = split_dim[node]
+        if dim < 0:
+            scan(node_start[node], node_end[node])
+            return
+
+        value = query_list[dim]
+        offset = offsets[dim]
+        left_gap = value - left_max[node]
+        right_gap = right_min[node] - value
+        if left_gap <= right_gap:
+            near, near_gap, far, far_gap = node + 1, left_gap, right_child[node], right_gap
+        else:
+            near, near_gap, far, far_gap = right_child[node], right_gap, node + 1, left_gap
+
+        near_offset = max(offset, near_gap)
+        offsets[dim] = near_offset
+        search(near, cell_distance - offset * offset + near_offset * near_offset)
+
+        far_offset = max(offset, far_gap)
+        far_distance = cell_distance - offset * offset + far_offset * far_offset
+        if len(best) < k or far_distance < -best[0][0]:
+            offsets[dim] = far_offset
+            search(far, far_distance)
+        offsets[dim] = offset
+
+    search(0, 0.0)
+
+    matches = sorted((-distance, position) for distance, position in best)
+    positions = np.array([position for _, position in matches])
+    distances = np.sqrt(np.maximum([distance for distance, _ in matches], 0.0))
+    hours = index["hours"][positions]
+    costs = index["cost"][positions]
+
+    exact = distances == 0
+    weights = exact.astype(float) if exact.any() else 1 / distances
+
+    return {
+        "job_index": index["job_index"][positions].tolist(),
+        "distances": distances.tolist(),
+        "hours": hours.tolist(),
+        "costs": costs.tolist(),
+        "estimated_hours": float(weights @ hours / weights.sum()),
+        "estimated_cost": float(weights @ costs / weights.sum())
+    }
+
+def _tree_lists(index):
+    """
+    Get the node arrays of an index as Python lists
+
+    The search touches single nodes, which is faster on lists than on
+    NumPy arrays; the lists are built once per index.
+
+    Args:
+        index: Result of build_index or load_index
+
+    Returns:
+        tuple: node_start, node_end, split_dim, left_max, right_min and
+            right_child lists
+    """
+    tree = index.get("_tree")
+    if tree is None:
+        tree = tuple(index[name].tolist() for name in _NODE_ARRAYS)
+        index["_tree"] = tree
+    return tree
+
+def history_estimate(input_data, recommendation, resources):
+    """
+    Estimate a recommended configuration from similar past jobs
+
+    Used by calculate_estimates when the input sets "estimator" to
+    "history". The index is the input's "history_index" path, or the file
+    named by FLEXAI_HISTORY_INDEX.
+
+    Args:
+        input_data: User input data
+        recommendation: Recommendation with the configuration to estimate
+        resources: Resource configuration data
+
+    Returns:
+        dict: Result of nearest_jobs
+
+    Raises:
+        ValueError: If no index is configured
+    """
+    file_path = input_data.get("history_index") or os.environ.get(HISTORY_INDEX_ENV)
+    if not file_path:
+        raise ValueError(f"The history estimator needs a history_index input or {HISTORY_INDEX_ENV}")
+
+    workload = dict(
+        input_data,
+        gpu_type=recommendation["gpu_type"],
+        gpu_count=recommendation["gpu_count"],
+        instance_type=recommendation["instance_type"]
+    )
+    return nearest_jobs(load_index(file_path), workload, resources, input_data.get("neighbors", DEFAULT_NEIGHBORS))
+
+def main(argv=None):
+    """
+    Command-line entry point: build a history index from a job history file
+    """
+    import argparse
+    from .advisor_engine import load_resource_configs
+
+    parser = argparse.ArgumentParser(description="Index completed jobs for nearest-neighbor estimates")
+    parser.add_argument("history", help="CSV or JSONL file of completed jobs")
+    parser.add_argument("output", help="Index file (point FLEXAI_HISTORY_INDEX at it)")
+    parser.add_argument("--catalog", default="data/resource_configs.json", help="Resource catalog")
+    parser.add_argument("--leaf-size", type=int, default=LEAF_SIZE, help="Points per tree leaf")
+    args = parser.parse_args(argv)
+
+    jobs = load_history(args.history)
+    save_index(build_index(jobs, load_resource_configs(args.catalog), args.leaf_size), args.output)
+    print(f"Indexed {len(jobs)} jobs into {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import bisect
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_state = {
+    "enabled": os.environ.get("FLEXAI_INSTRUMENTATION") == "1",
+    "profile_sample_rate": 0.0,
+    "profile_dir": None,
+    "profiler": "cprofile"
+}
+_stats = {}
+_lock = threading.Lock()
+_profile_lock = threading.Lock()
+
+def enable(profile_sample_rate=0.0, profile_dir=None, profiler="cprofile"):
+    """
+    Turn on stage timing, optionally profiling a sample of requests
+
+    Args:
+        profile_sample_rate: Fraction of profiled calls to dump (0 disables)
+        profile_dir: Directory that profile files are written to
+        profiler: "cprofile" or "pyinstrument"
+    """
+    if profile_sample_rate and not profile_dir:
+        raise ValueError("profile_dir is required when profiling is sampled")
+
+    _state["profile_sample_rate"] = profile_sample_rate
+    _state["profile_dir"] = profile_dir
+    _state["profiler"] = profiler
+    _state["enabled"] = True
+
+def disable():
+    """
+    Turn off stage timing and profiling
+    """
+    _state["enabled"] = False
+    _state["profile_sample_rate"] = 0.0
+
+def is_enabled():
+    """
+    Check whether instrumentation is active
+
+    Returns:
+        bool: True if stage timing is recorded
+    """
+    return _state["enabled"]
+
+def reset():
+    """
+    Discard all recorded timings
+    """
+    with _lock:
+        _stats.clear()
+
+def record(stage, seconds):
+    """
+    Record one timed call of a stage
+
+    Args:
+        stage: Stage name
+        seconds: Wall time of the call
+    """
+    with _lock:
+        stats = _stats.get(stage)
+        if stats is None:
+            stats = _stats[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * (len(BUCKETS) + 1)}
+        stats["count"] += 1
+        stats["sum"] += seconds
+        stats["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+
+def timed(stage, profile=False):
+    """
+    Decorator that records the wall time of every call to a stage
+
+    When instrumentation is disabled the wrapper costs a single flag check.
+
+    Args:
+        stage: Stage name used in the exported metrics
+        profile: Whether sampled calls are run under a profiler
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return func(*args, **kwargs)
+
+            if profile and _state["profile_sample_rate"] and random.random() < _state["profile_sample_rate"]:
+                return _run_profiled(stage, func, args, kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def _run_profiled(stage, func, args, kwargs):
+    """
+    Run one call under a profiler and dump the profile to disk
+
+    Only one profiled call runs at a time; concurrent samples are timed
+    without profiling.
+
+    Args:
+        stage: Stage name
+        func: Function to call
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        The function's return value
+    """
+    if not _profile_lock.acquire(blocking=False):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(stage, time.perf_counter() - start)
+
+    try:
+        os.makedirs(_state["profile_dir"], exist_ok=True)
+        base_name = os.path.join(_state["profile_dir"], f"{stage}-{time.time_ns()}")
+
+        if _state["profiler"] == "pyinstrument":
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            start = time.perf_counter()
+            profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop()
+                record(stage, time.perf_counter() - start)
+                with open(base_name + ".html", "w") as f:
+                    f.write(profiler.output_html())
+
+        import cProfile
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            record(stage, time.perf_counter() - start)
+            profiler.dump_stats(base_name + ".prof")
+    finally:
+        _profile_lock.release()
+
+def snapshot():
+    """
+    Get a JSON-serializable copy of all recorded timings
+
+    Returns:
+        dict: Per-stage count, total seconds, mean seconds and histogram
+    """
+    with _lock:
+        stages = {}
+        for stage, stats in _stats.items():
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(BUCKETS + ("+Inf",), stats["buckets"]):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+
+            stages[stage] = {
+                "count": stats["count"],
+                "sum_seconds": stats["sum"],
+                "mean_seconds": stats["sum"] / stats["count"],
+                "histogram": histogram
+            }
+    return {"enabled": _state["enabled"], "stages": stages}
+
+def render_json():
+    """
+    Render recorded timings as a JSON document
+
+    Returns:
+        str: JSON text
+    """
+    return json.dumps(snapshot(), indent=2, sort_keys=True)
+
+def render_prometheus(metric_name="flexai_advisor_stage_seconds"):
+    """
+    Render recorded timings in the Prometheus text exposition format
+
+    Args:
+        metric_name: Name of the exported histogram metric
+
+    Returns:
+        str: Prometheus text
+    """
+    lines = [
+        f"# HELP {metric_name} Wall time spent in advisor stages.",
+        f"# TYPE {metric_name} histogram"
+    ]
+
+    for stage, stats in sorted(snapshot()["stages"].items()):
+        for bound, cumulative in stats["histogram"].items():
+            lines.append(f'{metric_name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric_name}_sum{{stage="{stage}"}} {stats["sum_seconds"]}')
+        lines.append(f'{metric_name}_count{{stage="{stage}"}} {stats["count"]}')
+
+    return "\n".join(lines) + "\n"
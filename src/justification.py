@@ -0,0 +1,236 @@
+import threading
+from .catalog import catalog_version
+
+# Integer codes for the categorical inputs that justifications depend on
+TASK_TYPES = ("Training", "Fine-tuning", "Batch Inference", "Real-time Inference")
+MODEL_SIZES = ("Small", "Medium", "Large", "XL")
+PRIORITIES = ("Minimize Cost", "Minimize Time", "Balanced")
+
+_TASK_CODES = {name: code for code, name in enumerate(TASK_TYPES)}
+_MODEL_CODES = {name: code for code, name in enumerate(MODEL_SIZES)}
+_PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+
+PRIORITY_LINES = (
+    "**Cost Optimization:** This configuration balances performance needs while keeping costs lower, as per your priority.",
+    "**Performance Optimization:** This configuration prioritizes speed and processing power, as per your priority.",
+    "**Balanced Approach:** This configuration offers a good balance between cost efficiency and performance."
+)
+BUDGET_LINE = "**Budget Consideration:** Configuration designed to stay within your specified budget limit of ${budget_limit}/hour."
+BUDGET_EXCEEDED_LINE = "**Budget Warning:** No configuration that meets your other requirements fits your budget limit of ${budget_limit}/hour; this one costs ${estimated_cost:.2f}/hour."
+DEADLINE_LINE = "**Deadline Consideration:** Configuration designed to help meet your specified deadline."
+DEADLINE_MISSED_LINE = "**Deadline Warning:** No configuration within your constraints can finish within {deadline_hours:.1f} hours; the fastest available configuration takes {fastest_hours:.1f} hours."
+DEADLINE_OVERRUN_LINE = "**Deadline Warning:** The compute was sized to finish within {deadline_hours:.1f} hours, but with data loading and transfer the job takes {estimated_hours:.1f} hours."
+STORAGE_LINE = "**Storage Tier ({recommended_tier}):** Reading {dataset_gb:g} GB x{epochs:g} takes {io_hours:.1f} hours against {compute_hours:.1f} hours of compute; this tier gives the lowest total job cost (${total_cost:.2f})."
+PLACEMENT_LINE = "**Region ({region}):** Running away from the data in {home_region} costs ${egress_cost:.2f} in egress and {transfer_hours:.1f} hours of transfer, which {region} repays with cheaper compute (${compute_cost:.2f})."
+TECHNIQUES_LINE = "**Training Techniques ({technique_list}):** The model needs about {memory_gb:.0f} GB instead of {full_memory_gb:.0f} GB of GPU memory and trains at {throughput_factor:.2f}x the throughput, which the GPU selection and time estimate reflect."
+CAPACITY_LINE = "**Capacity Plan:** {replicas} replica(s) of {gpus_per_replica}x {gpu_type} serve {request_rate:g} requests/s at {utilization:.0%} utilization with an expected p{percentile_label} latency of {tail_latency_ms:.0f} ms."
+BATCH_LINE = "**Batch Plan:** {replicas} replica(s) of {gpus_per_replica}x {gpu_type} at batch size {batch_size} with {quantization} weights process {items_per_second:.1f} items/s ({bound}-bound) for ${cost_per_million_items:.2f} per million items."
+WARM_POOL_LINE = "**Warm Pool:** New replicas take {cold_start_seconds:.0f} s to start, longer than the {scale_out_seconds:g} s scale-out target, so {warm_replicas} idle replica(s) ({warm_gpus} GPUs) are kept warm for bursts to {peak_request_rate:g} requests/s at ${warm_daily_cost:.2f} per day."
+CAPACITY_MISSED_LINE = "**Latency Warning:** No GPU type can meet the {latency_target_ms:g} ms target; a single request already takes {min_service_ms:.0f} ms."
+CAPACITY_CONSTRAINED_LINE = "**Latency Warning:** Your constraints allow too few GPUs to serve {request_rate:g} requests/s within the {latency_target_ms:g} ms target."
+
+# Number of catalog versions whose compiled templates are kept
+MAX_COMPILED_VERSIONS = 4
+
+# Number of rendered bullet lists cached per catalog version
+MAX_RENDERED_PER_VERSION = 4096
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+def compile_templates(resources):
+    """
+    Compile the justification templates for a catalog
+
+    Catalog descriptions are substituted once, so rendering only indexes
+    into tuples. Compiled templates, and the bullet lists rendered from
+    them, are shared per catalog version.
+
+    Args:
+        resources: Resource configuration data
+
+    Returns:
+        dict: Compiled templates for the catalog version
+    """
+    version = catalog_version(resources)
+    templates = _compiled.get(version)
+    if templates is not None:
+        return templates
+
+    gpu_types = list(resources["gpu_types"])
+    instance_types = list(resources["instance_types"])
+
+    templates = {
+        "version": version,
+        "gpu_codes": {name: code for code, name in enumerate(gpu_types)},
+        "instance_codes": {name: code for code, name in enumerate(instance_types)},
+        "gpu_lines": tuple(
+            f"**GPU Selection ({name}):** {resources['gpu_types'][name]['description']}" for name in gpu_types
+        ),
+        "instance_lines": tuple(
+            f"**Instance Type ({name}):** {resources['instance_types'][name]['description']}" for name in instance_types
+        ),
+        # Indexed by [task code][model code]; {count} is filled in at render time
+        "multi_gpu_lines": tuple(
+            tuple(_multi_gpu_template(task_type, model_size) for model_size in MODEL_SIZES)
+            for task_type in TASK_TYPES
+        ),
+        "single_gpu_lines": tuple(
+            tuple(
+                f"**Single GPU:** Sufficient for {model_size.lower()} model {task_type.lower()} with your specified requirements."
+                for model_size in MODEL_SIZES
+            )
+            for task_type in TASK_TYPES
+        ),
+        # Rendered bullet lists keyed by integer-coded request fields
+        "rendered": {}
+    }
+
+    with _compiled_lock:
+        if len(_compiled) >= MAX_COMPILED_VERSIONS:
+            _compiled.pop(next(iter(_compiled)))
+        _compiled[version] = templates
+
+    return templates
+
+def _multi_gpu_template(task_type, model_size):
+    """
+    Build the multi-GPU bullet template for a task and model size
+
+    Args:
+        task_type: Type of task
+        model_size: Size of model
+
+    Returns:
+        str: Template with a {count} placeholder
+    """
+    if task_type in ["Training", "Fine-tuning"]:
+        return f"**Multiple GPUs ({{count}}):** Recommended for {model_size.lower()} model {task_type.lower()} to distribute the workload and reduce total processing time."
+    return f"**Multiple GPUs ({{count}}):** Recommended for high-throughput {task_type.lower()} of {model_size.lower()} models."
+
+def render_justification(recommendation, input_data, resources):
+    """
+    Render the justification bullets for a recommendation
+
+    Args:
+        recommendation: Generated recommendation
+        input_data: User input data
+        resources: Resource configuration data
+
+    Returns:
+        list: Justification points
+    """
+    templates = compile_templates(resources)
+
+    deadline_check = recommendation.get("deadline_check")
+    missed_deadline = deadline_check is not None and not deadline_check["meets_deadline"]
+
+    key = (
+        templates["gpu_codes"][recommendation["gpu_type"]],
+        recommendation["gpu_count"],
+        templates["instance_codes"][recommendation["instance_type"]],
+        _TASK_CODES[input_data["task_type"]],
+        _MODEL_CODES[input_data["model_size"]],
+        _PRIORITY_CODES.get(input_data["priority"], _PRIORITY_CODES["Balanced"]),
+        bool(input_data["deadline"]) and not missed_deadline
+    )
+
+    rendered = templates["rendered"]
+    bullets = rendered.get(key)
+    if bullets is None:
+        bullets = _render(templates, *key)
+        if len(rendered) >= MAX_RENDERED_PER_VERSION:
+            rendered.clear()
+        rendered[key] = bullets
+
+    justification = list(bullets)
+
+    # Budget, missed-deadline, technique, storage, placement, capacity, warm pool and batch lines carry free-form
+    # values, so they are formatted outside the cache
+    budget_limit = input_data["budget_limit"]
+    if budget_limit:
+        # Without estimates the configuration is taken to fit the budget
+        estimated_cost = recommendation.get("estimated_cost", 0.0)
+        budget_line = BUDGET_EXCEEDED_LINE if estimated_cost > budget_limit else BUDGET_LINE
+        justification.insert(4, budget_line.format(budget_limit=budget_limit, estimated_cost=estimated_cost))
+
+    if missed_deadline:
+        missed_line = DEADLINE_MISSED_LINE if "fastest_hours" in deadline_check else DEADLINE_OVERRUN_LINE
+        justification.append(missed_line.format(**deadline_check))
+
+    techniques = recommendation.get("techniques")
+    if techniques is not None:
+        justification.append(TECHNIQUES_LINE.format(
+            technique_list=", ".join(techniques["labels"]),
+            full_memory_gb=techniques["memory_gb"] / techniques["memory_factor"],
+            **techniques
+        ))
+
+    # The storage tier is only worth a bullet when it departs from the
+    # catalog's default tier or the job waits on I/O
+    storage_plan = recommendation.get("storage_plan")
+    if storage_plan is not None and (
+        storage_plan["io_bound"] or storage_plan["recommended_tier"] != next(iter(resources["storage_tiers"]))
+    ):
+        justification.append(STORAGE_LINE.format(**storage_plan))
+    
+    placement = recommendation.get("placement")
+    if placement is not None and placement["region"] != placement["home_region"]:
+        justification.append(PLACEMENT_LINE.format(**placement))
+    
+    capacity_plan = recommendation.get("capacity_plan")
+    if capacity_plan is not None:
+        if capacity_plan["feasible"]:
+            justification.append(CAPACITY_LINE.format(
+                percentile_label=f"{capacity_plan['percentile'] * 100:g}", **capacity_plan
+            ))
+        elif capacity_plan["min_service_ms"] <= capacity_plan["latency_target_ms"]:
+            justification.append(CAPACITY_CONSTRAINED_LINE.format(**capacity_plan))
+        else:
+            justification.append(CAPACITY_MISSED_LINE.format(**capacity_plan))
+
+    warm_pool = recommendation.get("warm_pool")
+    if warm_pool is not None and warm_pool["warm_replicas"]:
+        justification.append(WARM_POOL_LINE.format(**warm_pool))
+
+    batch_plan = recommendation.get("batch_plan")
+    if batch_plan is not None and batch_plan["feasible"]:
+        justification.append(BATCH_LINE.format(
+            bound="memory" if batch_plan["memory_bound"] else "compute", **batch_plan
+        ))
+
+    return justification
+
+def _render(templates, gpu_code, gpu_count, instance_code, task_code, model_code, priority_code, has_deadline):
+    """
+    Render the bullets shared by every request with the same key
+
+    Args:
+        templates: Compiled templates for the catalog version
+        gpu_code: Integer code of the GPU type
+        gpu_count: Number of GPUs
+        instance_code: Integer code of the instance type
+        task_code: Integer code of the task type
+        model_code: Integer code of the model size
+        priority_code: Integer code of the priority
+        has_deadline: Whether a deadline was given and can be met
+
+    Returns:
+        tuple: Justification points, without the budget line
+    """
+    if gpu_count > 1:
+        count_line = templates["multi_gpu_lines"][task_code][model_code].format(count=gpu_count)
+    else:
+        count_line = templates["single_gpu_lines"][task_code][model_code]
+
+    bullets = [
+        templates["gpu_lines"][gpu_code],
+        count_line,
+        templates["instance_lines"][instance_code],
+        PRIORITY_LINES[priority_code]
+    ]
+
+    if has_deadline:
+        bullets.append(DEADLINE_LINE)
+
+    return tuple(bullets)
@@ -0,0 +1,141 @@
+from .catalog import catalog_version
+
+# Region a dataset is assumed to live in when the input does not say
+DEFAULT_DATA_REGION = "us-east"
+
+# Sustained inter-region copy throughput when the catalog does not give one
+DEFAULT_TRANSFER_GB_PER_S = 1.25
+
+# Number of region tables cached before the cache is cleared
+MAX_CACHED_TABLES = 1024
+
+_region_tables = {}
+
+def region_table(home_region, gigabytes, resources, pricing):
+    """
+    Collect the price multiplier and data-move cost of every region
+
+    Moving the dataset out of its home region costs egress once per job
+    and delays the start by the copy time; the home region costs neither.
+
+    Args:
+        home_region: Region the dataset lives in
+        gigabytes: Dataset size in GB
+        resources: Resource configuration data with "regions"
+        pricing: Pricing data with "region_pricing_multipliers" and
+            "network_pricing"
+
+    Returns:
+        tuple: (region, price multiplier, egress cost, transfer hours) per
+            region
+    """
+    key = (catalog_version(resources), catalog_version(pricing), home_region, gigabytes)
+    table = _region_tables.get(key)
+    if table is None:
+        multipliers = pricing.get("region_pricing_multipliers", {})
+        egress_per_gb = pricing.get("network_pricing", {}).get("egress_per_gb", 0.0)
+        transfer_gb_per_s = resources.get("region_transfer_gb_per_s", DEFAULT_TRANSFER_GB_PER_S)
+
+        table = tuple(
+            (
+                region,
+                multipliers.get(region, 1.0),
+                0.0 if region == home_region else gigabytes * egress_per_gb,
+                0.0 if region == home_region else gigabytes / transfer_gb_per_s / 3600
+            )
+            for region in resources["regions"]
+        )
+        if len(_region_tables) >= MAX_CACHED_TABLES:
+            _region_tables.clear()
+        _region_tables[key] = table
+    return table
+
+def budget_price_multiplier(home_region, resources, pricing, regions=None):
+    """
+    Get the region price multiplier an hourly budget must be checked at
+
+    plan_region only leaves the dataset's home region for a cheaper one,
+    since every other region adds egress and transfer time, so a
+    configuration within budget at the home region's price stays within it
+    wherever it is placed. When the home region is not allowed, every other
+    region adds the same egress and transfer and the cheapest is placed.
+
+    Args:
+        home_region: Region the dataset lives in
+        resources: Resource configuration data
+        pricing: Pricing data with "region_pricing_multipliers"
+        regions: Regions allowed to run the job (defaults to all)
+
+    Returns:
+        float: Price multiplier (1.0 if the catalog lists no regions)
+    """
+    if "regions" not in resources:
+        return 1.0
+    multipliers = pricing.get("region_pricing_multipliers", {})
+    if regions is None:
+        regions = resources["regions"]
+    if home_region in regions:
+        return multipliers.get(home_region, 1.0)
+    # No allowed region leaves nothing to place; the constraint stage reports it
+    return min((multipliers.get(region, 1.0) for region in regions), default=1.0)
+
+def plan_region(compute_cost, other_cost, job_hours, gigabytes, home_region, resources, pricing,
+                priority="Balanced", deadline_hours=None, regions=None):
+    """
+    Pick the region to run a job in, given where its data lives
+
+    Compute is priced at each region's multiplier; running away from the
+    data adds a one-time egress charge and the copy time to the job.
+    Regions that miss the deadline are dropped unless none meet it. The
+    fastest region is picked when minimizing time, otherwise the cheapest.
+
+    Args:
+        compute_cost: Compute cost of the job at list prices
+        other_cost: Cost that does not depend on the region (e.g. storage)
+        job_hours: Job duration without any data transfer
+        gigabytes: Dataset size in GB
+        home_region: Region the dataset lives in
+        resources: Resource configuration data with "regions"
+        pricing: Pricing data
+        priority: User priority ("Minimize Time" picks the fastest region)
+        deadline_hours: Deadline in hours (optional)
+        regions: Regions allowed to run the job (defaults to all)
+
+    Returns:
+        dict: Chosen region with its cost and time, and the same breakdown
+            for every allowed region under "regions"
+    """
+    time_first = priority == "Minimize Time"
+    allowed = regions
+    regions = {}
+    best = None
+    best_key = None
+    for region, multiplier, egress_cost, transfer_hours in region_table(home_region, gigabytes, resources, pricing):
+        if allowed is not None and region not in allowed:
+            continue
+        total_cost = compute_cost * multiplier + other_cost + egress_cost
+        hours = transfer_hours + job_hours
+        regions[region] = {
+            "price_multiplier": multiplier,
+            "compute_cost": compute_cost * multiplier,
+            "egress_cost": egress_cost,
+            "transfer_hours": transfer_hours,
+            "job_hours": hours,
+            "total_cost": total_cost
+        }
+
+        # Regions that miss the deadline rank after every region that meets it
+        key = (
+            deadline_hours is not None and hours > deadline_hours,
+            hours if time_first else total_cost,
+            total_cost if time_first else hours
+        )
+        if best_key is None or key < best_key:
+            best, best_key = region, key
+
+    return {
+        "region": best,
+        "home_region": home_region,
+        **regions[best],
+        "regions": regions
+    }
@@ -0,0 +1,256 @@
+import math
+import numpy as np
+from .constraints import allowed_counts
+from .utils import estimate_memory_requirement, parse_vram_gb
+from .time_model import MAX_SERVING_GPU_COUNT, parallel_speedup
+
+def replica_profile(model_size, gpu_type, tokens_per_request, resources, heuristics, prompt_tokens=0):
+    """
+    Size one serving replica of a model on a GPU type
+
+    A replica holds enough GPUs to fit the model in VRAM and serves one
+    request at a time; prompt tokens are processed ``prefill_speedup``
+    times faster than generated tokens.
+
+    Args:
+        model_size: Size of model
+        gpu_type: GPU type
+        tokens_per_request: Generated tokens per request
+        resources: Resource configuration data
+        heuristics: Heuristic rules with a "realtime_inference" section
+        prompt_tokens: Prompt tokens per request
+
+    Returns:
+        dict: GPUs per replica and mean service time in seconds
+    """
+    rules = heuristics["realtime_inference"]
+    gpu = resources["gpu_types"][gpu_type]
+
+    memory_gb = estimate_memory_requirement(model_size, "Real-time Inference")
+    gpus_per_replica = max(1, math.ceil(memory_gb / parse_vram_gb(gpu["vram"])))
+
+    tokens_per_second = (
+        rules["reference_tokens_per_second"][model_size]
+        * gpu["relative_performance"]
+        * parallel_speedup(gpus_per_replica, resources.get("time_model"))
+    )
+    work_tokens = tokens_per_request + prompt_tokens / rules["prefill_speedup"]
+
+    return {
+        "gpus_per_replica": gpus_per_replica,
+        "service_seconds": rules["request_overhead_ms"] / 1000 + work_tokens / tokens_per_second
+    }
+
+def min_replicas_for_latency(request_rates, service_seconds, latency_target_seconds, percentile, max_replicas=None,
+                             allowed_replicas=None):
+    """
+    Find the fewest M/M/c servers meeting a tail-latency target
+
+    Waiting time in an M/M/c queue is zero with probability 1 - C and
+    exponential with rate c*mu - lambda otherwise, where C is the Erlang C
+    probability. Its ``percentile`` quantile is added to the mean service
+    time to estimate tail latency. Erlang C is computed through the stable
+    Erlang B recursion, vectorized over all request rates. Tail latency
+    only falls as servers are added, so with ``allowed_replicas`` the
+    result is the smallest allowed server count that meets the target.
+
+    Args:
+        request_rates: Array of arrival rates (requests per second)
+        service_seconds: Mean service time per request
+        latency_target_seconds: Tail-latency target
+        percentile: Latency percentile (e.g., 0.95)
+        max_replicas: Upper bound on servers (derived from the load if omitted)
+        allowed_replicas: Boolean array, true where servers = index + 1 may
+            be used (optional; its length bounds the servers)
+
+    Returns:
+        tuple: (replicas, tail latency seconds) arrays; replicas is 0 and
+            latency NaN where the target cannot be met
+    """
+    rates = np.asarray(request_rates, dtype=float)
+    replicas = np.zeros(rates.shape, dtype=int)
+    latency = np.full(rates.shape, np.nan)
+
+    if service_seconds > latency_target_seconds:
+        return replicas, latency
+
+    service_rate = 1 / service_seconds
+    load = rates * service_seconds
+
+    if allowed_replicas is not None:
+        max_replicas = len(allowed_replicas)
+    elif max_replicas is None:
+        peak = float(load.max()) if load.size else 0.0
+        max_replicas = int(math.ceil(peak + 6 * math.sqrt(peak) + 10))
+
+    tail = 1 - percentile
+    erlang_b = np.ones(rates.shape)
+    found = np.zeros(rates.shape, dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for servers in range(1, max_replicas + 1):
+            erlang_b = load * erlang_b / (servers + load * erlang_b)
+            stable = load < servers
+            erlang_c = np.where(stable, servers * erlang_b / (servers - load * (1 - erlang_b)), 1.0)
+
+            wait = np.where(
+                erlang_c > tail,
+                np.log(erlang_c / tail) / (servers * service_rate - rates),
+                0.0
+            )
+            tail_latency = wait + service_seconds
+
+            meets = stable & (tail_latency <= latency_target_seconds) & ~found
+            if allowed_replicas is not None:
+                meets &= bool(allowed_replicas[servers - 1])
+            replicas[meets] = servers
+            latency[meets] = tail_latency[meets]
+            found |= meets
+
+            if found.all():
+                break
+
+    return replicas, latency
+
+def sweep_realtime_capacity(model_size, request_rates, tokens_per_request, latency_target_ms,
+                            percentile=0.95, prompt_tokens=0, resources=None, heuristics=None,
+                            instance_type="flex-standard", gpu_types=None, compiled=None):
+    """
+    Plan real-time serving capacity for many traffic levels at once
+
+    With compiled constraints, each GPU type only uses replica counts whose
+    total GPU count the constraints allow on the instance type, up to
+    MAX_SERVING_GPU_COUNT GPUs.
+
+    Args:
+        model_size: Size of model
+        request_rates: Sequence of arrival rates (requests per second)
+        tokens_per_request: Generated tokens per request
+        latency_target_ms: Tail-latency target in milliseconds
+        percentile: Latency percentile (e.g., 0.95 or 0.99)
+        prompt_tokens: Prompt tokens per request
+        resources: Resource configuration data (loaded from disk if omitted)
+        heuristics: Heuristic rules (loaded from disk if omitted)
+        instance_type: Instance type used for pricing
+        gpu_types: GPU types to consider (defaults to all)
+        compiled: Result of constraints.compile_constraints (optional)
+
+    Returns:
+        dict: Per-GPU arrays (replicas, tail latency, daily cost) and the
+            index of the cheapest GPU type per traffic level
+    """
+    if resources is None or heuristics is None:
+        from .advisor_engine import load_resource_configs, load_heuristics
+        resources = resources or load_resource_configs()
+        heuristics = heuristics or load_heuristics()
+
+    if gpu_types is None:
+        gpu_types = list(resources["gpu_types"])
+
+    rates = np.atleast_1d(np.asarray(request_rates, dtype=float))
+    instance_multiplier = resources["instance_types"][instance_type]["cost_multiplier"]
+
+    replicas = np.zeros((len(gpu_types), rates.size), dtype=int)
+    tail_latency_ms = np.full((len(gpu_types), rates.size), np.nan)
+    daily_cost = np.full((len(gpu_types), rates.size), np.nan)
+    gpus_per_replica = np.zeros(len(gpu_types), dtype=int)
+    service_ms = np.zeros(len(gpu_types))
+
+    for index, gpu_type in enumerate(gpu_types):
+        profile = replica_profile(model_size, gpu_type, tokens_per_request, resources, heuristics, prompt_tokens)
+        allowed_replicas = None
+        if compiled is not None:
+            gpr = profile["gpus_per_replica"]
+            allowed_replicas = allowed_counts(compiled, gpu_type, instance_type)[gpr - 1:MAX_SERVING_GPU_COUNT:gpr]
+        gpu_replicas, gpu_latency = min_replicas_for_latency(
+            rates, profile["service_seconds"], latency_target_ms / 1000, percentile,
+            allowed_replicas=allowed_replicas
+        )
+
+        gpus_per_replica[index] = profile["gpus_per_replica"]
+        service_ms[index] = profile["service_seconds"] * 1000
+        replicas[index] = gpu_replicas
+        tail_latency_ms[index] = gpu_latency * 1000
+
+        hourly_cost = resources["gpu_types"][gpu_type]["hourly_cost"] * profile["gpus_per_replica"] * instance_multiplier
+        daily_cost[index] = np.where(gpu_replicas > 0, gpu_replicas * hourly_cost * 24, np.nan)
+
+    feasible = ~np.isnan(daily_cost)
+    best_gpu_index = np.where(
+        feasible.any(axis=0),
+        np.argmin(np.where(feasible, daily_cost, np.inf), axis=0),
+        -1
+    )
+
+    return {
+        "request_rates": rates,
+        "gpu_types": gpu_types,
+        "instance_type": instance_type,
+        "percentile": percentile,
+        "latency_target_ms": latency_target_ms,
+        "gpus_per_replica": gpus_per_replica,
+        "service_ms": service_ms,
+        "replicas": replicas,
+        "tail_latency_ms": tail_latency_ms,
+        "daily_cost": daily_cost,
+        "best_gpu_index": best_gpu_index
+    }
+
+def plan_realtime_capacity(model_size, request_rate, tokens_per_request, latency_target_ms,
+                           percentile=0.95, prompt_tokens=0, resources=None, heuristics=None,
+                           instance_type="flex-standard", gpu_types=None, compiled=None):
+    """
+    Plan real-time serving capacity for a single traffic level
+
+    Args:
+        model_size: Size of model
+        request_rate: Arrival rate (requests per second)
+        tokens_per_request: Generated tokens per request
+        latency_target_ms: Tail-latency target in milliseconds
+        percentile: Latency percentile (e.g., 0.95 or 0.99)
+        prompt_tokens: Prompt tokens per request
+        resources: Resource configuration data (loaded from disk if omitted)
+        heuristics: Heuristic rules (loaded from disk if omitted)
+        instance_type: Instance type used for pricing
+        gpu_types: GPU types to consider (defaults to all)
+        compiled: Result of constraints.compile_constraints (optional)
+
+    Returns:
+        dict: Cheapest plan meeting the target; "feasible" is False if no
+            GPU type can meet it within the constraints
+    """
+    sweep = sweep_realtime_capacity(
+        model_size, [request_rate], tokens_per_request, latency_target_ms,
+        percentile, prompt_tokens, resources, heuristics, instance_type, gpu_types, compiled
+    )
+
+    plan = {
+        "request_rate": float(request_rate),
+        "latency_target_ms": latency_target_ms,
+        "percentile": percentile,
+        "instance_type": instance_type,
+        "feasible": False
+    }
+
+    index = int(sweep["best_gpu_index"][0])
+    if index < 0:
+        # Report the lowest achievable latency: one request on the fastest
+        # replica; below the target, the constraints capped the replicas
+        plan["min_service_ms"] = float(sweep["service_ms"].min())
+        return plan
+
+    replicas = int(sweep["replicas"][index, 0])
+    gpus_per_replica = int(sweep["gpus_per_replica"][index])
+    service_rate = 1000 / sweep["service_ms"][index]
+
+    plan.update({
+        "feasible": True,
+        "gpu_type": sweep["gpu_types"][index],
+        "replicas": replicas,
+        "gpus_per_replica": gpus_per_replica,
+        "gpu_count": replicas * gpus_per_replica,
+        "tail_latency_ms": float(sweep["tail_latency_ms"][index, 0]),
+        "utilization": float(request_rate / (replicas * service_rate)),
+        "daily_cost": float(sweep["daily_cost"][index, 0])
+    })
+    return plan
@@ -0,0 +1,372 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+from .advisor_engine import generate_recommendation, load_heuristics, load_pricing, load_resource_configs, shared_resources
+from .catalog import FrozenDict, catalog_version
+from .deadline import deadline_to_hours
+
+# Part of every ID; bump it when a release changes the recommendation for
+# unchanged inputs and catalogs, so that clients do not keep stale copies
+ID_VERSION = 1
+
+# Hex digits of the SHA-256 digest kept in an ID (128 bits)
+ID_LENGTH = 32
+
+# Cache-Control of responses addressed by inputs: clients may keep them but
+# must revalidate, since the catalogs behind the same inputs can change
+REVALIDATE = "no-cache"
+
+# Cache-Control of responses addressed by ID: an ID names fixed content
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Number of recommendations kept for lookup by ID before the store is cleared
+MAX_STORED_RECOMMENDATIONS = 4096
+
+_stored = {}
+_lock = threading.Lock()
+
+def canonical_json(value):
+    """
+    Serialize a value to canonical JSON
+
+    Keys are sorted, separators carry no whitespace, non-ASCII text is
+    escaped and floats use their shortest round-trip form, so equal values
+    always give identical bytes. Serialization runs in the json module's C
+    encoder.
+
+    Args:
+        value: JSON-compatible value (tuples serialize as lists)
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+
+    Raises:
+        ValueError: If the value contains NaN or infinity, which have no
+            JSON form
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+def canonical_inputs(input_data):
+    """
+    Reduce user inputs to the values that determine a recommendation
+
+    Unset (None) values are kept: the engine requires some keys, such as
+    budget_limit and deadline, even when unset, so inputs missing them must
+    not share an ID with inputs that set them to None. Other spellings of
+    equal inputs (10 and 10.0) stay distinct; they only cost a cache miss.
+
+    Deadlines become JSON numbers: a timedelta becomes its hours, and a
+    date, datetime or ISO date string becomes the hours left at the time of
+    the call. A calendar deadline therefore gets a new ID as time passes,
+    so the content behind each ID stays fixed. Canonical inputs come back
+    unchanged.
+
+    Args:
+        input_data: Dictionary of user inputs
+
+    Returns:
+        dict: A copy of the inputs with the deadline in hours
+    """
+    canonical = dict(input_data)
+    deadline = canonical.get("deadline")
+    if isinstance(deadline, (datetime.date, datetime.timedelta)) or (
+        isinstance(deadline, str) and deadline and not _is_number(deadline)
+    ):
+        canonical["deadline"] = deadline_to_hours(deadline)
+    return canonical
+
+def recommendation_id(input_data, resources=None, pricing=None):
+    """
+    Get the content-addressed ID of the recommendation for some inputs
+
+    The ID hashes the canonical inputs with the versions of every catalog
+    the engine reads (and the history index file, for the history
+    estimator), so it changes exactly when the recommendation can; with a
+    published shared catalog, its version counts as the resource catalog's.
+    It is computed without generating the recommendation.
+
+    Args:
+        input_data: Dictionary of user inputs
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+
+    Returns:
+        str: Hex ID
+    """
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+    if pricing is None:
+        pricing = load_pricing()
+
+    key = {
+        "id_version": ID_VERSION,
+        "inputs": canonical_inputs(input_data),
+        "catalogs": [catalog_version(resources), catalog_version(pricing), catalog_version(load_heuristics())]
+    }
+    if input_data.get("estimator") == "history":
+        from .history_index import HISTORY_INDEX_ENV
+        index_path = input_data.get("history_index") or os.environ.get(HISTORY_INDEX_ENV)
+        if index_path and os.path.exists(index_path):
+            stat = os.stat(index_path)
+            key["history_index"] = [os.path.abspath(index_path), stat.st_mtime_ns, stat.st_size]
+
+    return hashlib.sha256(canonical_json(key)).hexdigest()[:ID_LENGTH]
+
+def entity_tag(recommendation_id, chart=None):
+    """
+    Get the HTTP ETag of a recommendation or one of its figures
+
+    Args:
+        recommendation_id: Result of recommendation_id
+        chart: Chart name from report.CHARTS, for a figure
+
+    Returns:
+        str: Quoted strong entity tag
+    """
+    return f'"{recommendation_id}"' if chart is None else f'"{recommendation_id}-{chart}"'
+
+def matches_etag(if_none_match, tag):
+    """
+    Check an If-None-Match header against an entity tag
+
+    Comparison is weak, as RFC 9110 requires for If-None-Match: a "W/"
+    prefix is ignored.
+
+    Args:
+        if_none_match: Header value ("*" or comma-separated tags), or None
+        tag: Result of entity_tag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+def recommend(input_data, resources=None, pricing=None):
+    """
+    Generate a recommendation and keep it for lookup by ID
+
+    Inputs seen before are served from the store without running the
+    engine. The engine runs on the canonical inputs (see canonical_inputs),
+    so a calendar deadline is evaluated at the same instant as its ID.
+
+    Args:
+        input_data: Dictionary of user inputs
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+
+    Returns:
+        tuple: (ID, recommendation dict)
+
+    Raises:
+        KeyError: If the inputs lack a key the engine requires
+        ValueError: If the engine rejects the inputs
+    """
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+    if pricing is None:
+        pricing = load_pricing()
+
+    input_data = canonical_inputs(input_data)
+    identifier = recommendation_id(input_data, resources, pricing)
+    entry = _stored.get(identifier)
+    if entry is None:
+        recommendation = generate_recommendation(input_data, resources, pricing)
+        _store(identifier, canonical_json(recommendation), resources)
+        return identifier, recommendation
+    return identifier, json.loads(entry["body"])
+
+def get_recommendation(recommendation_id):
+    """
+    Fetch a stored recommendation by ID
+
+    Args:
+        recommendation_id: ID returned by recommend
+
+    Returns:
+        dict: Recommendation (a new copy per call)
+
+    Raises:
+        KeyError: If no recommendation with this ID is stored
+    """
+    return json.loads(_lookup(recommendation_id)["body"])
+
+def get_figure(recommendation_id, chart):
+    """
+    Draw a comparison chart of a stored recommendation
+
+    Args:
+        recommendation_id: ID returned by recommend
+        chart: Chart name from report.CHARTS
+
+    Returns:
+        Plotly figure object, or None if the chart has no data
+
+    Raises:
+        KeyError: If no recommendation with this ID is stored
+        ValueError: If the chart name is unknown
+    """
+    from .report import CHARTS, build_figure
+
+    if chart not in CHARTS:
+        raise ValueError(f"Unknown chart {chart!r}; expected one of {', '.join(CHARTS)}")
+    entry = _lookup(recommendation_id)
+    return build_figure(chart, json.loads(entry["body"]), entry["resources"])
+
+def respond(input_data, if_none_match=None, resources=None, pricing=None):
+    """
+    Answer a request for the recommendation of some inputs
+
+    A client whose If-None-Match holds the current ID gets 304 Not Modified
+    without the engine running. Framework-independent: an HTTP front end
+    copies the status, headers and body into its own response.
+
+    Args:
+        input_data: Dictionary of user inputs
+        if_none_match: The request's If-None-Match header, if any
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+
+    Returns:
+        tuple: (status code, header dict, body bytes)
+
+    Raises:
+        KeyError: If the inputs lack a key the engine requires
+        ValueError: If the engine rejects the inputs
+    """
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+    if pricing is None:
+        pricing = load_pricing()
+
+    input_data = canonical_inputs(input_data)
+    identifier = recommendation_id(input_data, resources, pricing)
+    headers = _headers(identifier, None, REVALIDATE)
+    if matches_etag(if_none_match, headers["ETag"]):
+        return 304, headers, b""
+
+    entry = _stored.get(identifier)
+    if entry is None:
+        body = canonical_json(generate_recommendation(input_data, resources, pricing))
+        entry = _store(identifier, body, resources)
+    return 200, dict(headers, **{"Content-Type": "application/json"}), entry["body"]
+
+def respond_by_id(recommendation_id, chart=None, if_none_match=None):
+    """
+    Answer a request for a recommendation or figure by ID
+
+    Content behind an ID never changes, so a matching If-None-Match gets
+    304 even after the recommendation has left the store, and responses
+    may be cached indefinitely.
+
+    Args:
+        recommendation_id: ID returned by recommend or respond
+        chart: Chart name from report.CHARTS for a figure, or None for the
+            recommendation
+        if_none_match: The request's If-None-Match header, if any
+
+    Returns:
+        tuple: (status code, header dict, body bytes); 404 if the ID is not
+            stored or the chart has no data
+
+    Raises:
+        ValueError: If the chart name is unknown
+    """
+    headers = _headers(recommendation_id, chart, IMMUTABLE)
+    if matches_etag(if_none_match, headers["ETag"]):
+        return 304, headers, b""
+
+    try:
+        if chart is None:
+            body = _lookup(recommendation_id)["body"]
+        else:
+            figure = get_figure(recommendation_id, chart)
+            if figure is None:
+                return 404, {}, b""
+            body = figure.to_json(validate=False).encode("utf-8")
+    except KeyError:
+        return 404, {}, b""
+    return 200, dict(headers, **{"Content-Type": "application/json"}), body
+
+def clear_store():
+    """
+    Drop all stored recommendations
+    """
+    with _lock:
+        _stored.clear()
+
+def _store(recommendation_id, body, resources):
+    """
+    Keep a serialized recommendation for lookup by ID
+
+    Args:
+        recommendation_id: ID of the recommendation
+        body (bytes): Canonical JSON of the recommendation
+        resources: Resource configuration data it was generated with
+
+    Returns:
+        FrozenDict: Stored entry with "body" and the "resources" needed to
+            draw its figures
+    """
+    entry = FrozenDict(body=body, resources=resources)
+    with _lock:
+        if len(_stored) >= MAX_STORED_RECOMMENDATIONS:
+            _stored.clear()
+        _stored[recommendation_id] = entry
+    return entry
+
+def _lookup(recommendation_id):
+    """
+    Get a stored entry
+
+    Args:
+        recommendation_id: ID of the recommendation
+
+    Returns:
+        FrozenDict: Result of _store
+
+    Raises:
+        KeyError: If no recommendation with this ID is stored
+    """
+    entry = _stored.get(recommendation_id)
+    if entry is None:
+        raise KeyError(f"No stored recommendation with ID {recommendation_id!r}")
+    return entry
+
+def _is_number(text):
+    """
+    Check whether a deadline string is a number of hours
+
+    Args:
+        text: Deadline string
+
+    Returns:
+        bool: True if it parses as a float
+    """
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+def _headers(recommendation_id, chart, cache_control):
+    """
+    Build the caching headers of a response
+
+    Args:
+        recommendation_id: ID of the recommendation
+        chart: Chart name, or None for the recommendation
+        cache_control: Cache-Control value
+
+    Returns:
+        dict: ETag and Cache-Control headers
+    """
+    return {"ETag": entity_tag(recommendation_id, chart), "Cache-Control": cache_control}
@@ -0,0 +1,370 @@
+import datetime
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from .commitments import job_hours
+
+# Option name of the primary recommendation; alternatives keep their "name"
+RECOMMENDATION_OPTION = "Recommendation"
+
+# String columns stored as integer codes; codes index the store's vocabulary
+CATEGORICAL_COLUMNS = ("option", "task_type", "model_size", "priority", "gpu_type", "instance_type", "region")
+
+# Flattened row layout, one row per recommendation and per alternative
+ROW_SCHEMA = pa.schema(
+    [("record_id", pa.int64()), ("timestamp", pa.timestamp("ms", tz="UTC"))]
+    + [(name, pa.int16()) for name in CATEGORICAL_COLUMNS]
+    + [
+        ("gpu_count", pa.int16()),
+        ("hourly_cost", pa.float64()),
+        ("estimated_hours", pa.float64()),
+        ("projected_cost", pa.float64()),
+        ("budget_limit", pa.float64()),
+        ("over_budget", pa.bool_()),
+        ("deadline_hours", pa.float64()),
+        ("missed_deadline", pa.bool_())
+    ]
+)
+
+# Day partitions are directories named day=YYYY-MM-DD
+PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+
+# File in the store root holding the values of the categorical columns;
+# the leading underscore keeps it out of the dataset
+VOCABULARY_FILE = "_vocabulary.json"
+
+# Rows per row group of compacted files
+ROW_GROUP_SIZE = 1 << 20
+
+_lock = threading.Lock()
+_part_sequence = 0
+
+def flatten_recommendation(input_data, recommendation, record_id, timestamp):
+    """
+    Flatten a recommendation and its alternatives into rows
+
+    Times are stored as numbers of hours rather than display strings.
+    Alternatives share the recommendation's job time, as in the comparison
+    charts, so their projected cost is their hourly cost over that time.
+    Real-time Inference has no job time and is projected over one day, as
+    in calculate_total_cost.
+
+    Args:
+        input_data: User inputs the recommendation was generated from
+        recommendation: Result of generate_recommendation
+        record_id: Identifier shared by the rows of one recommendation
+        timestamp: Time of the recommendation (aware datetime)
+
+    Returns:
+        list: Row dictionaries with ROW_SCHEMA fields; categorical columns
+            hold their string values
+    """
+    realtime = input_data["task_type"] == "Real-time Inference"
+    hours = math.nan if realtime else job_hours(recommendation)
+    budget_limit = input_data.get("budget_limit") or math.nan
+    deadline_check = recommendation.get("deadline_check")
+
+    shared = {
+        "record_id": record_id,
+        "timestamp": timestamp,
+        "task_type": input_data["task_type"],
+        "model_size": input_data["model_size"],
+        "priority": input_data.get("priority", "Balanced"),
+        "estimated_hours": hours,
+        "budget_limit": budget_limit,
+        "deadline_hours": deadline_check["deadline_hours"] if deadline_check else math.nan,
+        "missed_deadline": bool(deadline_check) and not deadline_check["meets_deadline"]
+    }
+
+    rows = []
+    for option in [recommendation] + recommendation.get("alternatives", []):
+        hourly_cost = option["estimated_cost"]
+        if option is recommendation and "estimated_total_cost" in recommendation:
+            projected_cost = recommendation["estimated_total_cost"]
+        else:
+            projected_cost = hourly_cost * (24.0 if realtime else hours)
+        rows.append(dict(
+            shared,
+            option=RECOMMENDATION_OPTION if option is recommendation else option["name"],
+            gpu_type=option["gpu_type"],
+            instance_type=option["instance_type"],
+            region=option.get("region", ""),
+            gpu_count=option["gpu_count"],
+            hourly_cost=hourly_cost,
+            projected_cost=projected_cost,
+            over_budget=hourly_cost > budget_limit
+        ))
+    return rows
+
+def load_vocabulary(directory):
+    """
+    Load the values behind the categorical codes of a store
+
+    Args:
+        directory (str): Store root directory
+
+    Returns:
+        dict: Column name -> list of values; a value's code is its position
+    """
+    try:
+        with open(os.path.join(directory, VOCABULARY_FILE)) as f:
+            vocabulary = json.load(f)
+    except FileNotFoundError:
+        vocabulary = {}
+    for name in CATEGORICAL_COLUMNS:
+        vocabulary.setdefault(name, [])
+    return vocabulary
+
+def encode(vocabulary, column, values):
+    """
+    Map categorical values to codes, adding unseen values to the vocabulary
+
+    Codes are never reassigned, so files written at different times share
+    one coding.
+
+    Args:
+        vocabulary: Result of load_vocabulary (updated in place)
+        column: Categorical column name
+        values: Strings to encode
+
+    Returns:
+        numpy.ndarray: int16 codes
+    """
+    known = vocabulary[column]
+    codes = {value: code for code, value in enumerate(known)}
+    encoded = np.empty(len(values), dtype=np.int16)
+    for row, value in enumerate(values):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(known)
+            known.append(value)
+        encoded[row] = code
+    return encoded
+
+def append_recommendations(directory, records, timestamp=None):
+    """
+    Append recommendations to a store as one new file per day
+
+    The store is append-only: each call writes new Parquet files under the
+    day partition of ``timestamp`` and never rewrites existing ones (see
+    compact_day). Files and the vocabulary are written to a temporary name
+    and renamed, so readers never see partial data. Appends from threads
+    of one process are serialized; a store has a single writing process.
+
+    Args:
+        directory (str): Store root directory (created if missing)
+        records: Iterable of (input data, recommendation) pairs
+        timestamp: Time of the recommendations (defaults to now, UTC)
+
+    Returns:
+        int: Number of rows written
+    """
+    global _part_sequence
+
+    if timestamp is None:
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+    rows = []
+    for input_data, recommendation in records:
+        record_id = int.from_bytes(os.urandom(8), "little") >> 1
+        rows.extend(flatten_recommendation(input_data, recommendation, record_id, timestamp))
+    if not rows:
+        return 0
+
+    with _lock:
+        os.makedirs(directory, exist_ok=True)
+        vocabulary = load_vocabulary(directory)
+        columns = {}
+        for field in ROW_SCHEMA:
+            values = [row[field.name] for row in rows]
+            if field.name in CATEGORICAL_COLUMNS:
+                values = encode(vocabulary, field.name, values)
+            columns[field.name] = pa.array(values, type=field.type)
+        _write_json(os.path.join(directory, VOCABULARY_FILE), vocabulary)
+
+        _part_sequence += 1
+        file_name = f"part-{time.time_ns()}-{os.getpid()}-{_part_sequence}.parquet"
+        _write_table(pa.table(columns, schema=ROW_SCHEMA), _day_directory(directory, timestamp.date()), file_name)
+
+    return len(rows)
+
+def compact_day(directory, day):
+    """
+    Merge a day's files into one with large row groups
+
+    Meant for days that no longer receive appends; many small files slow
+    down queries.
+
+    Args:
+        directory (str): Store root directory
+        day: datetime.date or "YYYY-MM-DD" string
+
+    Returns:
+        int: Number of files merged
+    """
+    day_directory = _day_directory(directory, day)
+    parts = sorted(name for name in os.listdir(day_directory) if name.endswith(".parquet"))
+    if len(parts) < 2:
+        return len(parts)
+
+    with _lock:
+        table = pa.concat_tables(pq.ParquetFile(os.path.join(day_directory, name)).read() for name in parts)
+        _write_table(table, day_directory, "compacted-" + parts[-1], ROW_GROUP_SIZE)
+        for name in parts:
+            os.remove(os.path.join(day_directory, name))
+
+    return len(parts)
+
+def read_columns(directory, columns, start_day=None, end_day=None, alternatives=False):
+    """
+    Read columns of a store as NumPy arrays
+
+    Only the requested columns of the days in range are read, using all
+    cores. Categorical columns stay integer-coded (see load_vocabulary).
+
+    Args:
+        directory (str): Store root directory
+        columns: Column names from ROW_SCHEMA
+        start_day: First day to include ("YYYY-MM-DD" or date, optional)
+        end_day: Last day to include ("YYYY-MM-DD" or date, optional)
+        alternatives: Whether to include alternative rows
+
+    Returns:
+        dict: Column name -> numpy.ndarray
+    """
+    dataset = ds.dataset(
+        directory, format="parquet", schema=ROW_SCHEMA.append(pa.field("day", pa.string())), partitioning=PARTITIONING
+    )
+
+    conditions = []
+    if start_day is not None:
+        conditions.append(ds.field("day") >= str(start_day))
+    if end_day is not None:
+        conditions.append(ds.field("day") <= str(end_day))
+    if not alternatives:
+        vocabulary = load_vocabulary(directory)["option"]
+        code = vocabulary.index(RECOMMENDATION_OPTION) if RECOMMENDATION_OPTION in vocabulary else -1
+        conditions.append(ds.field("option") == code)
+
+    condition = None
+    for term in conditions:
+        condition = term if condition is None else condition & term
+
+    table = dataset.to_table(columns=list(columns), filter=condition)
+    return {name: table.column(name).to_numpy() for name in columns}
+
+def total_by(directory, value, by, start_day=None, end_day=None, alternatives=False):
+    """
+    Sum a numeric column per value of a categorical column
+
+    E.g. ``total_by(store, "projected_cost", "gpu_type")`` gives the total
+    projected cost per GPU type.
+
+    Args:
+        directory (str): Store root directory
+        value: Numeric column to sum (NaN values are skipped)
+        by: Categorical column to group by
+        start_day: First day to include (optional)
+        end_day: Last day to include (optional)
+        alternatives: Whether to include alternative rows
+
+    Returns:
+        dict: Category -> total, for categories present in the range
+    """
+    data = read_columns(directory, (value, by), start_day, end_day, alternatives)
+    labels = load_vocabulary(directory)[by]
+    values = data[value].astype(float)
+    present = ~np.isnan(values)
+    totals = np.bincount(data[by][present], weights=values[present], minlength=len(labels))
+    counts = np.bincount(data[by], minlength=len(labels))
+    return {labels[code]: float(totals[code]) for code in np.flatnonzero(counts)}
+
+def share(directory, column, value, start_day=None, end_day=None, alternatives=False):
+    """
+    Get the fraction of rows whose categorical column has a value
+
+    E.g. ``share(store, "instance_type", "flex-economy")``.
+
+    Args:
+        directory (str): Store root directory
+        column: Categorical column
+        value: Value to count
+        start_day: First day to include (optional)
+        end_day: Last day to include (optional)
+        alternatives: Whether to include alternative rows
+
+    Returns:
+        float: Fraction of rows (0.0 for an empty range)
+    """
+    codes = read_columns(directory, (column,), start_day, end_day, alternatives)[column]
+    vocabulary = load_vocabulary(directory)[column]
+    if not len(codes) or value not in vocabulary:
+        return 0.0
+    return float(np.count_nonzero(codes == vocabulary.index(value)) / len(codes))
+
+def budget_miss_rate(directory, start_day=None, end_day=None, alternatives=False):
+    """
+    Get the fraction of budgeted recommendations over their hourly budget
+
+    Args:
+        directory (str): Store root directory
+        start_day: First day to include (optional)
+        end_day: Last day to include (optional)
+        alternatives: Whether to include alternative rows
+
+    Returns:
+        float: Fraction of rows with a budget limit that exceed it (0.0 if
+            none has one)
+    """
+    data = read_columns(directory, ("budget_limit", "over_budget"), start_day, end_day, alternatives)
+    budgeted = ~np.isnan(data["budget_limit"])
+    count = np.count_nonzero(budgeted)
+    return float(np.count_nonzero(data["over_budget"] & budgeted) / count) if count else 0.0
+
+def _day_directory(directory, day):
+    """
+    Get the partition directory of a day
+
+    Args:
+        directory (str): Store root directory
+        day: datetime.date or "YYYY-MM-DD" string
+
+    Returns:
+        str: Path of the day's directory
+    """
+    return os.path.join(directory, f"day={day}")
+
+def _write_table(table, directory, file_name, row_group_size=None):
+    """
+    Write a Parquet file atomically
+
+    Args:
+        table: pyarrow.Table with ROW_SCHEMA
+        directory (str): Destination directory (created if missing)
+        file_name (str): Destination file name
+        row_group_size: Rows per row group (optional)
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, file_name)
+    # The dot prefix keeps a file being written out of the dataset
+    temporary = os.path.join(directory, f".{file_name}.tmp")
+    pq.write_table(table, temporary, row_group_size=row_group_size)
+    os.replace(temporary, path)
+
+def _write_json(path, value):
+    """
+    Write a JSON file atomically
+
+    Args:
+        path (str): Destination path
+        value: JSON-serializable value
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(value, f)
+    os.replace(temporary, path)
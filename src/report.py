@@ -0,0 +1,462 @@
+import hashlib
+import html
+import json
+import os
+import re
+from .advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from .utils import calculate_total_cost
+
+CHARTS = ("cost_time", "resources", "performance")
+
+PLOTLY_CDN_URL = "https://cdn.plot.ly/plotly-{version}.min.js"
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+_STYLE = """
+body { font-family: 'Roboto Mono', monospace; margin: 2em; color: #0a0a20; }
+h1, h2 { color: #6200ea; }
+table { border-collapse: collapse; margin: 0.5em 0; }
+th, td { border: 1px solid #e0aaff; padding: 0.25em 0.75em; text-align: left; }
+.job { border-top: 2px solid #6200ea; margin-top: 2em; }
+.charts { display: flex; flex-wrap: wrap; }
+.chart { width: 32%; min-width: 360px; height: 420px; }
+"""
+
+# Figures are parsed and drawn only when scrolled into view, so opening a
+# report with thousands of charts stays responsive
+_RENDER_SCRIPT = """
+<script>
+(function () {
+  var parsed = {};
+  function load(id) {
+    if (!(id in parsed)) {
+      parsed[id] = JSON.parse(document.getElementById(id).textContent);
+    }
+    return parsed[id];
+  }
+  function draw(div) {
+    var figure = load("figure-" + div.dataset.figure);
+    var layout = Object.assign({}, figure.layout, {template: load("template-" + figure.template)});
+    Plotly.newPlot(div, figure.data, layout, {responsive: true});
+  }
+  var charts = document.querySelectorAll(".chart[data-figure]");
+  if (!("IntersectionObserver" in window)) {
+    charts.forEach(draw);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        draw(entry.target);
+      }
+    });
+  }, {rootMargin: "400px"});
+  charts.forEach(function (div) { observer.observe(div); });
+})();
+</script>
+"""
+
+def load_workloads(file_path):
+    """
+    Load workload inputs from a JSON list or a JSONL file
+
+    Args:
+        file_path (str): Path to a .json or .jsonl file of input dictionaries;
+            an optional "name" labels each job in the report
+
+    Returns:
+        list: Input dictionaries
+
+    Raises:
+        ValueError: If the file has an unknown format
+    """
+    if file_path.endswith((".jsonl", ".ndjson")):
+        with open(file_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if file_path.endswith(".json"):
+        with open(file_path) as f:
+            return json.load(f)
+    raise ValueError(f"Unsupported workload format: {file_path}")
+
+def plan_jobs(workloads, resources, pricing):
+    """
+    Generate a recommendation for every workload
+
+    Workloads with identical inputs (ignoring "name") share one
+    recommendation.
+
+    Args:
+        workloads: Input dictionaries
+        resources: Resource configuration data
+        pricing: Pricing data
+
+    Returns:
+        list: (name, input data, recommendation) per workload
+    """
+    recommendations = {}
+    jobs = []
+    for number, workload in enumerate(workloads, start=1):
+        input_data = {key: value for key, value in workload.items() if key != "name"}
+        input_data.setdefault("budget_limit", None)
+        input_data.setdefault("deadline", None)
+
+        key = json.dumps(input_data, sort_keys=True)
+        recommendation = recommendations.get(key)
+        if recommendation is None:
+            recommendation = recommendations[key] = generate_recommendation(input_data, resources, pricing)
+
+        jobs.append((workload.get("name", f"Job {number}"), input_data, recommendation))
+    return jobs
+
+def fleet_totals(jobs):
+    """
+    Sum cost and GPU usage over all planned jobs
+
+    Real-time Inference jobs are counted for one day, as in
+    calculate_total_cost.
+
+    Args:
+        jobs: Result of plan_jobs
+
+    Returns:
+        dict: Job count, hourly and total cost, GPU count and GPU-hours, and
+            job counts per GPU type and per region
+    """
+    totals = {
+        "jobs": len(jobs),
+        "hourly_cost": 0.0,
+        "total_cost": 0.0,
+        "gpus": 0,
+        "gpu_hours": 0.0,
+        "by_gpu_type": {},
+        "by_region": {}
+    }
+
+    for _, _, recommendation in jobs:
+        hourly_cost = recommendation["estimated_cost"]
+        total_cost = recommendation.get("estimated_total_cost")
+        if total_cost is None:
+            total_cost = calculate_total_cost(hourly_cost, recommendation["estimated_time"], return_numeric=True)
+
+        totals["hourly_cost"] += hourly_cost
+        totals["total_cost"] += total_cost
+        totals["gpus"] += recommendation["gpu_count"]
+        totals["gpu_hours"] += recommendation["gpu_count"] * calculate_total_cost(
+            1.0, recommendation["estimated_time"], return_numeric=True
+        )
+
+        for field, value in (("by_gpu_type", recommendation["gpu_type"]), ("by_region", recommendation["region"])):
+            totals[field][value] = totals[field].get(value, 0) + 1
+
+    return totals
+
+def figure_spec(chart, recommendation, resources, skeletons):
+    """
+    Get the plotly.js spec of one comparison chart
+
+    The first chart with a given set of configurations is drawn by the
+    functions in src.visualizations and kept as a skeleton; later charts
+    copy the skeleton and replace only the values that differ, which avoids
+    building and validating a plotly figure per job. The layout's theme
+    template is split off so that it can be shared between figures.
+
+    Args:
+        chart: Chart name from CHARTS
+        recommendation: Recommendation dictionary
+        resources: Resource configuration data
+        skeletons: Skeleton cache, shared across calls for one report
+
+    Returns:
+        tuple: (spec with "data" and "layout", theme template JSON), or
+            None if the chart has no data
+    """
+    from . import visualizations
+
+    alternatives = recommendation["alternatives"]
+    if chart == "cost_time":
+        rows = visualizations.cost_time_rows(recommendation, alternatives)
+    elif chart == "resources":
+        rows = visualizations.resource_rows(recommendation, alternatives)
+    else:
+        rows = visualizations.performance_rows(recommendation, alternatives, resources)
+    if not rows:
+        return None
+
+    key = (chart, tuple(row["Configuration"] for row in rows))
+    skeleton = skeletons.get(key)
+    if skeleton is None:
+        spec = json.loads(build_figure(chart, recommendation, resources).to_json(validate=False))
+        template = json.dumps(spec["layout"].pop("template", {}), separators=(",", ":"))
+        skeleton = skeletons[key] = (json.dumps(spec), template)
+
+    spec = json.loads(skeleton[0])
+    _PATCHES[chart](spec, rows)
+    return spec, skeleton[1]
+
+def _patch_cost_time(spec, rows):
+    """
+    Fill a cost vs. time skeleton with one job's data points
+
+    Args:
+        spec: Skeleton spec, modified in place
+        rows: Result of cost_time_rows
+    """
+    from .visualizations import COST_TIME_SIZE_MAX
+
+    # px.scatter scales bubble areas so the largest is size_max pixels wide
+    sizeref = max(row["Total Cost ($)"] for row in rows) / COST_TIME_SIZE_MAX ** 2
+    for trace, row in zip(spec["data"], rows):
+        trace["x"] = [row["Estimated Time (hours)"]]
+        trace["y"] = [row["Hourly Cost ($)"]]
+        trace["marker"]["size"] = [row["Total Cost ($)"]]
+        trace["marker"]["sizeref"] = sizeref
+
+def _patch_resources(spec, rows):
+    """
+    Fill a resource comparison skeleton with one job's configurations
+
+    Args:
+        spec: Skeleton spec, modified in place
+        rows: Result of resource_rows
+    """
+    gpu_types, gpu_counts, instance_types = spec["data"]
+    gpu_types["text"] = [row["GPU Type"] for row in rows]
+    gpu_counts["text"] = [f"{row['GPU Count']} GPU(s)" for row in rows]
+    instance_types["text"] = [row["Instance Type"] for row in rows]
+    for annotation, row in zip(spec["layout"]["annotations"], rows):
+        annotation["text"] = f"${row['Hourly Cost ($)']} / hour"
+
+def _patch_performance(spec, rows):
+    """
+    Fill a performance radar skeleton with one job's scores
+
+    Args:
+        spec: Skeleton spec, modified in place
+        rows: Result of performance_rows
+    """
+    for trace, row in zip(spec["data"], rows):
+        trace["r"] = row["Scores"]
+
+_PATCHES = {
+    "cost_time": _patch_cost_time,
+    "resources": _patch_resources,
+    "performance": _patch_performance
+}
+
+def generate_report(workloads, file_path, resources=None, pricing=None, plotlyjs="inline", title="Batch Planning Report"):
+    """
+    Write a single HTML report for a batch of workloads
+
+    plotly.js is included once, each distinct figure is serialized once and
+    referenced by every job that shows it, and the file is written section
+    by section so memory stays flat as the batch grows. The report is
+    written next to its destination and renamed over it when complete.
+
+    Args:
+        workloads: Input dictionaries (see load_workloads)
+        file_path (str): Destination HTML path
+        resources: Resource configuration data (loaded from disk if omitted)
+        pricing: Pricing data (loaded from disk if omitted)
+        plotlyjs: "inline" to embed plotly.js, "cdn" to link it
+        title: Report title
+
+    Returns:
+        dict: Number of jobs, chart references, distinct figures and bytes
+            written
+    """
+    if plotlyjs not in ("inline", "cdn"):
+        raise ValueError(f"Unknown plotlyjs mode: {plotlyjs}")
+    if resources is None:
+        resources = load_resource_configs()
+    if pricing is None:
+        pricing = load_pricing()
+
+    jobs = plan_jobs(workloads, resources, pricing)
+    skeletons = {}
+    template_ids = {}
+    figure_ids = {}
+    chart_count = 0
+
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{html.escape(title)}</title>\n")
+        f.write(f"<style>{_STYLE}</style>\n")
+        _write_plotlyjs(f, plotlyjs)
+        f.write(f"</head>\n<body>\n<h1>{html.escape(title)}</h1>\n")
+        _write_totals(f, fleet_totals(jobs))
+
+        for number, (name, input_data, recommendation) in enumerate(jobs, start=1):
+            chart_divs = []
+            for chart in CHARTS:
+                figure = figure_spec(chart, recommendation, resources, skeletons)
+                if figure is None:
+                    continue
+                spec, template = figure
+
+                template_id = template_ids.get(template)
+                if template_id is None:
+                    template_id = template_ids[template] = str(len(template_ids))
+                    _write_json(f, f"template-{template_id}", template)
+
+                spec["template"] = template_id
+                spec = json.dumps(spec, separators=(",", ":"))
+                # Identical figures are written once; only a digest is kept
+                digest = hashlib.sha1(spec.encode("utf-8")).digest()
+                figure_id = figure_ids.get(digest)
+                if figure_id is None:
+                    figure_id = figure_ids[digest] = str(len(figure_ids))
+                    _write_json(f, f"figure-{figure_id}", spec)
+
+                chart_count += 1
+                chart_divs.append(f'<div class="chart" data-figure="{figure_id}"></div>')
+
+            _write_job(f, number, name, input_data, recommendation, chart_divs)
+
+        f.write(_RENDER_SCRIPT)
+        f.write("</body>\n</html>\n")
+    size = os.path.getsize(temp_path)
+    os.replace(temp_path, file_path)
+
+    return {
+        "jobs": len(jobs),
+        "charts": chart_count,
+        "figures": len(figure_ids),
+        "bytes": size
+    }
+
+def build_figure(chart, recommendation, resources):
+    """
+    Draw one comparison chart of a recommendation
+
+    Args:
+        chart: Chart name from CHARTS
+        recommendation: Recommendation dictionary
+        resources: Resource configuration data
+
+    Returns:
+        Plotly figure object, or None if the chart has no data
+    """
+    from . import visualizations
+
+    alternatives = recommendation["alternatives"]
+    if chart == "cost_time":
+        return visualizations.create_cost_time_comparison(recommendation, alternatives)
+    if chart == "resources":
+        return visualizations.create_resource_comparison_chart(recommendation, alternatives)
+    return visualizations.create_performance_radar_chart(recommendation, alternatives, resources)
+
+def _write_plotlyjs(f, plotlyjs):
+    """
+    Write the single plotly.js include
+
+    Args:
+        f: Open report file
+        plotlyjs: "inline" or "cdn"
+    """
+    import plotly
+    if plotlyjs == "cdn":
+        f.write(f'<script src="{PLOTLY_CDN_URL.format(version=plotly.__version__)}"></script>\n')
+        return
+
+    from plotly.offline import get_plotlyjs
+    f.write("<script>")
+    f.write(get_plotlyjs())
+    f.write("</script>\n")
+
+def _write_json(f, element_id, text):
+    """
+    Write a JSON document as an inline data block
+
+    Args:
+        f: Open report file
+        element_id: Id of the script element
+        text: JSON text
+    """
+    # "</" would end the script element early
+    text = text.replace("</", "<\\/")
+    f.write(f'<script type="application/json" id="{element_id}">{text}</script>\n')
+
+def _write_totals(f, totals):
+    """
+    Write the fleet-level summary
+
+    Args:
+        f: Open report file
+        totals: Result of fleet_totals
+    """
+    rows = [
+        ("Jobs", f"{totals['jobs']}"),
+        ("Hourly cost (all jobs running)", f"${totals['hourly_cost']:,.2f}"),
+        ("Total cost", f"${totals['total_cost']:,.2f}"),
+        ("GPUs", f"{totals['gpus']}"),
+        ("GPU-hours", f"{totals['gpu_hours']:,.1f}")
+    ]
+    rows += [(f"Jobs on {gpu_type}", f"{count}") for gpu_type, count in sorted(totals["by_gpu_type"].items())]
+    rows += [(f"Jobs in {region}", f"{count}") for region, count in sorted(totals["by_region"].items())]
+
+    f.write('<section id="fleet">\n<h2>Fleet Totals</h2>\n<table>\n')
+    for label, value in rows:
+        f.write(f"<tr><th>{html.escape(label)}</th><td>{value}</td></tr>\n")
+    f.write("</table>\n</section>\n")
+
+def _write_job(f, number, name, input_data, recommendation, chart_divs):
+    """
+    Write one job section
+
+    Args:
+        f: Open report file
+        number: Job number, used as the section anchor
+        name: Job name
+        input_data: Workload inputs
+        recommendation: Recommendation dictionary
+        chart_divs: Placeholder divs of the job's charts
+    """
+    workload = ", ".join(
+        f"{html.escape(str(key))}: {html.escape(str(value))}"
+        for key, value in input_data.items() if value is not None
+    )
+
+    configurations = [("Recommended", recommendation)] + [
+        (alternative["name"], alternative) for alternative in recommendation["alternatives"]
+    ]
+    rows = "".join(
+        f"<tr><td>{html.escape(label)}</td><td>{config['gpu_count']}x {html.escape(config['gpu_type'])}</td>"
+        f"<td>{html.escape(config['instance_type'])}</td><td>{html.escape(config['region'])}</td>"
+        f"<td>${config['estimated_cost']:,.2f}/hour</td></tr>"
+        for label, config in configurations
+    )
+
+    justification = "".join(
+        "<li>" + _BOLD.sub(r"<strong>\1</strong>", html.escape(line)) + "</li>"
+        for line in recommendation["justification"]
+    )
+
+    f.write(
+        f'<section class="job" id="job-{number}">\n<h2>{html.escape(name)}</h2>\n'
+        f"<p>{workload}</p>\n"
+        f"<p>Estimated time: {html.escape(str(recommendation['estimated_time']))}</p>\n"
+        "<table><tr><th>Option</th><th>GPUs</th><th>Instance</th><th>Region</th><th>Hourly cost</th></tr>"
+        f"{rows}</table>\n<ul>{justification}</ul>\n"
+        f'<div class="charts">{"".join(chart_divs)}</div>\n</section>\n'
+    )
+
+def main(argv=None):
+    """
+    Command-line entry point: write a planning report for a batch of jobs
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write an HTML planning report for a batch of workloads")
+    parser.add_argument("workloads", help="JSON or JSONL file of workload inputs")
+    parser.add_argument("--output", default="planning_report.html", help="Report path")
+    parser.add_argument("--plotlyjs", choices=("inline", "cdn"), default="inline",
+                        help="Embed plotly.js for offline viewing or link it from the CDN")
+    args = parser.parse_args(argv)
+
+    stats = generate_report(load_workloads(args.workloads), args.output, plotlyjs=args.plotlyjs)
+    print(f"Wrote {args.output}: {stats['jobs']} jobs, {stats['charts']} charts from "
+          f"{stats['figures']} distinct figures, {stats['bytes'] / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
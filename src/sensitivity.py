@@ -0,0 +1,385 @@
+import bisect
+import numpy as np
+from .advisor_engine import (
+    calculate_estimates, constrained_regions, load_heuristics, load_pricing, load_resource_configs,
+    select_configuration, shared_resources
+)
+from .batch_inference import batch_job_hours, batch_throughput
+from .time_model import MAX_GPU_COUNT, estimate_hours
+from .flops import DEFAULT_PRECISION, flop_hours, has_flop_inputs, sustained_tflops, workload_flops
+from .shared_catalog import catalog_arrays
+from .topology import instance_topology, parallel_layout
+from .placement import DEFAULT_DATA_REGION, budget_price_multiplier
+from .commitments import job_hours
+from .techniques import flop_inputs, technique_factors
+from .startup import cold_start_hours, startup_latency
+
+def enumerate_configurations(resources, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Enumerate every GPU type x GPU count x instance type combination
+
+    Args:
+        resources: Resource configuration data
+        max_gpu_count: Largest GPU count to include
+
+    Returns:
+        dict: Candidate space with parallel NumPy arrays per field
+    """
+    tables = catalog_arrays(resources)
+    gpu_types = tables["gpu_types"]
+    instance_types = tables["instance_types"]
+
+    gpu_index, gpu_count, instance_index = np.meshgrid(
+        np.arange(len(gpu_types)),
+        np.arange(1, max_gpu_count + 1),
+        np.arange(len(instance_types)),
+        indexing="ij"
+    )
+    gpu_index = gpu_index.ravel()
+    gpu_count = gpu_count.ravel()
+    instance_index = instance_index.ravel()
+
+    gpu_hourly_cost = tables["gpu_hourly_cost"]
+    performance = tables["gpu_performance"]
+    instance_multiplier = tables["instance_cost_multiplier"]
+
+    return {
+        "gpu_types": gpu_types,
+        "instance_types": instance_types,
+        "gpu_index": gpu_index,
+        "gpu_count": gpu_count,
+        "instance_index": instance_index,
+        # Same operand order as the engine so breakpoints compare exactly
+        "hourly_cost": gpu_hourly_cost[gpu_index] * gpu_count * instance_multiplier[instance_index],
+        "performance": performance[gpu_index]
+    }
+
+def candidate_flop_hours(input_data, space, resources, memory_factor=1.0):
+    """
+    Estimate FLOP-based job durations for every enumerated configuration
+
+    Args:
+        input_data: Dictionary with the numeric workload inputs (see
+            src.flops.workload_flops) and optionally "precision"
+        space: Candidate space from enumerate_configurations
+        resources: Resource configuration data
+        memory_factor: Scale of the model's memory footprint from training
+            techniques
+
+    Returns:
+        numpy.ndarray: Estimated hours per candidate
+    """
+    task_type = input_data["task_type"]
+    precision = input_data.get("precision", DEFAULT_PRECISION)
+    flops = workload_flops(input_data)
+    tflops = np.array([
+        sustained_tflops(resources["gpu_types"][gpu_type], precision, task_type, resources)
+        for gpu_type in space["gpu_types"]
+    ])
+    hours = flop_hours(flops, tflops[space["gpu_index"]], space["gpu_count"], resources.get("time_model"))
+    return hours * topology_time_factors(input_data, space, resources, memory_factor)
+
+def topology_time_factors(input_data, space, resources, memory_factor=1.0):
+    """
+    Get the multi-node slowdown of every enumerated configuration
+
+    Args:
+        input_data: Dictionary containing user inputs
+        space: Candidate space from enumerate_configurations
+        resources: Resource configuration data
+        memory_factor: Scale of the model's memory footprint from training
+            techniques
+
+    Returns:
+        numpy.ndarray: Time factor per candidate (1.0 within a node)
+    """
+    gpus_per_node = np.array([
+        instance_topology(resources["instance_types"][instance_type])["gpus_per_node"]
+        for instance_type in space["instance_types"]
+    ])
+    factors = np.ones(len(space["gpu_count"]))
+
+    for i in np.flatnonzero(space["gpu_count"] > gpus_per_node[space["instance_index"]]):
+        factors[i] = parallel_layout(
+            input_data["task_type"],
+            input_data["model_size"],
+            space["gpu_types"][space["gpu_index"][i]],
+            int(space["gpu_count"][i]),
+            space["instance_types"][space["instance_index"][i]],
+            resources,
+            memory_factor
+        )["time_factor"]
+
+    return factors
+
+def candidate_batch_hours(input_data, resources, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Estimate the batch inference job durations the engine can size to
+
+    Args:
+        input_data: Dictionary containing user inputs with an "item_count"
+            (see advisor_engine.adjust_for_batch)
+        resources: Resource configuration data
+        max_gpu_count: Largest replica count to include
+
+    Returns:
+        numpy.ndarray: Job hours of every GPU type, batch size and replica
+            count that fits the model
+    """
+    heuristics = load_heuristics()
+    defaults = heuristics["batch_inference"]
+    batch_size = input_data.get("batch_size")
+    throughput = batch_throughput(
+        input_data["model_size"],
+        input_data.get("tokens_per_item", defaults["default_tokens_per_item"]),
+        input_data.get("prompt_tokens", defaults["default_prompt_tokens"]),
+        input_data.get("quantization", defaults["default_quantization"]),
+        resources,
+        heuristics,
+        batch_sizes=[batch_size] if batch_size else None,
+        kv_cache_mb_per_token=input_data.get("kv_cache_mb_per_token")
+    )
+    _, _, hours = batch_job_hours(throughput, input_data["item_count"], heuristics, max_gpu_count)
+    return hours[~np.isnan(hours)]
+
+def sweep_budget(input_data, budget_range=(1.0, 100.0), resources=None, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Compute the recommendation as a piecewise-constant function of budget
+
+    The budget only enters the engine through comparisons against hourly
+    costs of configurations, priced in the region the job will run in, so
+    the recommendation can only change at the regional hourly cost of an
+    enumerated configuration. The engine is evaluated once per candidate
+    breakpoint instead of once per sample.
+
+    Args:
+        input_data: Dictionary containing user inputs (budget_limit is ignored)
+        budget_range: (low, high) hourly budget range in dollars
+        resources: Resource configuration data (loaded from disk if omitted)
+        max_gpu_count: Largest GPU count to enumerate
+
+    Returns:
+        dict: Sweep result with breakpoints and per-segment configurations
+    """
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+
+    space = enumerate_configurations(resources, max_gpu_count)
+    pricing = load_pricing()
+    price_multiplier = _price_multiplier(input_data, resources, pricing)
+    return _sweep(input_data, "budget_limit", space["hourly_cost"] * price_multiplier, budget_range, resources, pricing)
+
+def sweep_deadline(input_data, deadline_range=(1.0, 168.0), resources=None, max_gpu_count=MAX_GPU_COUNT):
+    """
+    Compute the recommendation as a piecewise-constant function of deadline
+
+    The candidate breakpoints are the estimated job durations of every
+    enumerated configuration, timed by the same model as the engine (FLOPs
+    or size buckets) plus the startup the engine adds: the configuration's
+    own when checking the current one, the slowest GPU type's on its
+    instance type when solving for a new one. Batch inference jobs with an
+    item count add the durations of every plan the engine can size them to.
+    Segments also break where the storage tier or region changes (see
+    _sweep), and their estimates are the engine's own.
+
+    Args:
+        input_data: Dictionary containing user inputs (deadline is ignored)
+        deadline_range: (low, high) deadline range in hours
+        resources: Resource configuration data (loaded from disk if omitted)
+        max_gpu_count: Largest GPU count to enumerate
+
+    Returns:
+        dict: Sweep result with breakpoints and per-segment configurations
+    """
+    if input_data["task_type"] == "Real-time Inference":
+        raise ValueError("Deadline sweeps are not defined for Real-time Inference")
+
+    if resources is None:
+        resources = load_resource_configs()
+    resources = shared_resources(resources)
+
+    space = enumerate_configurations(resources, max_gpu_count)
+    factors = technique_factors(input_data, resources)
+    throughput_factor = factors["throughput_factor"] if factors else 1.0
+    memory_factor = factors["memory_factor"] if factors else 1.0
+    if has_flop_inputs(input_data):
+        flop_input = input_data
+        if factors:
+            flop_input, throughput_factor = flop_inputs(input_data, factors)
+        durations = candidate_flop_hours(flop_input, space, resources, memory_factor)
+    else:
+        durations = estimate_hours(
+            input_data["task_type"],
+            input_data["model_size"],
+            input_data["dataset_size"],
+            space["performance"],
+            space["gpu_count"],
+            resources.get("time_model")
+        ) * topology_time_factors(input_data, space, resources, memory_factor)
+    durations = durations / throughput_factor
+
+    startup_hours = np.array([
+        [
+            cold_start_hours(startup_latency(input_data["model_size"], gpu_type, instance_type, resources))
+            for instance_type in space["instance_types"]
+        ]
+        for gpu_type in space["gpu_types"]
+    ])
+    thresholds = np.concatenate((
+        durations + startup_hours[space["gpu_index"], space["instance_index"]],
+        durations + startup_hours.max(axis=0)[space["instance_index"]]
+    ))
+    if input_data["task_type"] == "Batch Inference" and input_data.get("item_count") is not None:
+        thresholds = np.concatenate((thresholds, candidate_batch_hours(input_data, resources, max_gpu_count)))
+    pricing = load_pricing()
+    return _sweep(input_data, "deadline", thresholds, deadline_range, resources, pricing)
+
+def _price_multiplier(input_data, resources, pricing):
+    """
+    Get the region price multiplier the engine checks budgets at
+
+    Args:
+        input_data: Dictionary containing user inputs
+        resources: Resource configuration data
+        pricing: Pricing data
+
+    Returns:
+        float: Result of placement.budget_price_multiplier
+    """
+    return budget_price_multiplier(
+        input_data.get("data_region", DEFAULT_DATA_REGION), resources, pricing,
+        constrained_regions(input_data, resources)
+    )
+
+def _sweep(input_data, parameter, thresholds, value_range, resources, pricing=None):
+    """
+    Evaluate the engine once per candidate breakpoint
+
+    In a deadline sweep, each evaluation also adds the job hours of every
+    storage tier and region of its configuration as candidate breakpoints:
+    those stages pick against the deadline too, so the estimates can change
+    where a tier or region starts to meet it.
+
+    Args:
+        input_data: Dictionary containing user inputs
+        parameter: Input key being swept
+        thresholds: Array of values where the configuration may change
+        value_range: (low, high) range of the swept parameter
+        resources: Resource configuration data
+        pricing: Pricing data, loaded once for every evaluation (loaded from
+            disk if omitted)
+
+    Returns:
+        dict: Sweep result
+    """
+    low, high = value_range
+    if not 0 < low < high:
+        raise ValueError(f"Invalid {parameter} range: {value_range}")
+    if pricing is None:
+        pricing = load_pricing()
+
+    thresholds = np.unique(thresholds)
+    starts = [float(low)] + thresholds[(thresholds > low) & (thresholds < high)].tolist()
+    seen = set(starts)
+
+    segments = []
+    previous = None
+    index = 0
+    while index < len(starts):
+        # Decisions compare ``value > parameter``, so each interval
+        # [start, next_start) behaves like its left endpoint
+        start = starts[index]
+        index += 1
+        sample = dict(input_data)
+        sample[parameter] = start
+        config = select_configuration(sample, resources, pricing)
+
+        # The estimates of a selection only change where one of its storage
+        # tiers or regions starts to meet the deadline, and those values are
+        # already starts; the deadline check is recomputed with them
+        deadline_check = config.pop("deadline_check", None)
+        selection = dict(config)
+        if deadline_check is not None:
+            config["deadline_check"] = deadline_check
+        if previous is not None and previous[0] == selection and start not in previous[1]:
+            description = previous[2]
+        else:
+            recommendation = calculate_estimates(
+                config, sample["task_type"], sample["model_size"], sample["dataset_size"], resources, sample, pricing
+            )
+            estimate_thresholds = set()
+            if parameter == "deadline":
+                estimate_thresholds.update(_estimate_thresholds(recommendation))
+                for value in estimate_thresholds:
+                    if start < value < high and value not in seen:
+                        seen.add(value)
+                        bisect.insort(starts, value)
+            description = _describe_segment(recommendation, sample["task_type"])
+            previous = (selection, estimate_thresholds, description)
+
+        if segments and segments[-1]["description"] == description:
+            continue
+        if segments:
+            segments[-1]["end"] = start
+        segments.append({"start": start, "end": None, "description": description})
+
+    segments[-1]["end"] = float(high)
+    segments = [
+        {"start": segment["start"], "end": segment["end"], **segment["description"]} for segment in segments
+    ]
+
+    return {
+        "parameter": parameter,
+        "range": (float(low), float(high)),
+        "breakpoints": [segment["start"] for segment in segments[1:]],
+        "segments": segments
+    }
+
+def _estimate_thresholds(recommendation):
+    """
+    Get the job hours the storage and placement stages compare to a deadline
+
+    Args:
+        recommendation: Recommendation with estimates
+
+    Returns:
+        list: Job hours of every storage tier, and of every tier in every
+            region
+    """
+    tier_hours = [tier["job_hours"] for tier in recommendation.get("storage_plan", {}).get("tiers", {}).values()]
+    values = list(tier_hours)
+    for region in recommendation.get("placement", {}).get("regions", {}).values():
+        values.append(region["job_hours"])
+        # Same operand order as placement.plan_region
+        values.extend(region["transfer_hours"] + hours for hours in tier_hours)
+    return values
+
+def _describe_segment(recommendation, task_type):
+    """
+    Build the cost and time summary of one sweep segment
+
+    Args:
+        recommendation: Recommendation with estimates (see
+            advisor_engine.calculate_estimates)
+        task_type: Type of task
+
+    Returns:
+        dict: Segment description
+    """
+    hourly_cost = recommendation["estimated_cost"]
+    if task_type == "Real-time Inference":
+        hours = 24.0  # Daily cost, as in calculate_total_cost
+        total_cost = hourly_cost * hours
+    else:
+        hours = job_hours(recommendation)
+        total_cost = recommendation.get("estimated_total_cost", hourly_cost * hours)
+
+    return {
+        "gpu_type": recommendation["gpu_type"],
+        "gpu_count": recommendation["gpu_count"],
+        "instance_type": recommendation["instance_type"],
+        "hourly_cost": hourly_cost,
+        "estimated_hours": hours,
+        "total_cost": round(total_cost, 2)
+    }
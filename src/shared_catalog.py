@@ -0,0 +1,423 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Mapping
+import numpy as np
+from .catalog import SHARED_CATALOG_ENV, FrozenDict, catalog_version, freeze
+from .utils import parse_vram_gb
+
+# File layout: magic, header length, JSON header, then 64-byte aligned arrays
+MAGIC = b"FLEXCAT1"
+_PREFIX = struct.Struct("<8sI")
+ALIGNMENT = 64
+
+# Number of catalog versions whose locally compiled arrays are kept
+MAX_COMPILED_VERSIONS = 4
+
+# Number of local catalogs kept with published prices applied
+MAX_PUBLISHED_CATALOGS = 4
+
+# Catalog entry fields read from the published arrays
+GPU_FIELDS = {"hourly_cost": "gpu_hourly_cost", "relative_performance": "gpu_performance"}
+INSTANCE_FIELDS = {"cost_multiplier": "instance_cost_multiplier"}
+
+_attached = {}
+_compiled = {}
+_published = {}
+_lock = threading.Lock()
+
+class PublishedEntry(Mapping):
+    """
+    Read-only catalog entry whose published fields are read from shared arrays
+
+    Published fields are read by index from the attached arrays on every
+    lookup; other fields come from the local entry. Nothing is copied, so
+    every worker on a host reads the one copy in the page cache.
+    """
+
+    __slots__ = ("_local", "_arrays", "_index")
+
+    def __init__(self, local, arrays, index):
+        self._local = local
+        self._arrays = arrays
+        self._index = index
+
+    def __getitem__(self, key):
+        array = self._arrays.get(key)
+        if array is None:
+            return self._local[key]
+        return float(array[self._index])
+
+    def __iter__(self):
+        return iter(self._local)
+
+    def __len__(self):
+        return len(self._local)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def compile_catalog_arrays(resources, heuristics=None):
+    """
+    Compile a catalog into flat NumPy lookup tables
+
+    GPU and instance attributes become arrays indexed in catalog order;
+    heuristic rules become (task, model) tables of GPU index, GPU count and
+    instance index, with -1 where no rule exists. The arrays are read-only,
+    like the memory-mapped ones, since threads share them.
+
+    Args:
+        resources: Resource configuration data
+        heuristics: Heuristic rules with "task_type_rules" (optional)
+
+    Returns:
+        dict: "gpu_types" and "instance_types" name lists and one array
+            per attribute
+    """
+    gpu_types = list(resources["gpu_types"])
+    instance_types = list(resources["instance_types"])
+    gpus = [resources["gpu_types"][name] for name in gpu_types]
+    instances = [resources["instance_types"][name] for name in instance_types]
+
+    tables = {
+        "gpu_types": gpu_types,
+        "instance_types": instance_types,
+        "gpu_hourly_cost": np.array([gpu["hourly_cost"] for gpu in gpus], dtype=np.float64),
+        "gpu_performance": np.array([gpu["relative_performance"] for gpu in gpus], dtype=np.float64),
+        "gpu_vram_gb": np.array([parse_vram_gb(gpu["vram"]) for gpu in gpus], dtype=np.float64),
+        "instance_cost_multiplier": np.array([instance["cost_multiplier"] for instance in instances], dtype=np.float64)
+    }
+
+    rules = (heuristics or {}).get("task_type_rules")
+    if rules:
+        from .justification import MODEL_SIZES, TASK_TYPES
+        shape = (len(TASK_TYPES), len(MODEL_SIZES))
+        rule_gpu = np.full(shape, -1, dtype=np.int32)
+        rule_count = np.full(shape, -1, dtype=np.int32)
+        rule_instance = np.full(shape, -1, dtype=np.int32)
+        for i, task_type in enumerate(TASK_TYPES):
+            for j, model_size in enumerate(MODEL_SIZES):
+                rule = rules.get(task_type, {}).get(model_size)
+                if rule is None:
+                    continue
+                rule_gpu[i, j] = gpu_types.index(rule["gpu_type"])
+                rule_count[i, j] = rule["gpu_count"]
+                rule_instance[i, j] = instance_types.index(rule["instance_type"])
+        tables.update(rule_gpu_index=rule_gpu, rule_gpu_count=rule_count, rule_instance_index=rule_instance)
+
+    for array in tables.values():
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+    return tables
+
+def publish_catalog(resources, file_path, heuristics=None):
+    """
+    Publish compiled catalog arrays to a file that workers memory-map
+
+    The file is written next to its destination and renamed over it, so
+    attached workers keep reading the old version until they re-attach and
+    never see a partially written file.
+
+    Args:
+        resources: Resource configuration data
+        file_path (str): Destination path
+        heuristics: Heuristic rules (optional)
+
+    Returns:
+        str: Version of the published catalog
+    """
+    tables = compile_catalog_arrays(resources, heuristics)
+    resources_version = catalog_version(resources)
+    version = resources_version
+    if heuristics:
+        version = f"{version}+{catalog_version(heuristics)}"
+
+    arrays = {name: value for name, value in tables.items() if isinstance(value, np.ndarray)}
+    write_arrays(file_path, MAGIC, {
+        "version": version,
+        "catalog_version": resources_version,
+        "gpu_types": tables["gpu_types"],
+        "instance_types": tables["instance_types"]
+    }, arrays)
+
+    return version
+
+def write_arrays(file_path, magic, header, arrays):
+    """
+    Write a JSON header and NumPy arrays to a memory-mappable file
+
+    The arrays follow the header at 64-byte aligned offsets recorded in it.
+    The file is written next to its destination and renamed over it.
+
+    Args:
+        file_path (str): Destination path
+        magic (bytes): 8-byte file type marker
+        header: JSON-serializable metadata
+        arrays: Name -> NumPy array
+    """
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    encoded = json.dumps(dict(header, arrays=layout)).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(encoded))
+
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_PREFIX.pack(magic, len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(temp_path, file_path)
+
+def map_arrays(file_path, magic):
+    """
+    Memory-map a file written by write_arrays
+
+    Args:
+        file_path (str): Path of the file
+        magic (bytes): Expected file type marker
+
+    Returns:
+        tuple: (header, name -> read-only array view)
+
+    Raises:
+        ValueError: If the file does not start with ``magic``
+    """
+    with open(file_path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    found, header_length = _PREFIX.unpack_from(buffer, 0)
+    if found != magic:
+        buffer.close()
+        raise ValueError(f"{file_path} is not a {magic.decode()} file")
+
+    header = json.loads(buffer[_PREFIX.size:_PREFIX.size + header_length])
+    data_start = _align(_PREFIX.size + header_length)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        arrays[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + spec["offset"]
+        ).reshape(spec["shape"])
+    return header, arrays
+
+def attach_catalog(file_path):
+    """
+    Attach to a published catalog without copying its arrays
+
+    Arrays are read-only views into a shared memory map, so every process
+    on the host shares one copy through the page cache. The attachment is
+    reused until the file is replaced, and then switches to the new
+    version on the next call.
+
+    Args:
+        file_path (str): Path of a file written by publish_catalog
+
+    Returns:
+        dict: "version", "catalog_version", name lists and read-only arrays
+
+    Raises:
+        ValueError: If the file is not a published catalog
+    """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    cached = _attached.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    header, arrays = map_arrays(file_path, MAGIC)
+    catalog = {
+        "version": header["version"],
+        "catalog_version": header["catalog_version"],
+        "gpu_types": header["gpu_types"],
+        "instance_types": header["instance_types"],
+        **arrays
+    }
+
+    with _lock:
+        _attached[key] = (signature, catalog)
+
+    return catalog
+
+def shared_catalog(resources):
+    """
+    Attach to the catalog published for this host, if there is one
+
+    The file named by FLEXAI_SHARED_CATALOG is used whatever its version,
+    so a newly published catalog takes effect in every worker on its next
+    lookup. It must cover the GPU and instance types of the local catalog,
+    since the engine iterates those.
+
+    Args:
+        resources: Resource configuration data the worker loaded
+
+    Returns:
+        dict: Result of attach_catalog, or None if no usable file is
+            published
+    """
+    shared_path = os.environ.get(SHARED_CATALOG_ENV)
+    if not shared_path:
+        return None
+    try:
+        shared = attach_catalog(shared_path)
+    except (OSError, ValueError):
+        return None
+    if not (set(resources["gpu_types"]) <= set(shared["gpu_types"])
+            and set(resources["instance_types"]) <= set(shared["instance_types"])):
+        return None
+    return shared
+
+def published_resources(resources):
+    """
+    Apply the published catalog's prices and performance to a local catalog
+
+    GPU hourly costs and relative performance and instance cost multipliers
+    are read by index from the attached arrays (see PublishedEntry),
+    published rule tables become "task_type_rules", and "version" becomes
+    the published version, so recommendations and their IDs follow the
+    published catalog. The result is built once per published version and
+    shares everything else with ``resources``.
+
+    Args:
+        resources: Resource configuration data the worker loaded
+
+    Returns:
+        FrozenDict: Catalog with published values, or ``resources`` itself
+            if nothing is published or it is already current
+    """
+    shared = shared_catalog(resources)
+    if shared is None or shared["version"] == catalog_version(resources):
+        return resources
+
+    key = (catalog_version(resources), shared["version"])
+    cached = _published.get(key)
+    if cached is not None:
+        return cached
+
+    overrides = {
+        "gpu_types": _published_entries(resources["gpu_types"], shared, "gpu_types", GPU_FIELDS),
+        "instance_types": _published_entries(resources["instance_types"], shared, "instance_types", INSTANCE_FIELDS),
+        "version": shared["version"]
+    }
+    if "rule_gpu_index" in shared:
+        overrides["task_type_rules"] = freeze(_published_rules(shared))
+    updated = FrozenDict(resources, **overrides)
+
+    with _lock:
+        if len(_published) >= MAX_PUBLISHED_CATALOGS:
+            _published.clear()
+        _published[key] = updated
+    return updated
+
+def catalog_arrays(resources):
+    """
+    Get the lookup arrays for a catalog, shared across processes if possible
+
+    If FLEXAI_SHARED_CATALOG names a published file (see shared_catalog),
+    its memory-mapped arrays are used, following its version; otherwise
+    the arrays are compiled once per catalog version in this process.
+
+    Args:
+        resources: Resource configuration data
+
+    Returns:
+        dict: Name lists and arrays (see compile_catalog_arrays)
+    """
+    shared = shared_catalog(resources)
+    if shared is not None:
+        return shared
+
+    version = catalog_version(resources)
+    tables = _compiled.get(version)
+    if tables is None:
+        tables = compile_catalog_arrays(resources)
+        with _lock:
+            if len(_compiled) >= MAX_COMPILED_VERSIONS:
+                _compiled.pop(next(iter(_compiled)))
+            _compiled[version] = tables
+    return tables
+
+def _published_entries(entries, shared, names, fields):
+    """
+    Wrap local catalog entries so that published fields read shared arrays
+
+    Args:
+        entries: Local "gpu_types" or "instance_types" entries
+        shared: Result of attach_catalog
+        names: Name list of ``shared`` the entries are indexed by
+        fields: Entry field -> array name in ``shared``
+
+    Returns:
+        FrozenDict: Name -> PublishedEntry, in local catalog order
+    """
+    index = {name: i for i, name in enumerate(shared[names])}
+    arrays = {field: shared[array] for field, array in fields.items()}
+    return FrozenDict((name, PublishedEntry(entry, arrays, index[name])) for name, entry in entries.items())
+
+def _published_rules(shared):
+    """
+    Decode published rule tables into heuristic rules
+
+    Args:
+        shared: Result of attach_catalog with rule tables
+
+    Returns:
+        dict: Task type -> model size -> "gpu_type", "gpu_count" and
+            "instance_type" (the form of "task_type_rules")
+    """
+    from .justification import MODEL_SIZES, TASK_TYPES
+
+    rules = {}
+    for i, task_type in enumerate(TASK_TYPES):
+        for j, model_size in enumerate(MODEL_SIZES):
+            gpu_index = int(shared["rule_gpu_index"][i, j])
+            if gpu_index < 0:
+                continue
+            rules.setdefault(task_type, {})[model_size] = {
+                "gpu_type": shared["gpu_types"][gpu_index],
+                "gpu_count": int(shared["rule_gpu_count"][i, j]),
+                "instance_type": shared["instance_types"][int(shared["rule_instance_index"][i, j])]
+            }
+    return rules
+
+def _align(offset):
+    """
+    Round an offset up to the array alignment
+
+    Args:
+        offset: Byte offset
+
+    Returns:
+        int: Aligned offset
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def main(argv=None):
+    """
+    Command-line entry point: publish the catalog for worker processes
+    """
+    import argparse
+    from .advisor_engine import load_heuristics, load_resource_configs
+
+    parser = argparse.ArgumentParser(description="Publish catalog arrays for shared, zero-copy loading")
+    parser.add_argument("output", help="Destination file (point FLEXAI_SHARED_CATALOG at it)")
+    parser.add_argument("--catalog", default="data/resource_configs.json", help="Resource catalog")
+    parser.add_argument("--heuristics", default="data/heuristics.json", help="Heuristic rules")
+    args = parser.parse_args(argv)
+
+    version = publish_catalog(load_resource_configs(args.catalog), args.output, load_heuristics(args.heuristics))
+    print(f"Published catalog version {version} to {args.output}")
+
+if __name__ == "__main__":
+    main()
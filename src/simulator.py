@@ -1,5 +1,4 @@
 import time
-import streamlit as st
 
 def simulate_advisor_processing():
     """
@@ -8,6 +7,8 @@ def simulate_advisor_processing():
     Returns:
         bool: Success status
     """
+    import streamlit as st
+    
     progress_bar = st.progress(0)
     status_text = st.empty()
     
@@ -66,6 +67,8 @@ def animate_thinking_sequence():
     Returns:
         None
     """
+    import streamlit as st
+    
     thinking_container = st.empty()
     
     thinking_steps = [
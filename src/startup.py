@@ -0,0 +1,104 @@
+from .utils import estimate_memory_requirement
+
+def startup_latency(model_size, gpu_type, instance_type, resources):
+    """
+    Estimate the time from requesting a node to serving or training on it
+
+    Provisioning, boot and container image pull are given per instance type
+    ("startup_seconds"), GPU driver initialization and health checks per GPU
+    type ("startup_seconds"); either defaults to zero when the catalog does
+    not list it. The model weights are then read over the instance's
+    network. Nodes of a multi-node job start in parallel, so the latency
+    does not depend on the GPU count.
+
+    Args:
+        model_size: Size of model
+        gpu_type: GPU type
+        instance_type: Instance type
+        resources: Resource configuration data
+
+    Returns:
+        dict: "instance_seconds", "gpu_seconds", "model_load_seconds" and
+            their sum "total_seconds"
+    """
+    instance = resources["instance_types"][instance_type]
+    gpu = resources["gpu_types"][gpu_type]
+
+    # The inference footprint approximates the size of the weights alone
+    weights_gb = estimate_memory_requirement(model_size, "Real-time Inference")
+
+    latency = {
+        "instance_seconds": instance.get("startup_seconds", 0),
+        "gpu_seconds": gpu.get("startup_seconds", 0),
+        "model_load_seconds": weights_gb / instance["network_gb_per_s"] if "network_gb_per_s" in instance else 0.0
+    }
+    latency["total_seconds"] = sum(latency.values())
+    return latency
+
+def plan_warm_pool(capacity_plan, peak_plan, startup, scale_out_seconds, resources):
+    """
+    Size the pool of idle replicas that absorbs a traffic burst in time
+
+    Scaling out from cold takes the startup latency. If that is within the
+    scale-out target, replicas can be started on demand and no pool is
+    needed; otherwise every replica the peak needs beyond the steady state
+    must already be running, idle but loaded, and is billed as such.
+
+    Args:
+        capacity_plan: Steady-state plan from plan_realtime_capacity
+        peak_plan: Plan for the peak rate on the same GPU type
+        startup: Result of startup_latency for that GPU type
+        scale_out_seconds: Longest acceptable time to add capacity
+        resources: Resource configuration data
+
+    Returns:
+        dict: Warm replicas and GPUs, their hourly and daily cost, and
+            "meets_target" (False if the peak cannot be served at all)
+    """
+    pool = {
+        "scale_out_seconds": scale_out_seconds,
+        "cold_start_seconds": startup["total_seconds"],
+        "peak_request_rate": peak_plan["request_rate"],
+        "warm_replicas": 0,
+        "warm_gpus": 0,
+        "warm_hourly_cost": 0.0,
+        "warm_daily_cost": 0.0,
+        "meets_target": peak_plan["feasible"]
+    }
+    if not peak_plan["feasible"]:
+        return pool
+
+    pool["peak_replicas"] = peak_plan["replicas"]
+    if startup["total_seconds"] <= scale_out_seconds:
+        return pool
+
+    warm_replicas = max(0, peak_plan["replicas"] - capacity_plan["replicas"])
+    instance = resources["instance_types"][capacity_plan["instance_type"]]
+    hourly_cost = (
+        resources["gpu_types"][capacity_plan["gpu_type"]]["hourly_cost"]
+        * capacity_plan["gpus_per_replica"] * warm_replicas * instance["cost_multiplier"]
+    )
+    pool.update({
+        "warm_replicas": warm_replicas,
+        "warm_gpus": warm_replicas * capacity_plan["gpus_per_replica"],
+        "warm_hourly_cost": hourly_cost,
+        "warm_daily_cost": hourly_cost * 24
+    })
+    return pool
+
+def cold_start_hours(startup, batch_plan=None):
+    """
+    Get the startup time added to a job's duration
+
+    Args:
+        startup: Result of startup_latency
+        batch_plan: Batch inference plan, whose time already includes
+            loading the weights (optional)
+
+    Returns:
+        float: Hours
+    """
+    seconds = startup["total_seconds"]
+    if batch_plan and batch_plan["feasible"]:
+        seconds -= startup["model_load_seconds"]
+    return seconds / 3600
@@ -0,0 +1,152 @@
+from .catalog import catalog_version
+
+# Representative dataset size in GB for each dataset size label
+DATASET_GB = {
+    "Small (<1GB)": 0.5,
+    "Medium (1GB-10GB)": 5,
+    "Large (10GB-100GB)": 50,
+    "Large (100GB-1TB)": 500,
+    "Very Large (>100GB)": 1000,
+    "Very Large (>1TB)": 2000
+}
+
+# Passes over the dataset when the input does not give "epochs"
+DEFAULT_EPOCHS = 1
+
+HOURS_PER_MONTH = 730
+
+# Per-instance tier tables, keyed by catalog and pricing version
+_tier_tables = {}
+
+def dataset_gb(dataset_size, input_data=None):
+    """
+    Get the dataset size in GB
+
+    Args:
+        dataset_size: Dataset size label
+        input_data: User input data; its "dataset_bytes" takes precedence
+
+    Returns:
+        float: Dataset size in GB
+    """
+    if input_data and input_data.get("dataset_bytes"):
+        return input_data["dataset_bytes"] / 1e9
+    return DATASET_GB[dataset_size]
+
+def read_throughput(tier, instance, nodes):
+    """
+    Get the aggregate dataset read throughput of a job
+
+    Every node streams its shard of the data, limited by both the storage
+    tier's per-client throughput and the instance's network class.
+
+    Args:
+        tier: Storage tier entry from the catalog
+        instance: Instance type entry from the catalog
+        nodes: Number of nodes reading
+
+    Returns:
+        float: Read throughput in GB/s
+    """
+    return min(tier["read_gb_per_s"], instance["network_gb_per_s"]) * nodes
+
+def _tier_table(instance_type, resources, pricing):
+    """
+    Collect the per-node throughput and prices of every storage tier
+
+    Args:
+        instance_type: Instance type
+        resources: Resource configuration data with "storage_tiers"
+        pricing: Pricing data
+
+    Returns:
+        tuple: (name, GB/s per node, staging hours, $/GB-month, $/GB read)
+            per tier
+    """
+    key = (catalog_version(resources), catalog_version(pricing), instance_type)
+    table = _tier_tables.get(key)
+    if table is None:
+        instance = resources["instance_types"][instance_type]
+        storage_prices = pricing.get("storage_pricing", {})
+        retrieval_prices = pricing.get("storage_retrieval_pricing", {})
+        table = tuple(
+            (
+                name,
+                read_throughput(tier, instance, 1),
+                tier["staging_hours"],
+                storage_prices.get(name, 0.0),
+                retrieval_prices.get(name, 0.0)
+            )
+            for name, tier in resources["storage_tiers"].items()
+        )
+        _tier_tables[key] = table
+    return table
+
+def plan_storage(dataset_size, compute_hours, hourly_cost, nodes, instance_type, resources, pricing, input_data=None,
+                 startup_hours=0.0, deadline_hours=None):
+    """
+    Estimate I/O time and cost on every storage tier and pick the cheapest
+
+    Data loading overlaps with compute, so a job runs at the slower of the
+    two: ``max(compute, I/O)`` hours, after any staging (e.g. restoring
+    archived data) and node startup. GPUs are billed from startup on;
+    storage is billed for the whole job and retrieval per GB read. Tiers
+    that miss the deadline are dropped unless none meet it.
+
+    Args:
+        dataset_size: Dataset size label
+        compute_hours: Compute-bound job duration
+        hourly_cost: Hourly cost of the configuration
+        nodes: Number of nodes reading the dataset
+        instance_type: Instance type
+        resources: Resource configuration data with "storage_tiers"
+        pricing: Pricing data with "storage_pricing" ($/GB-month) and
+            "storage_retrieval_pricing" ($/GB)
+        input_data: User input data ("dataset_bytes" and "epochs" are used)
+        startup_hours: Time for the nodes to start before reading data
+        deadline_hours: Deadline in hours (optional)
+
+    Returns:
+        dict: Recommended tier with its time and cost breakdown, and the
+            same breakdown for every tier under "tiers"
+    """
+    gigabytes = dataset_gb(dataset_size, input_data)
+    epochs = (input_data or {}).get("epochs", DEFAULT_EPOCHS)
+    gigabytes_read = gigabytes * epochs
+
+    tiers = {}
+    for name, node_throughput, staging_hours, price_per_month, price_per_read in _tier_table(instance_type, resources, pricing):
+        io_hours = gigabytes_read / (node_throughput * nodes) / 3600
+        running_hours = max(compute_hours, io_hours)
+        job_hours = staging_hours + startup_hours + running_hours
+
+        compute_cost = hourly_cost * (startup_hours + running_hours)
+        storage_cost = gigabytes * price_per_month * job_hours / HOURS_PER_MONTH
+        io_cost = gigabytes_read * price_per_read
+
+        tiers[name] = {
+            "io_hours": io_hours,
+            "job_hours": job_hours,
+            "io_bound": io_hours > compute_hours,
+            "compute_cost": compute_cost,
+            "storage_cost": storage_cost,
+            "io_cost": io_cost,
+            "total_cost": compute_cost + storage_cost + io_cost
+        }
+
+    # Tiers that miss the deadline rank after every tier that meets it
+    recommended = min(tiers, key=lambda name: (
+        deadline_hours is not None and tiers[name]["job_hours"] > deadline_hours,
+        tiers[name]["total_cost"],
+        tiers[name]["job_hours"]
+    ))
+
+    return {
+        "recommended_tier": recommended,
+        "dataset_gb": gigabytes,
+        "epochs": epochs,
+        "compute_hours": compute_hours,
+        "startup_hours": startup_hours,
+        **tiers[recommended],
+        "tiers": tiers
+    }
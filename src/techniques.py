@@ -0,0 +1,162 @@
+from .topology import estimate_cluster_hours
+from .utils import estimate_memory_requirement, parse_vram_gb
+
+# Memory and throughput factors of training techniques, relative to full
+# fp32 training, when the catalog has no "training_techniques" table. A
+# technique is enabled by setting its name to true in the input; techniques
+# sharing a "group" are alternatives and cannot be combined.
+DEFAULT_TECHNIQUES = {
+    "mixed_precision": {
+        "label": "Mixed precision",
+        "tasks": ("Training", "Fine-tuning"),
+        "memory_factor": 0.7,
+        "throughput_factor": 1.6,
+        "precision": "bf16"
+    },
+    "lora": {
+        "label": "LoRA",
+        "tasks": ("Fine-tuning",),
+        "memory_factor": 0.4,
+        "throughput_factor": 1.3,
+        "group": "adapter"
+    },
+    "qlora": {
+        "label": "QLoRA",
+        "tasks": ("Fine-tuning",),
+        "memory_factor": 0.25,
+        "throughput_factor": 0.9,
+        "group": "adapter"
+    },
+    "activation_checkpointing": {
+        "label": "Activation checkpointing",
+        "tasks": ("Training", "Fine-tuning"),
+        "memory_factor": 0.6,
+        "throughput_factor": 0.75
+    }
+}
+
+def technique_factors(input_data, resources):
+    """
+    Combine the factors of the training techniques an input enables
+
+    Factors of independent techniques multiply. Techniques that do not
+    apply to the task (e.g. LoRA for pre-training) are ignored.
+
+    Args:
+        input_data: Dictionary containing user inputs
+        resources: Resource configuration data
+
+    Returns:
+        dict or None: Applied technique names and labels, combined
+            "memory_factor" and "throughput_factor", the reduced
+            "memory_gb" and the "precision" they imply (or None); None if
+            no technique applies
+
+    Raises:
+        ValueError: If two techniques of the same group are enabled
+    """
+    table = resources.get("training_techniques", DEFAULT_TECHNIQUES)
+    # The engine calls this for every recommendation, most without techniques
+    if input_data.keys().isdisjoint(table):
+        return None
+
+    task_type = input_data["task_type"]
+    enabled = [name for name in table if input_data.get(name) and task_type in table[name]["tasks"]]
+    if not enabled:
+        return None
+
+    factors = {
+        "techniques": [],
+        "labels": [],
+        "memory_factor": 1.0,
+        "throughput_factor": 1.0,
+        "precision": None,
+        "precision_throughput_factor": 1.0
+    }
+    groups = {}
+
+    for name in enabled:
+        technique = table[name]
+        group = technique.get("group")
+        if group is not None:
+            if group in groups:
+                raise ValueError(f"Techniques {groups[group]} and {name} cannot be combined")
+            groups[group] = name
+
+        factors["techniques"].append(name)
+        factors["labels"].append(technique.get("label", name))
+        factors["memory_factor"] *= technique["memory_factor"]
+        factors["throughput_factor"] *= technique["throughput_factor"]
+        if "precision" in technique:
+            factors["precision"] = technique["precision"]
+            factors["precision_throughput_factor"] *= technique["throughput_factor"]
+
+    factors["memory_gb"] = estimate_memory_requirement(input_data["model_size"], task_type) * factors["memory_factor"]
+    return factors
+
+def flop_inputs(input_data, factors):
+    """
+    Adapt FLOP-based inputs to the enabled techniques
+
+    The FLOP model already prices the numeric precision, so a technique
+    that sets the precision contributes it instead of its throughput
+    factor. A precision named in the input wins.
+
+    Args:
+        input_data: Dictionary with the numeric workload inputs
+        factors: Result of technique_factors
+
+    Returns:
+        tuple: (input data for estimate_flop_hours, throughput factor left
+            to apply to its hours)
+    """
+    if factors["precision"] is None:
+        return input_data, factors["throughput_factor"]
+    if "precision" not in input_data:
+        input_data = dict(input_data, precision=factors["precision"])
+    return input_data, factors["throughput_factor"] / factors["precision_throughput_factor"]
+
+def right_size(recommendation, task_type, model_size, dataset_size, factors, resources):
+    """
+    Shrink a configuration to the cheapest one the reduced footprint fits
+
+    Every GPU type is tried at up to the current GPU count on the current
+    instance type. A configuration fits when its combined VRAM holds the
+    model's memory requirement scaled by the techniques' memory factor;
+    the one with the lowest job cost replaces the current configuration if
+    it is cheaper.
+
+    Args:
+        recommendation: Current recommendation dict
+        task_type: Type of task
+        model_size: Size of model
+        dataset_size: Size of dataset
+        factors: Result of technique_factors
+        resources: Resource configuration data
+
+    Returns:
+        Updated recommendation dict
+    """
+    instance_type = recommendation["instance_type"]
+    instance_multiplier = resources["instance_types"][instance_type]["cost_multiplier"]
+
+    def job_cost(gpu_type, gpu_count):
+        hours, _ = estimate_cluster_hours(
+            task_type, model_size, dataset_size, gpu_type, gpu_count, instance_type, resources,
+            factors["memory_factor"]
+        )
+        return resources["gpu_types"][gpu_type]["hourly_cost"] * gpu_count * instance_multiplier * hours
+
+    best = (recommendation["gpu_type"], recommendation["gpu_count"])
+    best_cost = job_cost(*best)
+    for gpu_type, gpu in resources["gpu_types"].items():
+        vram_gb = parse_vram_gb(gpu["vram"])
+        for gpu_count in range(1, recommendation["gpu_count"] + 1):
+            if gpu_count * vram_gb < factors["memory_gb"]:
+                continue
+            cost = job_cost(gpu_type, gpu_count)
+            if cost < best_cost:
+                best, best_cost = (gpu_type, gpu_count), cost
+
+    recommendation["gpu_type"], recommendation["gpu_count"] = best
+    return recommendation
@@ -0,0 +1,125 @@
+import math
+
+# Baseline job hours on a single reference GPU (relative_performance 1.0)
+BASE_HOURS = {
+    "Training": {"Small": 2, "Medium": 6, "Large": 24, "XL": 72},
+    "Fine-tuning": {"Small": 1, "Medium": 3, "Large": 10, "XL": 24},
+    "Batch Inference": {"Small": 0.5, "Medium": 1, "Large": 3, "XL": 8},
+    "Real-time Inference": {"Small": 0, "Medium": 0, "Large": 0, "XL": 0}  # Real-time is measured differently
+}
+
+# Job time multipliers by dataset size; both the heuristics labels and the
+# older estimate labels are accepted
+DATASET_MULTIPLIERS = {
+    "Small (<1GB)": 0.5,
+    "Medium (1GB-10GB)": 1.0,
+    "Large (10GB-100GB)": 2.0,
+    "Large (100GB-1TB)": 2.0,
+    "Very Large (>100GB)": 4.0,
+    "Very Large (>1TB)": 4.0
+}
+
+PARALLELIZATION_EFFICIENCY = 0.7  # Diminishing returns with more GPUs
+
+# Largest GPU count the advisor sizes a job to (eight 8-GPU nodes); jobs
+# spanning nodes are timed by the topology model
+MAX_GPU_COUNT = 64
+
+# Largest GPU count the advisor sizes a real-time deployment to; serving
+# replicas run independently, so they are not bound by the job topology
+MAX_SERVING_GPU_COUNT = 1024
+
+def estimate_hours(task_type, model_size, dataset_size, performance_factor, gpu_count, time_model=None):
+    """
+    Estimate the wall time of a job in hours
+    
+    ``performance_factor`` and ``gpu_count`` may be NumPy arrays, in which
+    case an array of estimates is returned for all candidates at once.
+    
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        dataset_size: Size of dataset
+        performance_factor: Relative performance of the GPU type
+        gpu_count: Number of GPUs
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+        
+    Returns:
+        float or array: Estimated hours
+    """
+    # Adjust for GPU performance and count (diminishing returns with more GPUs)
+    gpu_perf_factor = performance_factor * parallel_speedup(gpu_count, time_model)
+    
+    return workload_hours(task_type, model_size, dataset_size, time_model) / gpu_perf_factor
+
+def workload_hours(task_type, model_size, dataset_size, time_model=None):
+    """
+    Get the job duration on a single reference GPU
+    
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        dataset_size: Size of dataset
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+        
+    Returns:
+        float: Hours on one GPU with relative_performance 1.0
+    """
+    base_hours = time_model["base_hours"] if time_model else BASE_HOURS
+    return base_hours[task_type][model_size] * DATASET_MULTIPLIERS[dataset_size]
+
+def parallel_speedup(gpu_count, time_model=None):
+    """
+    Get the speedup of ``gpu_count`` GPUs over a single GPU
+    
+    Every GPU after the first adds PARALLELIZATION_EFFICIENCY of a GPU.
+    
+    Args:
+        gpu_count: Number of GPUs (int or NumPy array)
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+        
+    Returns:
+        float or array: Aggregate speedup
+    """
+    return 1 + (gpu_count - 1) * parallelization_efficiency(time_model)
+
+def parallelization_efficiency(time_model=None):
+    """
+    Get the fraction of a GPU that each additional GPU contributes
+    
+    Args:
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+        
+    Returns:
+        float: Parallelization efficiency
+    """
+    return time_model["parallelization_efficiency"] if time_model else PARALLELIZATION_EFFICIENCY
+
+def min_gpus_for_speedup(required_speedup, time_model=None):
+    """
+    Invert parallel_speedup: the smallest GPU count reaching a speedup
+    
+    Args:
+        required_speedup: Speedup over a single GPU
+        time_model: Calibrated overrides from the catalog's "time_model" (if any)
+        
+    Returns:
+        int: Minimum GPU count (at least 1)
+    """
+    if required_speedup <= 1:
+        return 1
+    return math.ceil(1 + (required_speedup - 1) / parallelization_efficiency(time_model))
+
+def format_hours(estimated_hours):
+    """
+    Format an hour estimate the way recommendations display it
+    
+    Args:
+        estimated_hours: Estimated hours
+        
+    Returns:
+        str: Time estimate string (e.g., "30 minutes" or "2.5 hours")
+    """
+    if estimated_hours < 1:
+        return f"{int(estimated_hours * 60)} minutes"
+    return f"{estimated_hours:.1f} hours"
@@ -0,0 +1,193 @@
+import math
+from .catalog import catalog_version
+from .flops import DEFAULT_PRECISION, sustained_tflops
+from .time_model import estimate_hours, parallel_speedup
+from .utils import estimate_memory_requirement, parse_vram_gb
+
+# Interconnect assumed for instance types without a "topology" entry
+DEFAULT_TOPOLOGY = {
+    "gpus_per_node": 8,
+    "intra_node_gb_per_s": 32,
+    "inter_node_gb_per_s": 12.5
+}
+
+# Tokens each GPU processes per optimizer step, which sets how much compute
+# a gradient all-reduce is amortized over
+TOKENS_PER_GPU_STEP = 16384
+
+# Micro-batches per step when the model is pipelined across nodes
+PIPELINE_MICROBATCHES = 8
+
+# Hidden size assumed per model size bucket, for tensor-parallel traffic
+HIDDEN_SIZES = {"Small": 1024, "Medium": 2048, "Large": 5120, "XL": 8192}
+
+# Bytes per gradient or activation element (bf16)
+BYTES_PER_ELEMENT = 2
+
+# Number of layouts cached before the cache is cleared
+MAX_CACHED_LAYOUTS = 4096
+
+_layouts = {}
+
+def instance_topology(instance):
+    """
+    Get the node size and interconnect bandwidth of an instance type
+
+    Args:
+        instance: Instance type entry from the catalog
+
+    Returns:
+        dict: "gpus_per_node", "intra_node_gb_per_s" and "inter_node_gb_per_s"
+    """
+    return instance.get("topology", DEFAULT_TOPOLOGY)
+
+def parallel_layout(task_type, model_size, gpu_type, gpu_count, instance_type, resources, memory_factor=1.0):
+    """
+    Lay a job out as data-, tensor- and pipeline-parallel groups
+
+    The model is split over the fewest GPUs whose combined VRAM holds it:
+    tensor parallelism within a node (rounded up to a power of two), and
+    pipeline stages across nodes once a node is not enough. The remaining
+    factor of the GPU count is data parallelism.
+
+    A single node keeps the time model's parallelization efficiency, which
+    already reflects intra-node traffic; the tensor-parallel overhead over
+    the intra-node links is reported but not added on top. Across nodes
+    each node runs at that efficiency, the gradient all-reduce crosses the
+    inter-node network and pipelined models lose a bubble per step.
+    ``time_factor`` is the resulting slowdown relative to the time model.
+
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        gpu_type: GPU type
+        gpu_count: Number of GPUs
+        instance_type: Instance type
+        resources: Resource configuration data
+        memory_factor: Scale of the model's memory footprint from training
+            techniques (see techniques.technique_factors)
+
+    Returns:
+        dict: Parallelism layout with communication overheads and
+            "time_factor"
+    """
+    key = (catalog_version(resources), task_type, model_size, gpu_type, gpu_count, instance_type, memory_factor)
+    layout = _layouts.get(key)
+    if layout is None:
+        layout = _compute_layout(task_type, model_size, gpu_type, gpu_count, instance_type, resources, memory_factor)
+        if len(_layouts) >= MAX_CACHED_LAYOUTS:
+            _layouts.clear()
+        _layouts[key] = layout
+    return dict(layout)
+
+def _compute_layout(task_type, model_size, gpu_type, gpu_count, instance_type, resources, memory_factor=1.0):
+    """
+    Compute a parallelism layout (see parallel_layout)
+
+    Args:
+        task_type: Type of task
+        model_size: Size of model
+        gpu_type: GPU type
+        gpu_count: Number of GPUs
+        instance_type: Instance type
+        resources: Resource configuration data
+        memory_factor: Scale of the model's memory footprint
+
+    Returns:
+        dict: Parallelism layout
+    """
+    topology = instance_topology(resources["instance_types"][instance_type])
+    gpus_per_node = topology["gpus_per_node"]
+    gpu = resources["gpu_types"][gpu_type]
+
+    memory_gb = estimate_memory_requirement(model_size, task_type) * memory_factor
+    gpus_to_fit = math.ceil(memory_gb / parse_vram_gb(gpu["vram"]))
+    if gpus_to_fit <= gpus_per_node:
+        tensor_parallel = min(1 << max(gpus_to_fit - 1, 0).bit_length(), gpus_per_node, gpu_count)
+        pipeline_parallel = 1
+    else:
+        tensor_parallel = gpus_per_node
+        pipeline_parallel = math.ceil(gpus_to_fit / gpus_per_node)
+
+    model_parallel = tensor_parallel * pipeline_parallel
+    nodes = math.ceil(gpu_count / gpus_per_node)
+    data_parallel = max(1, gpu_count // model_parallel)
+
+    layout = {
+        "nodes": nodes,
+        "gpus_per_node": gpus_per_node,
+        "data_parallel": data_parallel,
+        "tensor_parallel": tensor_parallel,
+        "pipeline_parallel": pipeline_parallel,
+        "tensor_parallel_overhead": 0.0,
+        "all_reduce_overhead": 0.0,
+        "pipeline_bubble": 0.0,
+        "time_factor": 1.0
+    }
+
+    # Traffic and compute both scale with the model, which cancels out of
+    # the communication-to-compute ratios below
+    flops_per_second = sustained_tflops(gpu, DEFAULT_PRECISION, task_type, resources) * 1e12
+    passes = 3 if task_type in ["Training", "Fine-tuning"] else 1
+
+    if tensor_parallel > 1:
+        # Two all-reduces of the activations per layer per pass, against
+        # 24 * d^2 FLOPs per token per layer per pass
+        hidden_size = HIDDEN_SIZES[model_size]
+        traffic = 2 * 2 * (tensor_parallel - 1) / tensor_parallel * hidden_size * BYTES_PER_ELEMENT
+        compute = 24 * hidden_size ** 2 / tensor_parallel / flops_per_second
+        layout["tensor_parallel_overhead"] = traffic / (topology["intra_node_gb_per_s"] * 1e9) / compute
+
+    if nodes == 1 and pipeline_parallel == 1:
+        return layout
+
+    nodes_per_replica = math.ceil(model_parallel / gpus_per_node)
+    replica_nodes = max(1, nodes // nodes_per_replica)
+    if passes == 3 and replica_nodes > 1:
+        # Hierarchical ring all-reduce: each node exchanges one replica's
+        # gradients (or its share of one) over its network link, against
+        # 2 * passes * N FLOPs per token for TOKENS_PER_GPU_STEP tokens
+        gradient_share = min(gpus_per_node, model_parallel) / model_parallel
+        traffic = 2 * (replica_nodes - 1) / replica_nodes * BYTES_PER_ELEMENT * gradient_share
+        compute = 2 * passes * TOKENS_PER_GPU_STEP / flops_per_second
+        layout["all_reduce_overhead"] = traffic / (topology["inter_node_gb_per_s"] * 1e9) / compute
+
+    if pipeline_parallel > 1:
+        layout["pipeline_bubble"] = (pipeline_parallel - 1) / PIPELINE_MICROBATCHES
+
+    time_model = resources.get("time_model")
+    cluster_speedup = (
+        parallel_speedup(min(gpu_count, gpus_per_node), time_model) * gpu_count / min(gpu_count, gpus_per_node)
+        / ((1 + layout["all_reduce_overhead"]) * (1 + layout["pipeline_bubble"]))
+    )
+    layout["time_factor"] = parallel_speedup(gpu_count, time_model) / cluster_speedup
+
+    return layout
+
+def estimate_cluster_hours(task_type, model_size, dataset_size, gpu_type, gpu_count, instance_type, resources,
+                           memory_factor=1.0):
+    """
+    Estimate job hours including multi-node communication
+
+    Args:
+        task_type: Type of task (not Real-time Inference)
+        model_size: Size of model
+        dataset_size: Size of dataset
+        gpu_type: GPU type
+        gpu_count: Number of GPUs
+        instance_type: Instance type
+        resources: Resource configuration data
+        memory_factor: Scale of the model's memory footprint from training
+            techniques
+
+    Returns:
+        tuple: (estimated hours, parallelism layout)
+    """
+    layout = parallel_layout(task_type, model_size, gpu_type, gpu_count, instance_type, resources, memory_factor)
+    hours = estimate_hours(
+        task_type, model_size, dataset_size,
+        resources["gpu_types"][gpu_type]["relative_performance"],
+        gpu_count,
+        resources.get("time_model")
+    )
+    return hours * layout["time_factor"], layout
@@ -27,7 +27,7 @@ def calculate_total_cost(hourly_cost, time_estimate, return_numeric=False):
     Returns:
         float or str: Total cost
     """
-    if "Real-time" in time_estimate or "ms" in time_estimate:
+    if is_realtime_estimate(time_estimate):
         if return_numeric:
             return hourly_cost * 24  # Assume 24 hours for demonstration
         return f"{hourly_cost * 24} (daily)"
@@ -58,7 +58,7 @@ def get_alt_time_estimate(recommendation, alternative):
     Returns:
         str: Time estimate string
     """
-    if "Real-time" in recommendation["estimated_time"]:
+    if is_realtime_estimate(recommendation["estimated_time"]):
         return "Low latency (ms)"
     
     # If alternative is budget option, estimate 30% slower
@@ -127,4 +127,28 @@ def format_price(price):
     Returns:
         str: Formatted price string
     """
-    return f"${price:.2f}"
\ No newline at end of file
+    return f"${price:.2f}"
+
+def is_realtime_estimate(time_estimate):
+    """
+    Check whether a time estimate describes a real-time (latency) workload
+    
+    Args:
+        time_estimate: Time estimate string (e.g., "Low latency (ms)" or "p95 latency 120 ms")
+        
+    Returns:
+        bool: True for real-time estimates
+    """
+    return "Real-time" in time_estimate or "ms" in time_estimate
+
+def parse_vram_gb(vram):
+    """
+    Parse a VRAM description into gigabytes
+    
+    Args:
+        vram: VRAM string (e.g., "24 GB" or "40/80 GB"); the largest variant is used
+        
+    Returns:
+        int: VRAM in GB
+    """
+    return max(int(size) for size in vram.split(" ")[0].split("/"))
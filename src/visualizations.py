@@ -1,23 +1,28 @@
-import plotly.express as px
-import plotly.graph_objects as go
-from .utils import hex_to_rgba
+from .utils import hex_to_rgba, is_realtime_estimate
+from .instrumentation import timed
 
-def create_cost_time_comparison(recommendation, alternatives):
+# Pixel diameter of the largest bubble in the cost vs. time chart
+COST_TIME_SIZE_MAX = 40
+
+# Performance dimensions compared in the radar chart
+PERFORMANCE_DIMENSIONS = ["Compute Power", "Cost Efficiency", "Reliability", "Scalability", "Memory"]
+
+def cost_time_rows(recommendation, alternatives):
     """
-    Create a cost vs. time comparison chart
+    Build the data points of the cost vs. time comparison chart
     
     Args:
         recommendation: Primary recommendation dictionary
         alternatives: List of alternative configurations
         
     Returns:
-        Plotly figure object or None if no valid data
+        list: One dict per configuration (empty for real-time inference)
     """
     # Create comparison data
     data = []
     
     # Add primary recommendation
-    if "Real-time" not in recommendation["estimated_time"]:
+    if not is_realtime_estimate(recommendation["estimated_time"]):
         # Convert estimated time to hours
         time_str = recommendation["estimated_time"]
         if "minutes" in time_str:
@@ -29,13 +34,14 @@ def create_cost_time_comparison(recommendation, alternatives):
             "Configuration": "Recommended",
             "Hourly Cost ($)": recommendation["estimated_cost"],
             "Estimated Time (hours)": time_hours,
-            "Total Cost ($)": round(recommendation["estimated_cost"] * time_hours, 2),
+            # Includes storage and I/O when the engine priced them
+            "Total Cost ($)": recommendation.get("estimated_total_cost", round(recommendation["estimated_cost"] * time_hours, 2)),
             "Description": "Primary Recommendation"
         })
     
     # Add alternatives (if they have time estimates)
     for alt in alternatives:
-        if "name" in alt and "Real-time" not in alt.get("estimated_time", ""):
+        if "name" in alt and not is_realtime_estimate(recommendation["estimated_time"]):
             # Estimate time - assume 30% slower for budget, 30% faster for performance
             if alt["name"] == "Budget Option":
                 if "minutes" in recommendation["estimated_time"]:
@@ -64,11 +70,29 @@ def create_cost_time_comparison(recommendation, alternatives):
                 "Description": alt["description"]
             })
     
+    return data
+
+@timed("create_cost_time_comparison")
+def create_cost_time_comparison(recommendation, alternatives):
+    """
+    Create a cost vs. time comparison chart
+    
+    Args:
+        recommendation: Primary recommendation dictionary
+        alternatives: List of alternative configurations
+        
+    Returns:
+        Plotly figure object or None if no valid data
+    """
+    data = cost_time_rows(recommendation, alternatives)
+    
     if not data:  # If no valid data (e.g., real-time inference only)
         return None
     
-    # Create dataframe
+    # Create dataframe (plotly and pandas are imported lazily to keep the
+    # engine importable without UI libraries)
     import pandas as pd
+    import plotly.express as px
     df = pd.DataFrame(data)
     
     # Create figure
@@ -78,7 +102,7 @@ def create_cost_time_comparison(recommendation, alternatives):
         y="Hourly Cost ($)",
         size="Total Cost ($)",
         color="Configuration",
-        size_max=40,
+        size_max=COST_TIME_SIZE_MAX,
         text="Configuration",
         title="Cost vs. Time Comparison",
         color_discrete_sequence=["#6200ea", "#ff9800", "#00bcd4"]
@@ -138,16 +162,16 @@ def create_cost_time_comparison(recommendation, alternatives):
     
     return fig
 
-def create_resource_comparison_chart(recommendation, alternatives):
+def resource_rows(recommendation, alternatives):
     """
-    Create a bar chart comparing resources across configurations
+    Build the bars of the resource comparison chart
     
     Args:
         recommendation: Primary recommendation dictionary
         alternatives: List of alternative configurations
         
     Returns:
-        Plotly figure object
+        list: One dict per configuration
     """
     # Create comparison data
     data = []
@@ -174,8 +198,25 @@ def create_resource_comparison_chart(recommendation, alternatives):
                 "Color": "#ff9800" if alt["name"] == "Budget Option" else "#00bcd4"
             })
     
+    return data
+
+@timed("create_resource_comparison_chart")
+def create_resource_comparison_chart(recommendation, alternatives):
+    """
+    Create a bar chart comparing resources across configurations
+    
+    Args:
+        recommendation: Primary recommendation dictionary
+        alternatives: List of alternative configurations
+        
+    Returns:
+        Plotly figure object
+    """
+    data = resource_rows(recommendation, alternatives)
+    
     # Create dataframe
     import pandas as pd
+    import plotly.graph_objects as go
     df = pd.DataFrame(data)
     
     # Create grouped bar chart for resources
@@ -275,9 +316,9 @@ def create_resource_comparison_chart(recommendation, alternatives):
     
     return fig
 
-def create_performance_radar_chart(recommendation, alternatives, resources):
+def performance_rows(recommendation, alternatives, resources):
     """
-    Create a radar chart comparing performance dimensions
+    Build the polygons of the performance radar chart
     
     Args:
         recommendation: Primary recommendation dictionary
@@ -285,10 +326,9 @@ def create_performance_radar_chart(recommendation, alternatives, resources):
         resources: Resource configurations
         
     Returns:
-        Plotly figure object
+        list: One dict per configuration with closed score polygons
     """
-    # Performance dimensions to compare
-    dimensions = ["Compute Power", "Cost Efficiency", "Reliability", "Scalability", "Memory"]
+    dimensions = PERFORMANCE_DIMENSIONS
     
     # Create comparison data
     data = []
@@ -319,7 +359,26 @@ def create_performance_radar_chart(recommendation, alternatives, resources):
                 "Color": "#ff9800" if alt["name"] == "Budget Option" else "#00bcd4"
             })
     
+    return data
+
+@timed("create_performance_radar_chart")
+def create_performance_radar_chart(recommendation, alternatives, resources):
+    """
+    Create a radar chart comparing performance dimensions
+    
+    Args:
+        recommendation: Primary recommendation dictionary
+        alternatives: List of alternative configurations
+        resources: Resource configurations
+        
+    Returns:
+        Plotly figure object
+    """
+    dimensions = PERFORMANCE_DIMENSIONS
+    data = performance_rows(recommendation, alternatives, resources)
+    
     # Create the radar chart
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     # Add a trace for each configuration
@@ -429,4 +488,88 @@ def calculate_performance_scores(config, resources):
     }
     scores["Memory"] = min(10, gpu_memory[config["gpu_type"]] * 10)
     
-    return scores
\ No newline at end of file
+    return scores
+
+@timed("create_sensitivity_chart")
+def create_sensitivity_chart(sweep):
+    """
+    Create a step chart of total cost across a budget or deadline sweep
+    
+    Args:
+        sweep: Result of sweep_budget or sweep_deadline
+        
+    Returns:
+        Plotly figure object
+    """
+    segments = sweep["segments"]
+    parameter_labels = {
+        "budget_limit": "Hourly Budget ($)",
+        "deadline": "Deadline (hours)"
+    }
+    
+    # Repeat the last value at the end of the range so the final step is drawn
+    x = [segment["start"] for segment in segments] + [segments[-1]["end"]]
+    y = [segment["total_cost"] for segment in segments] + [segments[-1]["total_cost"]]
+    labels = [
+        f"{segment['gpu_count']}x {segment['gpu_type']} ({segment['instance_type']})"
+        for segment in segments
+    ]
+    labels.append(labels[-1])
+    
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y,
+        mode="lines+markers",
+        line=dict(color="#6200ea", width=3, shape="hv"),
+        marker=dict(color="#ff9800", size=8),
+        text=labels,
+        hovertemplate="%{text}<br>Total Cost: $%{y}<extra></extra>",
+        name="Total Cost"
+    ))
+    
+    # Mark every point where the recommended configuration changes
+    for breakpoint in sweep["breakpoints"]:
+        fig.add_vline(
+            x=breakpoint,
+            line=dict(color="#00bcd4", width=1, dash="dot")
+        )
+    
+    fig.update_layout(
+        title="Recommendation Sensitivity",
+        title_font=dict(
+            family="VT323, monospace",
+            size=24,
+            color="#6200ea"
+        ),
+        font=dict(
+            family="Roboto Mono, monospace",
+            color="#0a0a20"
+        ),
+        showlegend=False,
+        plot_bgcolor="#f5f0ff",
+        paper_bgcolor="#f5f0ff",
+        xaxis=dict(
+            title=parameter_labels.get(sweep["parameter"], sweep["parameter"]),
+            type="log",
+            title_font_family="Roboto Mono, monospace",
+            title_font_color="#0a0a20",
+            tickfont_family="Roboto Mono, monospace",
+            tickfont_color="#0a0a20",
+            gridcolor="#e0aaff",
+            gridwidth=0.5,
+        ),
+        yaxis=dict(
+            title="Total Cost ($)",
+            title_font_family="Roboto Mono, monospace",
+            title_font_color="#0a0a20",
+            tickfont_family="Roboto Mono, monospace",
+            tickfont_color="#0a0a20",
+            gridcolor="#e0aaff",
+            gridwidth=0.5,
+        ),
+    )
+    
+    return fig
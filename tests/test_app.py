@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+from streamlit.testing.v1 import AppTest
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+class TestApp(unittest.TestCase):
+
+    def setUp(self):
+        """Run the app once with default inputs"""
+        self.app = AppTest.from_file(APP_PATH, default_timeout=30).run()
+
+    def test_renders_recommendation_and_chart(self):
+        """Test that the default page renders without errors"""
+        self.assertFalse(self.app.exception)
+        self.assertEqual(len(self.app.get("plotly_chart")), 1)
+        self.assertTrue(all(caption.value.startswith("Server time:") for caption in self.app.caption))
+
+    def test_chart_switch(self):
+        """Test that switching charts renders the selected chart"""
+        self.app.button_group(key="chart").set_value("Sensitivity").run()
+
+        self.assertFalse(self.app.exception)
+        self.assertEqual(len(self.app.get("plotly_chart")), 1)
+
+    def test_dataset_sizes_match_heuristics(self):
+        """Test that only dataset sizes with heuristic adjustments are offered"""
+        from src.advisor_engine import load_heuristics
+
+        options = self.app.selectbox(key="dataset_size").options
+        self.assertEqual(sorted(options), sorted(load_heuristics()["dataset_size_adjustments"]))
+
+    def test_id_hashes_engine_input(self):
+        """Test that the shown ID hashes the full input, framework included"""
+        from src.advisor_engine import load_pricing, load_resource_configs
+        from src.recommendation_ids import recommendation_id
+
+        self.app.selectbox(key="framework").set_value("JAX").run()
+        input_data = {
+            "task_type": self.app.selectbox(key="task_type").value,
+            "model_size": self.app.selectbox(key="model_size").value,
+            "dataset_size": self.app.selectbox(key="dataset_size").value,
+            "framework": "JAX",
+            "priority": self.app.radio(key="priority").value,
+            "budget_limit": None,
+            "deadline": None
+        }
+        identifier = recommendation_id(input_data, load_resource_configs(), load_pricing())
+        self.assertTrue(any(identifier in markdown.value for markdown in self.app.markdown))
+
+    def test_normalized_inputs_share_cache_entries(self):
+        """Test that display-only and unset inputs do not change the cache key"""
+        from app import normalize_inputs
+
+        base = {"task_type": "Training", "model_size": "Small", "budget_limit": 0.0, "deadline": None, "framework": "JAX"}
+        other = dict(base, framework="PyTorch", budget_limit=None)
+
+        self.assertEqual(normalize_inputs(base), normalize_inputs(other))
+        self.assertNotEqual(normalize_inputs(base), normalize_inputs(dict(base, budget_limit=10.0)))
+
+if __name__ == "__main__":
+    unittest.main()
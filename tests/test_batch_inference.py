@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_heuristics, load_pricing, load_resource_configs
+from src.batch_inference import batch_throughput, plan_batch_inference
+
+class TestBatchInference(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.heuristics = load_heuristics()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Batch Inference",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None,
+            "item_count": 200000
+        }
+
+    def test_throughput(self):
+        """Test the roofline throughput of every GPU type and batch size"""
+        throughput = batch_throughput("Medium", 256, 512, "fp16", self.resources, self.heuristics)
+        items_per_second = throughput["items_per_second"]
+
+        self.assertEqual(items_per_second.shape, (len(self.resources["gpu_types"]), len(self.heuristics["batch_inference"]["batch_sizes"])))
+        self.assertEqual(list(throughput["gpus_per_replica"]), [1, 1, 1, 1])
+
+        # Batches beyond the free VRAM are infeasible, smaller ones amortize weight reads
+        a10g = list(throughput["gpu_types"]).index("NVIDIA A10G")
+        max_batch = throughput["max_batch_size"][a10g]
+        fits = throughput["batch_sizes"] <= max_batch
+        self.assertTrue(np.isnan(items_per_second[a10g, ~fits]).all())
+        self.assertTrue((np.diff(items_per_second[a10g, fits]) > 0).all())
+        self.assertTrue(throughput["memory_bound"][a10g, 0])
+
+        # One cell by hand: batch 1 on an A10G is bound by reading 14 GB of weights
+        rules = self.heuristics["batch_inference"]
+        flops = 125e12 * self.resources["mfu"]["Batch Inference"]
+        step = (14 + 0.5 * (512 + 128) / 1000) * 1e9 / (600e9 * rules["memory_bandwidth_efficiency"])
+        batch_seconds = 2 * 7e9 * 512 / flops + 256 * step
+        self.assertAlmostEqual(items_per_second[a10g, 0], 1 / batch_seconds)
+
+        # Quantized weights leave room for larger batches
+        int4 = batch_throughput("Medium", 256, 512, "int4", self.resources, self.heuristics)
+        self.assertGreater(int4["max_batch_size"][a10g], max_batch)
+
+        with self.assertRaises(ValueError):
+            batch_throughput("Medium", 256, 512, "int3", self.resources, self.heuristics)
+
+    def test_plan(self):
+        """Test that plans trade cost per item against time within constraints"""
+        args = ("Large", 200000, 256, 512, "int8")
+        kwargs = {"resources": self.resources, "heuristics": self.heuristics}
+
+        cheapest = plan_batch_inference(*args, **kwargs)
+        fastest = plan_batch_inference(*args, priority="Minimize Time", **kwargs)
+        self.assertTrue(cheapest["feasible"])
+        self.assertEqual(cheapest["replicas"], 1)
+        self.assertLess(fastest["job_hours"], cheapest["job_hours"])
+        self.assertGreaterEqual(fastest["cost_per_million_items"], cheapest["cost_per_million_items"])
+        self.assertAlmostEqual(cheapest["cost_per_million_items"], cheapest["total_cost"] / 200000 * 1e6)
+
+        deadline = plan_batch_inference(*args, deadline_hours=4, **kwargs)
+        self.assertLessEqual(deadline["job_hours"], 4)
+        self.assertGreater(deadline["gpu_count"], cheapest["gpu_count"])
+
+        budget = plan_batch_inference(*args, budget_limit=2.0, **kwargs)
+        self.assertLessEqual(budget["hourly_cost"], 2.0)
+
+        fixed = plan_batch_inference(*args, batch_size=8, **kwargs)
+        self.assertEqual(fixed["batch_size"], 8)
+
+        missed = plan_batch_inference(*args, deadline_hours=0.01, **kwargs)
+        self.assertFalse(missed["feasible"])
+        self.assertAlmostEqual(missed["fastest_hours"], fastest["job_hours"])
+
+    def test_engine(self):
+        """Test that the engine sizes batch inference from the plan"""
+        recommendation = generate_recommendation(dict(self.test_input, deadline=4), self.resources, self.pricing)
+        plan = recommendation["batch_plan"]
+
+        self.assertEqual((recommendation["gpu_type"], recommendation["gpu_count"]), (plan["gpu_type"], plan["gpu_count"]))
+        self.assertEqual(recommendation["estimated_cost"], round(plan["hourly_cost"], 2))
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+        self.assertTrue(any("Batch Plan" in line for line in recommendation["justification"]))
+
+        # A deadline no plan meets falls back to the fastest plan
+        missed = generate_recommendation(dict(self.test_input, deadline=0.01), self.resources, self.pricing)
+        self.assertFalse(missed["deadline_check"]["meets_deadline"])
+        self.assertAlmostEqual(missed["batch_plan"]["job_hours"], missed["deadline_check"]["fastest_hours"])
+
+        # Without an item count the size buckets still apply
+        self.assertNotIn("batch_plan", generate_recommendation(dict(self.test_input, item_count=None), self.resources, self.pricing))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.calibration import JOB_FIELDS, calibrate, fit_time_model, load_job_log, write_catalog
+from src.time_model import DATASET_MULTIPLIERS, estimate_hours
+
+class TestCalibration(unittest.TestCase):
+
+    def setUp(self):
+        """Generate a job log from a known time model with 10% noise"""
+        self.resources = load_resource_configs()
+        self.true_performance = {
+            "NVIDIA T4": 1.0,
+            "NVIDIA A10G": 2.0,
+            "NVIDIA A100": 6.0,
+            "NVIDIA H100": 11.0
+        }
+        self.true_base_hours = {
+            "Training": {"Small": 5, "Medium": 15, "Large": 60, "XL": 200},
+            "Fine-tuning": {"Small": 2, "Medium": 8, "Large": 25, "XL": 70}
+        }
+        self.true_efficiency = 0.55
+
+        rng = np.random.default_rng(42)
+        self.jobs = []
+        for _ in range(400):
+            task_type = rng.choice(list(self.true_base_hours))
+            model_size = rng.choice(list(self.true_base_hours[task_type]))
+            dataset_size = rng.choice(["Small (<1GB)", "Medium (1GB-10GB)", "Large (10GB-100GB)"])
+            gpu_type = rng.choice(list(self.true_performance))
+            gpu_count = int(rng.integers(1, 9))
+
+            hours = (
+                self.true_base_hours[task_type][model_size] * DATASET_MULTIPLIERS[dataset_size]
+                / (self.true_performance[gpu_type] * (1 + (gpu_count - 1) * self.true_efficiency))
+            )
+            self.jobs.append({
+                "task_type": str(task_type),
+                "model_size": str(model_size),
+                "dataset_size": str(dataset_size),
+                "gpu_type": str(gpu_type),
+                "gpu_count": gpu_count,
+                "instance_type": "flex-standard",
+                "actual_hours": float(hours * rng.lognormal(0, 0.1))
+            })
+
+    def test_fit_recovers_parameters(self):
+        """Test that the fit recovers the generating parameters"""
+        fit = fit_time_model(self.jobs, self.resources)
+
+        self.assertAlmostEqual(fit["parallelization_efficiency"], self.true_efficiency, delta=0.05)
+        # The reference GPU is pinned to its catalog value
+        self.assertEqual(fit["relative_performance"]["NVIDIA T4"], 1.0)
+        for gpu_type, performance in self.true_performance.items():
+            self.assertAlmostEqual(fit["relative_performance"][gpu_type], performance, delta=performance * 0.1)
+        self.assertAlmostEqual(fit["base_hours"]["Training"]["Large"], 60, delta=6)
+        # Workloads without observations keep their defaults
+        self.assertEqual(fit["base_hours"]["Batch Inference"]["Small"], 0.5)
+
+    def test_reference_gpu_missing_from_log(self):
+        """Test that the fit pins a logged GPU when the catalog's reference is absent"""
+        jobs = [job for job in self.jobs if job["gpu_type"] != "NVIDIA T4"]
+        fit = fit_time_model(jobs, self.resources)
+
+        # A10G is the logged GPU closest to 1.0 and keeps its catalog value
+        self.assertEqual(fit["relative_performance"]["NVIDIA A10G"], 2.5)
+        self.assertEqual(fit["relative_performance"]["NVIDIA T4"], 1.0)
+        for gpu_type in ("NVIDIA A100", "NVIDIA H100"):
+            ratio = fit["relative_performance"][gpu_type] / 2.5
+            expected = self.true_performance[gpu_type] / self.true_performance["NVIDIA A10G"]
+            self.assertAlmostEqual(ratio, expected, delta=expected * 0.1)
+
+        # Two GPU types that never ran a common workload cannot be compared
+        disconnected = [
+            job for job in jobs
+            if (job["gpu_type"], job["model_size"]) in (("NVIDIA A10G", "Small"), ("NVIDIA H100", "Large"))
+        ]
+        with self.assertRaisesRegex(ValueError, "cannot separate"):
+            fit_time_model(disconnected, self.resources)
+
+    def test_calibrated_catalog_improves_holdout_error(self):
+        """Test held-out reporting and that the engine uses the calibrated catalog"""
+        calibrated = calibrate(self.jobs, self.resources)
+        holdout = calibrated["calibration"]["holdout"]
+
+        self.assertEqual(holdout["calibrated"]["jobs"], 80)
+        self.assertLess(holdout["calibrated"]["mape"], 0.15)
+        self.assertLess(holdout["calibrated"]["mape"], holdout["baseline"]["mape"])
+        self.assertTrue(calibrated["version"].startswith("calibrated-"))
+        # The source catalog is left untouched
+        self.assertEqual(self.resources["gpu_types"]["NVIDIA H100"]["relative_performance"], 8.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calibrated.json")
+            write_catalog(calibrated, path)
+            loaded = load_resource_configs(path)
+
+        self.assertEqual(loaded["version"], calibrated["version"])
+
+        input_data = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+        recommendation = generate_recommendation(input_data, loaded)
+        gpu = loaded["gpu_types"][recommendation["gpu_type"]]
+        expected = estimate_hours(
+            "Training", "Large", "Medium (1GB-10GB)", gpu["relative_performance"],
+            recommendation["gpu_count"], loaded["time_model"]
+        )
+        self.assertEqual(recommendation["estimated_time"], f"{expected:.1f} hours")
+
+    def test_load_job_log(self):
+        """Test CSV and JSONL logs load identically and skip real-time jobs"""
+        realtime_job = dict(self.jobs[0], task_type="Real-time Inference")
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "jobs.csv")
+            with open(csv_path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=JOB_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.jobs[:5] + [realtime_job])
+
+            jsonl_path = os.path.join(directory, "jobs.jsonl")
+            with open(jsonl_path, "w") as f:
+                for job in self.jobs[:5] + [realtime_job]:
+                    f.write(json.dumps(job) + "\n")
+
+            self.assertEqual(load_job_log(csv_path), self.jobs[:5])
+            self.assertEqual(load_job_log(jsonl_path), self.jobs[:5])
+
+            bad_path = os.path.join(directory, "bad.jsonl")
+            with open(bad_path, "w") as f:
+                f.write(json.dumps({"task_type": "Training"}) + "\n")
+            with self.assertRaises(ValueError):
+                load_job_log(bad_path)
+
+if __name__ == "__main__":
+    unittest.main()
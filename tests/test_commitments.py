@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.commitments import HOURS_PER_YEAR, NO_COMMITMENT, demand_profile, job_hours, plan_commitments, resolve_schedule
+
+def recurring(gpu_type, gpu_count, hours, start=0, interval_hours=168):
+    """Build a schedule entry from a bare recommendation"""
+    return {
+        "recommendation": {"gpu_type": gpu_type, "gpu_count": gpu_count, "estimated_time": f"{hours} hours"},
+        "hours": hours,
+        "start_hour": start,
+        "interval_hours": interval_hours
+    }
+
+class TestCommitments(unittest.TestCase):
+
+    def setUp(self):
+        """Set up pricing"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.rates = self.pricing["gpu_pricing"]["NVIDIA A100"]
+
+    def test_demand_profile(self):
+        """Test fractional hours, GPU-hour totals and wrap-around"""
+        entries = resolve_schedule([recurring("NVIDIA A100", 8, 5.5, start=10.25)])
+        profile = demand_profile(entries)["NVIDIA A100"]
+
+        self.assertEqual(len(profile), HOURS_PER_YEAR)
+        self.assertEqual(profile[10], 8 * 0.75)
+        self.assertEqual(profile[11], 8)
+        self.assertAlmostEqual(profile.sum(), 8 * 5.5 * len(range(10, HOURS_PER_YEAR, 168)))
+
+        # A run that starts near the end of the year finishes at its start
+        entries = resolve_schedule([recurring("NVIDIA A100", 2, 20, start=HOURS_PER_YEAR - 10, interval_hours=HOURS_PER_YEAR)])
+        profile = demand_profile(entries)["NVIDIA A100"]
+        self.assertEqual(profile[:10].tolist(), [2.0] * 10)
+        self.assertEqual(profile.sum(), 40)
+
+    def test_always_on_demand_is_reserved(self):
+        """Test that a 24/7 workload is fully covered by reservations"""
+        plan = plan_commitments([recurring("NVIDIA A100", 8, 24, interval_hours=24)], pricing=self.pricing)
+        a100 = plan["gpu_types"]["NVIDIA A100"]
+
+        self.assertEqual(a100["term"], "reserved_3yr")
+        self.assertEqual(a100["reserved_gpus"], 8)
+        self.assertAlmostEqual(a100["utilization"], 1.0)
+        self.assertAlmostEqual(plan["savings"], 8 * HOURS_PER_YEAR * (self.rates["on_demand"] - self.rates["reserved_3yr"]))
+
+    def test_without_terms_everything_overflows(self):
+        """Test that plans without commitment terms run every GPU-hour as overflow"""
+        schedule = [recurring("NVIDIA A100", 8, 24, interval_hours=24)]
+        gpu_hours = 8 * HOURS_PER_YEAR
+        spot_rate = 0.5 * self.rates["on_demand"] + 0.5 * self.rates["spot"]
+
+        pricing = dict(self.pricing, gpu_pricing={
+            gpu_type: {name: rate for name, rate in rates.items() if not name.startswith("reserved_")}
+            for gpu_type, rates in self.pricing["gpu_pricing"].items()
+        })
+        for plan in (plan_commitments(schedule, pricing=pricing, spot_fraction=0.5),
+                     plan_commitments(schedule, pricing=self.pricing, spot_fraction=0.5, terms=())):
+            a100 = plan["gpu_types"]["NVIDIA A100"]
+            self.assertEqual(a100["term"], NO_COMMITMENT)
+            self.assertEqual(a100["reserved_gpus"], 0)
+            self.assertAlmostEqual(a100["total_cost"], gpu_hours * spot_rate)
+            self.assertAlmostEqual(plan["savings"], gpu_hours * (self.rates["on_demand"] - spot_rate))
+
+    def test_breakeven_matches_brute_force(self):
+        """Test the chosen reservation against every possible one"""
+        schedule = [
+            recurring("NVIDIA A100", 4, 100),
+            recurring("NVIDIA A100", 8, 30, start=40),
+            recurring("NVIDIA A100", 2, 6, start=3, interval_hours=24)
+        ]
+        profile = demand_profile(resolve_schedule(schedule))["NVIDIA A100"]
+
+        for terms in (("reserved_1yr",), ("reserved_3yr",)):
+            option = plan_commitments(schedule, pricing=self.pricing, terms=terms)["gpu_types"]["NVIDIA A100"]
+            rate = self.rates[terms[0]]
+            costs = [
+                reserved * HOURS_PER_YEAR * rate + np.maximum(profile - reserved, 0).sum() * self.rates["on_demand"]
+                for reserved in range(15)
+            ]
+            self.assertEqual(option["reserved_gpus"], int(np.argmin(costs)))
+            self.assertAlmostEqual(option["total_cost"], min(costs))
+            self.assertAlmostEqual(option["breakeven_utilization"], rate / self.rates["on_demand"])
+
+        # Spot overflow is cheaper than any commitment
+        plan = plan_commitments(schedule, pricing=self.pricing, spot_fraction=1.0)
+        self.assertEqual(plan["gpu_types"]["NVIDIA A100"]["reserved_gpus"], 0)
+        self.assertAlmostEqual(plan["total_cost"], profile.sum() * self.rates["spot"])
+
+    def test_schedule_from_inputs(self):
+        """Test that schedule entries with inputs use the advisor"""
+        workload = {
+            "task_type": "Fine-tuning",
+            "model_size": "Large",
+            "dataset_size": "Large (100GB-1TB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+        entry = resolve_schedule([{"input": workload, "weekday": 2, "start_hour": 6}], self.resources, self.pricing)[0]
+        recommendation = generate_recommendation(workload, self.resources, self.pricing)
+
+        self.assertEqual(entry["start"], 54)
+        self.assertEqual((entry["gpu_type"], entry["gpu_count"]), (recommendation["gpu_type"], recommendation["gpu_count"]))
+        self.assertEqual(entry["hours"], job_hours(recommendation))
+
+if __name__ == "__main__":
+    unittest.main()
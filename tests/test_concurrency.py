@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import copy
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+
+# Worker threads of the stress test
+THREADS = 64
+
+# Times every input is run concurrently
+REPETITIONS = 8
+
+class TestConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        """Build varied inputs that exercise every engine stage"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+
+        base = {
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "budget_limit": None,
+            "deadline": None
+        }
+        self.inputs = []
+        for task_type, model_size, priority in itertools.product(
+            ["Training", "Fine-tuning", "Batch Inference", "Real-time Inference"],
+            ["Small", "Medium", "XL"],
+            ["Minimize Cost", "Balanced", "Minimize Time"]
+        ):
+            self.inputs.append(dict(base, task_type=task_type, model_size=model_size, priority=priority))
+        self.inputs += [
+            dict(base, task_type="Training", model_size="Large", priority="Balanced", budget_limit=5.0),
+            dict(base, task_type="Training", model_size="XL", priority="Minimize Cost", deadline=12),
+            dict(base, task_type="Training", model_size="XL", priority="Minimize Time",
+                 constraints=["gpu_type != H100", "region in europe-west"]),
+            dict(base, task_type="Fine-tuning", model_size="Large", priority="Balanced", lora=True),
+            dict(base, task_type="Real-time Inference", model_size="Medium", priority="Balanced",
+                 request_rate=20, peak_request_rate=60, scale_out_seconds=10),
+            dict(base, task_type="Batch Inference", model_size="Small", priority="Minimize Cost", item_count=100000)
+        ]
+
+    def test_threads_match_serial(self):
+        """Test that concurrent recommendations equal serial ones and leave shared state alone"""
+        inputs = copy.deepcopy(self.inputs)
+        # Copies of the frozen catalog hold lists where it holds tuples
+        resources = json.dumps(self.resources, sort_keys=True)
+        serial = [generate_recommendation(input_data, self.resources, self.pricing) for input_data in self.inputs]
+
+        work = list(range(len(self.inputs))) * REPETITIONS
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            results = list(executor.map(
+                lambda index: generate_recommendation(self.inputs[index], self.resources, self.pricing), work
+            ))
+
+        for index, result in zip(work, results):
+            self.assertEqual(result, serial[index])
+        self.assertEqual(self.inputs, inputs)
+        self.assertEqual(json.dumps(self.resources, sort_keys=True), resources)
+
+    def test_results_are_independent(self):
+        """Test that changing a result does not change cached state or later results"""
+        input_data = self.inputs[0]
+        first = generate_recommendation(input_data, self.resources, self.pricing)
+        expected = copy.deepcopy(first)
+
+        first["gpu_count"] = 99
+        first["alternatives"][0]["gpu_type"] = "changed"
+        first["justification"].append("changed")
+
+        self.assertEqual(generate_recommendation(input_data, self.resources, self.pricing), expected)
+
+    def test_catalog_is_frozen(self):
+        """Test that the shared catalog rejects changes and copies are mutable"""
+        with self.assertRaises(TypeError):
+            self.resources["gpu_types"]["NVIDIA T4"]["hourly_cost"] = 0.0
+        with self.assertRaises(TypeError):
+            del self.resources["regions"]
+
+        resources = copy.deepcopy(self.resources)
+        resources["gpu_types"]["NVIDIA T4"]["hourly_cost"] = 0.0
+        self.assertNotEqual(resources, self.resources)
+
+if __name__ == "__main__":
+    unittest.main()
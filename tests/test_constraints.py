@@ -0,0 +1,155 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.constraints import allowed_gpu_types, allowed_regions, compile_constraints, parse_constraint
+
+class TestConstraints(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "XL",
+            "dataset_size": "Large (10GB-100GB)",
+            "priority": "Minimize Time",
+            "budget_limit": None,
+            "deadline": None
+        }
+
+    def test_parse(self):
+        """Test clause parsing and its errors"""
+        self.assertEqual(parse_constraint("gpu_count <= 4"), ("gpu_count", "<=", ["4"]))
+        self.assertEqual(parse_constraint("region not in us-east, us-west"), ("region", "not in", ["us-east", "us-west"]))
+        with self.assertRaisesRegex(ValueError, "Unknown constraint field"):
+            parse_constraint("vendor == NVIDIA")
+        with self.assertRaises(ValueError):
+            parse_constraint("no H100")
+        with self.assertRaisesRegex(ValueError, "Unknown gpu_type"):
+            compile_constraints(["gpu_type != B200"], self.resources)
+        with self.assertRaisesRegex(ValueError, "orders names"):
+            compile_constraints(["region < us-west"], self.resources)
+
+    def test_mask_is_product_of_axes(self):
+        """Test the compiled mask against each clause"""
+        compiled = compile_constraints(
+            ["gpu_type != H100", "region in europe-west", "gpu_count <= 4", "preemptible == false"], self.resources
+        )
+        self.assertIs(compile_constraints(
+            ["gpu_type != H100", "region in europe-west", "gpu_count <= 4", "preemptible == false"], self.resources
+        ), compiled)
+
+        mask = compiled["mask"]
+        self.assertEqual(mask.shape, (4, len(compiled["gpu_counts"]), 3, len(self.resources["regions"])))
+        self.assertEqual(allowed_gpu_types(compiled), ["NVIDIA T4", "NVIDIA A10G", "NVIDIA A100"])
+        self.assertEqual(allowed_regions(compiled, "NVIDIA A100", 4, "flex-standard"), ["europe-west"])
+        self.assertEqual(allowed_regions(compiled, "NVIDIA A100", 5, "flex-standard"), [])
+        self.assertEqual(allowed_regions(compiled, "NVIDIA A100", 4, "flex-economy"), [])
+        self.assertEqual(allowed_regions(compiled, "NVIDIA H100", 1, "flex-standard"), [])
+        self.assertEqual(int(mask.sum()), 3 * 4 * 2 * 1)
+
+    def test_recommendation_respects_constraints(self):
+        """Test that the engine and its alternatives stay within the constraints"""
+        constraints = ["gpu_type != H100", "region in europe-west", "gpu_count <= 4", "preemptible == false"]
+        unconstrained = generate_recommendation(self.test_input, self.resources, self.pricing)
+        self.assertEqual(unconstrained["gpu_type"], "NVIDIA H100")
+
+        recommendation = generate_recommendation(dict(self.test_input, constraints=constraints), self.resources, self.pricing)
+        compiled = compile_constraints(constraints, self.resources)
+        for option in [recommendation] + recommendation["alternatives"]:
+            self.assertIn(option["region"], allowed_regions(
+                compiled, option["gpu_type"], option["gpu_count"], option["instance_type"]
+            ))
+        self.assertTrue(recommendation["constraint_check"]["replaced"])
+        self.assertEqual(recommendation["placement"]["region"], "europe-west")
+        self.assertEqual(list(recommendation["placement"]["regions"]), ["europe-west"])
+
+        # Excluding the GPU type keeps the instance type
+        recommendation = generate_recommendation(
+            dict(self.test_input, priority="Balanced", constraints=["gpu_type != H100"]), self.resources, self.pricing
+        )
+        self.assertEqual(recommendation["instance_type"], generate_recommendation(
+            dict(self.test_input, priority="Balanced"), self.resources, self.pricing
+        )["instance_type"])
+        self.assertNotEqual(recommendation["gpu_type"], "NVIDIA H100")
+
+        with self.assertRaisesRegex(ValueError, "No configuration"):
+            generate_recommendation(dict(self.test_input, constraints=["gpu_count > 64"]), self.resources, self.pricing)
+
+    def test_planners_use_allowed_gpus(self):
+        """Test that capacity planning only considers allowed GPU types"""
+        realtime_input = dict(
+            self.test_input, task_type="Real-time Inference", model_size="Small", request_rate=50,
+            constraints=["gpu_type in A10G"]
+        )
+
+        recommendation = generate_recommendation(realtime_input, self.resources, self.pricing)
+
+        self.assertEqual(recommendation["capacity_plan"]["gpu_type"], "NVIDIA A10G")
+        self.assertEqual(recommendation["gpu_type"], "NVIDIA A10G")
+        self.assertEqual(recommendation["gpu_count"], recommendation["capacity_plan"]["gpu_count"])
+
+    def test_realtime_sized_within_counts(self):
+        """Test that real-time capacity is planned within count and preemption constraints"""
+        realtime_input = dict(self.test_input, task_type="Real-time Inference", model_size="Small", request_rate=200)
+        unconstrained = generate_recommendation(realtime_input, self.resources, self.pricing)
+
+        # A non-preemptible deployment keeps its plan
+        recommendation = generate_recommendation(
+            dict(realtime_input, constraints=["preemptible == false"]), self.resources, self.pricing
+        )
+        self.assertEqual(recommendation["capacity_plan"], unconstrained["capacity_plan"])
+        self.assertEqual(recommendation["gpu_count"], unconstrained["gpu_count"])
+
+        # Fewer GPUs serve lower traffic on faster GPU types
+        recommendation = generate_recommendation(
+            dict(realtime_input, request_rate=100, constraints=["gpu_count <= 4"]), self.resources, self.pricing
+        )
+        plan = recommendation["capacity_plan"]
+        self.assertTrue(plan["feasible"])
+        self.assertLessEqual(plan["gpu_count"], 4)
+        self.assertEqual((recommendation["gpu_type"], recommendation["gpu_count"]), (plan["gpu_type"], plan["gpu_count"]))
+
+        # Traffic that needs more GPUs than allowed is reported
+        recommendation = generate_recommendation(
+            dict(realtime_input, constraints=["gpu_count <= 4"]), self.resources, self.pricing
+        )
+        self.assertFalse(recommendation["capacity_plan"]["feasible"])
+        self.assertLessEqual(recommendation["gpu_count"], 4)
+        self.assertTrue(any("allow too few GPUs" in line for line in recommendation["justification"]))
+
+    def test_batch_sized_within_counts(self):
+        """Test that batch plans and their deadline check stay within count constraints"""
+        batch_input = dict(
+            self.test_input, task_type="Batch Inference", model_size="Small", item_count=5000000,
+            priority="Minimize Cost", deadline=1, constraints=["gpu_count <= 2"]
+        )
+
+        recommendation = generate_recommendation(batch_input, self.resources, self.pricing)
+        plan = recommendation["batch_plan"]
+
+        self.assertTrue(plan["feasible"])
+        self.assertLessEqual(plan["gpu_count"], 2)
+        self.assertEqual(recommendation["gpu_count"], plan["gpu_count"])
+        self.assertFalse(recommendation["deadline_check"]["meets_deadline"])
+        self.assertGreaterEqual(recommendation["deadline_check"]["estimated_hours"], plan["job_hours"])
+
+    def test_deadline_sized_within_counts(self):
+        """Test that the deadline solver only picks allowed GPU counts"""
+        training_input = dict(
+            self.test_input, priority="Minimize Cost", deadline=12, constraints=["gpu_count in 3, 6, 12"]
+        )
+
+        recommendation = generate_recommendation(training_input, self.resources, self.pricing)
+
+        self.assertIn(recommendation["gpu_count"], [3, 6, 12])
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+
+if __name__ == "__main__":
+    unittest.main()
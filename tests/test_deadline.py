@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import datetime
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.deadline import deadline_to_hours, solve_deadline
+from src.time_model import estimate_hours
+
+class TestDeadline(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Cost",
+            "budget_limit": None,
+            "deadline": None
+        }
+    
+    def test_deadline_to_hours(self):
+        """Test conversion of the supported deadline formats"""
+        now = datetime.datetime(2025, 1, 1, 12, 0)
+        
+        self.assertIsNone(deadline_to_hours(None))
+        self.assertEqual(deadline_to_hours(12), 12.0)
+        self.assertEqual(deadline_to_hours("6.5"), 6.5)
+        self.assertEqual(deadline_to_hours(datetime.timedelta(days=2)), 48.0)
+        self.assertEqual(deadline_to_hours(datetime.datetime(2025, 1, 2, 12, 0), now), 24.0)
+        # A date means the end of that day
+        self.assertEqual(deadline_to_hours(datetime.date(2025, 1, 1), now), 12.0)
+    
+    def test_solver_returns_minimal_gpu_count(self):
+        """Test that the solver picks the fewest GPUs that meet the deadline"""
+        solution = solve_deadline("Training", "Large", "Medium (1GB-10GB)", 3.0, self.resources)
+        
+        self.assertTrue(solution["feasible"])
+        for option in solution["options"]:
+            performance = self.resources["gpu_types"][option["gpu_type"]]["relative_performance"]
+            self.assertLessEqual(option["estimated_hours"], 3.0)
+            if option["gpu_count"] > 1:
+                self.assertGreater(
+                    estimate_hours("Training", "Large", "Medium (1GB-10GB)", performance, option["gpu_count"] - 1),
+                    3.0
+                )
+        
+        # The best option is the cheapest in total cost
+        self.assertEqual(
+            solution["best"]["total_cost"],
+            min(option["total_cost"] for option in solution["options"])
+        )
+    
+    def test_infeasible_deadline(self):
+        """Test that impossible deadlines are reported"""
+        solution = solve_deadline("Training", "XL", "Very Large (>1TB)", 0.5, self.resources)
+        
+        self.assertFalse(solution["feasible"])
+        self.assertIsNone(solution["best"])
+        self.assertGreater(solution["fastest_hours"], 0.5)
+    
+    def test_recommendation_meets_deadline(self):
+        """Test that the engine scales up to meet a tight deadline"""
+        relaxed = generate_recommendation(self.test_input)
+        tight = generate_recommendation(dict(self.test_input, deadline=1))
+        
+        self.assertTrue(tight["deadline_check"]["meets_deadline"])
+        self.assertTrue(tight["estimated_time"].endswith("minutes"))
+        self.assertGreater(tight["gpu_count"], relaxed["gpu_count"])
+        self.assertGreater(tight["estimated_cost"], relaxed["estimated_cost"])
+        
+        impossible = generate_recommendation(dict(self.test_input, deadline=0.1))
+        self.assertFalse(impossible["deadline_check"]["meets_deadline"])
+        self.assertTrue(impossible["justification"][-1].startswith("**Deadline Warning:**"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.fleet import advisor_policy, compare_policies, load_trace, simulate, uniform_inventory
+
+def fixed_policy(gpu_count, hours, hourly_cost=10.0, **fields):
+    """Build a policy that runs every job the same way"""
+    decision = dict(
+        {"gpu_type": "NVIDIA A100", "gpu_count": gpu_count, "region": "us-east", "hours": hours, "hourly_cost": hourly_cost},
+        **fields
+    )
+    return {"name": "fixed", "decide": lambda input_data: decision}
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an 8-GPU pool"""
+        self.inventory = {"us-east": {"NVIDIA A100": 8}}
+        self.workload = {
+            "task_type": "Fine-tuning",
+            "model_size": "Medium",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced"
+        }
+
+    def test_queueing(self):
+        """Test that a job waits until the pool frees up"""
+        trace = [dict(self.workload, submit_time=0.0), dict(self.workload, submit_time=1.0)]
+        result = simulate(trace, fixed_policy(8, 10.0), self.inventory)
+
+        self.assertEqual(result["completed"], 2)
+        self.assertEqual(result["mean_wait_hours"], 4.5)
+        self.assertEqual(result["makespan_hours"], 20.0)
+        self.assertEqual(result["total_cost"], 200.0)
+        self.assertEqual(result["utilization"]["us-east/NVIDIA A100"], 1.0)
+
+    def test_preemption(self):
+        """Test that a higher class preempts and the victim resumes"""
+        trace = [
+            dict(self.workload, submit_time=0.0),
+            dict(self.workload, submit_time=2.0, priority_class=1),
+            dict(self.workload, submit_time=3.0, priority_class=1, preemptible=False)
+        ]
+        result = simulate(trace, fixed_policy(8, 10.0), self.inventory)
+
+        # The second class-1 job cannot preempt its peer and queues ahead of the victim
+        self.assertEqual(result["preemptions"], 1)
+        self.assertEqual(result["makespan_hours"], 30.0)
+        self.assertEqual(result["total_cost"], 300.0)
+
+        # Jobs on non-preemptible instances keep running unless the trace says otherwise
+        on_demand = fixed_policy(8, 10.0, instance_type="flex-standard", preemptible=False)
+        self.assertEqual(simulate(trace[:2], on_demand, self.inventory)["preemptions"], 0)
+        trace[0]["preemptible"] = True
+        self.assertEqual(simulate(trace[:2], on_demand, self.inventory)["preemptions"], 1)
+
+        # Explicit durations override the policy estimate
+        result = simulate([dict(self.workload, submit_time=0.0, hours=2.5)], fixed_policy(8, 10.0), self.inventory)
+        self.assertEqual(result["makespan_hours"], 2.5)
+
+    def test_rejection(self):
+        """Test that jobs larger than their pool are rejected"""
+        result = simulate([dict(self.workload, submit_time=0.0)], fixed_policy(16, 1.0), self.inventory)
+
+        self.assertEqual((result["rejected"], result["completed"]), (1, 0))
+
+    def test_advisor_policies(self):
+        """Test that advisor decisions are cached per workload shape"""
+        resources = load_resource_configs()
+        pricing = load_pricing()
+        calls = []
+
+        def recommend(input_data, resources, pricing):
+            calls.append(input_data)
+            return generate_recommendation(input_data, resources, pricing)
+
+        trace = [
+            dict(self.workload, submit_time=float(hour), model_size=("Small", "Large")[hour % 2])
+            for hour in range(100)
+        ]
+        policies = [
+            advisor_policy("baseline", resources, pricing, recommend=recommend),
+            advisor_policy("cost-first", resources, pricing, adjust_input=lambda input_data: dict(input_data, priority="Minimize Cost"))
+        ]
+        results = compare_policies(trace, policies, uniform_inventory(resources, 64))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(results["baseline"]["completed"], 100)
+        self.assertLessEqual(results["cost-first"]["total_cost"], results["baseline"]["total_cost"])
+
+        expected = generate_recommendation(dict(trace[0], budget_limit=None, deadline=None), resources, pricing)
+        decision = policies[0]["decide"](self.workload | {"model_size": "Small"})
+        self.assertEqual((decision["gpu_type"], decision["region"]), (expected["gpu_type"], expected["region"]))
+        self.assertEqual(decision["instance_type"], expected["instance_type"])
+        self.assertEqual(decision["preemptible"], resources["instance_types"][expected["instance_type"]]["preemptible"])
+
+    def test_load_trace(self):
+        """Test that traces are loaded in submit order"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.jsonl")
+            with open(path, "w") as f:
+                for submit_time in (5.0, 1.0, 3.0):
+                    f.write(json.dumps(dict(self.workload, submit_time=submit_time)) + "\n")
+            self.assertEqual([record["submit_time"] for record in load_trace(path)], [1.0, 3.0, 5.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import compute_hours, generate_recommendation, load_resource_configs
+from src.startup import cold_start_hours
+from src.flops import estimate_flop_hours, estimate_flops, has_flop_inputs, sustained_tflops
+from src.sensitivity import candidate_flop_hours, enumerate_configurations
+
+class TestFlops(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a 7B-parameter training run on 100B tokens"""
+        self.resources = load_resource_configs()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Very Large (>100GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None,
+            "parameters": 7e9,
+            "training_tokens": 1e11,
+            "precision": "bf16"
+        }
+
+    def test_estimate_flops(self):
+        """Test the 6ND approximation and the attention term"""
+        self.assertEqual(estimate_flops("Training", 7e9, 1e11), 6 * 7e9 * 1e11)
+        self.assertEqual(estimate_flops("Batch Inference", 7e9, 1e11), 2 * 7e9 * 1e11)
+
+        with_attention = estimate_flops("Training", 7e9, 1e11, sequence_length=4096, num_layers=32, hidden_size=4096)
+        self.assertEqual(with_attention, (6 * 7e9 + 6 * 32 * 4096 * 4096) * 1e11)
+
+    def test_flop_hours(self):
+        """Test wall time against a hand computation"""
+        hours, flops = estimate_flop_hours(self.test_input, "NVIDIA A100", 1, self.resources)
+
+        self.assertEqual(flops, 4.2e21)
+        self.assertAlmostEqual(hours, 4.2e21 / (312e12 * 0.4) / 3600)
+
+        # Precisions without tensor-core support fall back to the FP32 rate
+        t4 = self.resources["gpu_types"]["NVIDIA T4"]
+        self.assertEqual(sustained_tflops(t4, "bf16", "Training", self.resources), 8.1 * 0.4)
+
+    def test_candidates_match_scalar_path(self):
+        """Test that the vectorized estimate matches the per-candidate one"""
+        space = enumerate_configurations(self.resources, max_gpu_count=8)
+        hours = candidate_flop_hours(self.test_input, space, self.resources)
+
+        for i in range(0, len(hours), 7):
+            gpu_type = space["gpu_types"][space["gpu_index"][i]]
+            expected, _ = estimate_flop_hours(self.test_input, gpu_type, int(space["gpu_count"][i]), self.resources)
+            self.assertAlmostEqual(hours[i], expected)
+
+        self.assertTrue(np.all(np.diff(hours[space["gpu_index"] == 0][::3]) < 0))
+
+    def test_recommendation_uses_flop_estimate(self):
+        """Test that numeric inputs switch calculate_estimates to FLOPs"""
+        recommendation = generate_recommendation(self.test_input, self.resources)
+        self.assertEqual(recommendation["estimated_flops"], 4.2e21)
+
+        expected, _ = estimate_flop_hours(
+            self.test_input, recommendation["gpu_type"], recommendation["gpu_count"], self.resources
+        )
+        self.assertEqual(recommendation["storage_plan"]["compute_hours"], expected)
+
+        bucket_input = {k: v for k, v in self.test_input.items() if k not in ("parameters", "training_tokens")}
+        self.assertFalse(has_flop_inputs(bucket_input))
+        self.assertNotIn("estimated_flops", generate_recommendation(bucket_input, self.resources))
+
+    def test_deadline_uses_flop_estimate(self):
+        """Test that deadlines are solved with the FLOP model that times the job"""
+        test_input = dict(self.test_input, training_tokens=2e10, deadline=48)
+        recommendation = generate_recommendation(test_input, self.resources)
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+
+        def flop_hours(gpu_count):
+            config = dict(recommendation, gpu_count=gpu_count)
+            hours, _, _ = compute_hours(config, "Training", "Large", test_input["dataset_size"], self.resources, test_input)
+            return hours + cold_start_hours(recommendation["startup"])
+
+        # The smallest count of the chosen GPU type that meets the deadline
+        self.assertLessEqual(flop_hours(recommendation["gpu_count"]), 48)
+        self.assertGreater(flop_hours(recommendation["gpu_count"] - 1), 48)
+
+        # A job no configuration can finish in time reports the miss
+        test_input = dict(self.test_input, deadline=48)
+        deadline_check = generate_recommendation(test_input, self.resources)["deadline_check"]
+        self.assertFalse(deadline_check["meets_deadline"])
+        self.assertGreater(deadline_check["fastest_hours"], 48)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.history_index import TASK_TYPES, build_index, job_features, load_history, load_index, nearest_jobs, save_index
+
+class TestHistoryIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Generate a random job history with repeated discrete features"""
+        self.resources = load_resource_configs()
+        self.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(7)
+        gpu_types = list(self.resources["gpu_types"])
+        self.jobs = [
+            {
+                "task_type": TASK_TYPES[rng.integers(len(TASK_TYPES))],
+                "parameters": float(10 ** rng.uniform(8, 11)),
+                "training_tokens": float(10 ** rng.uniform(7, 11)),
+                "gpu_type": gpu_types[rng.integers(len(gpu_types))],
+                "gpu_count": int(2 ** rng.integers(0, 4)),
+                "actual_hours": float(rng.uniform(1, 100))
+            }
+            for _ in range(3000)
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_brute_force(self):
+        """Test that the tree search finds the exact nearest jobs"""
+        index = build_index(self.jobs, self.resources, leaf_size=8)
+        features = (job_features(self.jobs, self.resources) - index["mean"]) / index["scale"]
+
+        for workload in self.jobs[:50]:
+            query = dict(workload, parameters=workload["parameters"] * 1.5)
+            result = nearest_jobs(index, query, self.resources, k=5)
+
+            point = (job_features([query], self.resources)[0] - index["mean"]) / index["scale"]
+            distances = np.sqrt(((features - point) ** 2).sum(axis=1))
+            np.testing.assert_allclose(result["distances"], np.sort(distances)[:5])
+            np.testing.assert_allclose(sorted(distances[result["job_index"]]), result["distances"])
+
+    def test_exact_match_estimate(self):
+        """Test that a job already in the history is estimated by itself"""
+        index = build_index(self.jobs, self.resources)
+        workload = {name: value for name, value in self.jobs[42].items() if name != "actual_hours"}
+
+        result = nearest_jobs(index, workload, self.resources)
+
+        self.assertEqual(result["distances"][0], 0.0)
+        self.assertAlmostEqual(result["estimated_hours"], self.jobs[42]["actual_hours"])
+
+    def test_save_and_load_maps_arrays(self):
+        """Test that a saved index loads as read-only views with the same results"""
+        index = build_index(self.jobs, self.resources)
+        path = os.path.join(self.directory.name, "history.bin")
+        save_index(index, path)
+
+        loaded = load_index(path)
+        self.assertIs(load_index(path), loaded)
+        self.assertFalse(loaded["points"].flags.writeable)
+        np.testing.assert_array_equal(loaded["points"], index["points"])
+
+        workload = dict(self.jobs[0], gpu_count=3)
+        self.assertEqual(
+            nearest_jobs(loaded, workload, self.resources)["job_index"],
+            nearest_jobs(index, workload, self.resources)["job_index"]
+        )
+
+    def test_load_history(self):
+        """Test JSONL parsing, skipped records and missing fields"""
+        path = os.path.join(self.directory.name, "history.jsonl")
+        records = [
+            dict(self.jobs[0], gpu_count="2"),
+            dict(self.jobs[1], task_type="Real-time Inference"),
+            {"task_type": "Training", "model_size": "Medium", "dataset_size": "Small (<1GB)",
+             "gpu_type": "A100", "gpu_count": 4, "actual_hours": 0}
+        ]
+        with open(path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+        jobs = load_history(path)
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]["gpu_count"], 2)
+
+        with open(path, "w") as f:
+            f.write(json.dumps({"task_type": "Training", "gpu_type": "A100", "gpu_count": 1, "actual_hours": 1}) + "\n")
+        with self.assertRaisesRegex(ValueError, "parameters"):
+            load_history(path)
+        with self.assertRaises(ValueError):
+            load_history(os.path.join(self.directory.name, "history.parquet"))
+
+    def test_engine_history_estimator(self):
+        """Test that calculate_estimates uses the index when asked"""
+        path = os.path.join(self.directory.name, "history.bin")
+        save_index(build_index(self.jobs, self.resources), path)
+        input_data = {
+            "task_type": "Training",
+            "model_size": "Medium",
+            "dataset_size": "Medium (1GB-10GB)",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None,
+            "estimator": "history",
+            "history_index": path
+        }
+
+        recommendation = generate_recommendation(input_data, self.resources)
+
+        history = recommendation["history_estimate"]
+        self.assertEqual(len(history["job_index"]), 5)
+        self.assertTrue(min(history["hours"]) <= history["estimated_hours"] <= max(history["hours"]))
+
+        with self.assertRaisesRegex(ValueError, "history_index"):
+            generate_recommendation(dict(input_data, history_index=None), self.resources)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import subprocess
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for the headless engine, in microseconds
+IMPORT_TIME_BUDGET_US = 50000
+
+HEAVY_MODULES = ["plotly", "pandas", "streamlit", "numpy"]
+
+def run_python(code, *flags):
+    """Run code in a fresh interpreter from the repository root"""
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+class TestImportTime(unittest.TestCase):
+    
+    def test_engine_import_is_headless(self):
+        """Test that importing the engine does not load UI or array libraries"""
+        result = run_python(
+            "import sys, src, src.advisor_engine\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        self.assertEqual(result.stdout.strip(), "")
+    
+    def test_import_time_budget(self):
+        """Test the cumulative import time of the package with -X importtime"""
+        result = run_python("import src", "-X", "importtime")
+        
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            # Format: "import time: self [us] | cumulative | imported package"
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == "src":
+                cumulative_us = int(parts[1])
+        
+        self.assertIsNotNone(cumulative_us)
+        self.assertLess(cumulative_us, IMPORT_TIME_BUDGET_US)
+    
+    def test_lazy_attributes(self):
+        """Test that chart builders are still reachable from the package"""
+        result = run_python(
+            "import sys, src\n"
+            "assert 'plotly' not in sys.modules\n"
+            "print(callable(src.create_cost_time_comparison), callable(src.sweep_budget))"
+        )
+        self.assertEqual(result.stdout.strip(), "True True")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import glob
+import json
+import tempfile
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import instrumentation
+from src.advisor_engine import generate_recommendation
+
+class TestInstrumentation(unittest.TestCase):
+    
+    def setUp(self):
+        """Start every test with empty, disabled instrumentation"""
+        instrumentation.disable()
+        instrumentation.reset()
+        self.test_input = {
+            "task_type": "Fine-tuning",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+    
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+    
+    def test_disabled_records_nothing(self):
+        """Test that no timings are kept while disabled"""
+        generate_recommendation(self.test_input)
+        self.assertEqual(instrumentation.snapshot()["stages"], {})
+    
+    def test_stage_timings(self):
+        """Test that every engine stage is timed once per request"""
+        instrumentation.enable()
+        for _ in range(3):
+            generate_recommendation(self.test_input)
+        
+        stages = instrumentation.snapshot()["stages"]
+        for stage in ["catalog_load", "apply_heuristics", "adjust_for_priority",
+                      "adjust_for_constraints", "calculate_estimates",
+                      "generate_justification", "generate_alternatives",
+                      "generate_recommendation"]:
+            self.assertEqual(stages[stage]["count"], 3)
+            self.assertEqual(stages[stage]["histogram"]["+Inf"], 3)
+        
+        # JSON export round-trips
+        self.assertIn("stages", json.loads(instrumentation.render_json()))
+    
+    def test_render_prometheus(self):
+        """Test the Prometheus text exposition output"""
+        instrumentation.enable()
+        generate_recommendation(self.test_input)
+        text = instrumentation.render_prometheus()
+        
+        self.assertIn("# TYPE flexai_advisor_stage_seconds histogram", text)
+        self.assertIn('flexai_advisor_stage_seconds_count{stage="apply_heuristics"} 1', text)
+        self.assertIn('flexai_advisor_stage_seconds_bucket{stage="apply_heuristics",le="+Inf"} 1', text)
+    
+    def test_sampled_profiles(self):
+        """Test that sampled requests dump a cProfile file"""
+        with tempfile.TemporaryDirectory() as profile_dir:
+            instrumentation.enable(profile_sample_rate=1.0, profile_dir=profile_dir)
+            generate_recommendation(self.test_input)
+            
+            self.assertEqual(len(glob.glob(os.path.join(profile_dir, "generate_recommendation-*.prof"))), 1)
+            self.assertEqual(instrumentation.snapshot()["stages"]["generate_recommendation"]["count"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
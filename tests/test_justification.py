@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.catalog import load_catalog, catalog_version
+from src.justification import compile_templates, render_justification
+
+class TestJustification(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Cost",
+            "budget_limit": 12.5,
+            "deadline": None
+        }
+        self.recommendation = {
+            "gpu_type": "NVIDIA A100",
+            "gpu_count": 4,
+            "instance_type": "flex-economy"
+        }
+    
+    def test_render_justification(self):
+        """Test the rendered bullets and their order"""
+        justification = render_justification(self.recommendation, self.test_input, self.resources)
+        
+        self.assertEqual(len(justification), 5)
+        self.assertTrue(justification[0].startswith("**GPU Selection (NVIDIA A100):**"))
+        self.assertIn("**Multiple GPUs (4):**", justification[1])
+        self.assertTrue(justification[2].startswith("**Instance Type (flex-economy):**"))
+        self.assertTrue(justification[3].startswith("**Cost Optimization:**"))
+        self.assertIn("$12.5/hour", justification[4])
+    
+    def test_rendered_lists_are_cached(self):
+        """Test that identical requests reuse the rendered bullets"""
+        first = render_justification(self.recommendation, self.test_input, self.resources)
+        second = render_justification(self.recommendation, dict(self.test_input, budget_limit=20), self.resources)
+        
+        self.assertEqual(first[:4], second[:4])
+        self.assertIn("$20/hour", second[4])
+        
+        # Callers get their own list
+        first.append("extra")
+        self.assertEqual(len(render_justification(self.recommendation, self.test_input, self.resources)), 5)
+        self.assertIs(compile_templates(self.resources), compile_templates(self.resources))
+    
+    def test_disable_justification(self):
+        """Test that batch callers can skip justification rendering"""
+        result = generate_recommendation(dict(self.test_input, include_justification=False))
+        self.assertEqual(result["justification"], [])
+    
+    def test_catalog_version(self):
+        """Test that catalogs are cached and versioned by content"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.json")
+            with open(path, "w") as f:
+                json.dump({"gpu_types": {}}, f)
+            
+            first = load_catalog(path)
+            self.assertIs(load_catalog(path), first)
+            self.assertEqual(catalog_version(first), first["version"])
+            
+            with open(path, "w") as f:
+                json.dump({"gpu_types": {}, "version": "2025.2"}, f)
+            os.utime(path, ns=(0, 0))
+            
+            self.assertEqual(catalog_version(load_catalog(path)), "2025.2")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.placement import plan_region
+
+class TestPlacement(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Cost",
+            "budget_limit": None,
+            "deadline": None,
+            "data_region": "asia-east"
+        }
+
+    def test_home_region_by_default(self):
+        """Test that jobs stay with data in the cheapest region"""
+        recommendation = generate_recommendation(dict(self.test_input, data_region="us-east"), self.resources, self.pricing)
+
+        self.assertEqual(recommendation["region"], "us-east")
+        self.assertEqual(recommendation["placement"]["egress_cost"], 0.0)
+        self.assertEqual(recommendation["estimated_total_cost"], round(recommendation["storage_plan"]["total_cost"], 2))
+
+    def test_savings_outweigh_egress(self):
+        """Test that a compute-heavy job moves away from expensive data"""
+        recommendation = generate_recommendation(self.test_input, self.resources, self.pricing)
+        placement = recommendation["placement"]
+
+        self.assertEqual(recommendation["region"], "us-east")
+        self.assertAlmostEqual(placement["egress_cost"], 5 * 0.08)
+        self.assertLess(placement["total_cost"], placement["regions"]["asia-east"]["total_cost"])
+        self.assertTrue(any(line.startswith("**Region (us-east)") for line in recommendation["justification"]))
+
+        # Minimizing time never pays the transfer delay
+        fastest = generate_recommendation(dict(self.test_input, priority="Minimize Time"), self.resources, self.pricing)
+        self.assertEqual(fastest["region"], "asia-east")
+
+    def test_egress_outweighs_savings(self):
+        """Test that a short job over a large dataset stays with its data"""
+        placement = plan_region(4.0, 0.0, 1.0, 2000, "asia-east", self.resources, self.pricing)
+
+        self.assertEqual(placement["region"], "asia-east")
+        self.assertAlmostEqual(placement["regions"]["us-east"]["egress_cost"], 2000 * 0.08)
+        self.assertAlmostEqual(placement["regions"]["us-east"]["transfer_hours"], 2000 / 1.25 / 3600)
+
+        # Regions that miss the deadline are ruled out
+        self.assertEqual(plan_region(4000.0, 0.0, 1.0, 2000, "asia-east", self.resources, self.pricing)["region"], "us-east")
+        placement = plan_region(4000.0, 0.0, 1.0, 2000, "asia-east", self.resources, self.pricing, deadline_hours=1.2)
+        self.assertEqual(placement["region"], "asia-east")
+
+    def test_budget_priced_in_region(self):
+        """Test that budgets and alternatives use the placed region's prices"""
+        test_input = dict(self.test_input, dataset_size="Very Large (>1TB)", priority="Balanced")
+        multipliers = self.pricing["region_pricing_multipliers"]
+
+        for budget in (3.0, 5.0, 8.0, 10.0, 12.0):
+            recommendation = generate_recommendation(dict(test_input, budget_limit=budget), self.resources, self.pricing)
+            self.assertEqual(recommendation["region"], "asia-east")
+            self.assertLessEqual(recommendation["estimated_cost"], budget)
+
+        # The savings compare prices in the same region
+        recommendation = generate_recommendation(test_input, self.resources, self.pricing)
+        budget_option = recommendation["alternatives"][0]
+        list_cost = (
+            self.resources["gpu_types"][budget_option["gpu_type"]]["hourly_cost"] * budget_option["gpu_count"]
+            * self.resources["instance_types"][budget_option["instance_type"]]["cost_multiplier"]
+        )
+        self.assertEqual(budget_option["estimated_cost"], round(list_cost * multipliers["asia-east"], 2))
+        savings = round((recommendation["estimated_cost"] - budget_option["estimated_cost"]) / recommendation["estimated_cost"] * 100)
+        self.assertIn(f"saving {savings}%", budget_option["description"])
+
+        # Constraints that exclude the home region price the budget where the job can run
+        constrained = dict(test_input, budget_limit=10.0, constraints=["region in europe-west"])
+        recommendation = generate_recommendation(constrained, self.resources, self.pricing)
+        self.assertEqual(recommendation["region"], "europe-west")
+        self.assertLessEqual(recommendation["estimated_cost"], 10.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import math
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs, load_heuristics
+from src.realtime import min_replicas_for_latency, plan_realtime_capacity, sweep_realtime_capacity
+
+class TestRealtime(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.heuristics = load_heuristics()
+        self.test_input = {
+            "task_type": "Real-time Inference",
+            "model_size": "Medium",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None,
+            "request_rate": 10,
+            "tokens_per_request": 128,
+            "latency_target_ms": 1000
+        }
+    
+    def test_erlang_c_latency(self):
+        """Test the tail latency against a hand-computed M/M/c value"""
+        # Offered load 2 on 3 servers: Erlang C = 4/9
+        replicas, latency = min_replicas_for_latency(np.array([2.0]), 1.0, 10.0, 0.95, max_replicas=3)
+        erlang_c = 4 / 9
+        expected = math.log(erlang_c / 0.05) / (3 - 2) + 1.0
+        
+        self.assertEqual(replicas[0], 3)
+        self.assertAlmostEqual(latency[0], expected)
+    
+    def test_sweep_is_monotonic(self):
+        """Test that more traffic never needs fewer replicas"""
+        rates = np.linspace(0.1, 200, 500)
+        sweep = sweep_realtime_capacity("Medium", rates, 128, 1000, 0.99, resources=self.resources, heuristics=self.heuristics)
+        
+        for gpu_replicas in sweep["replicas"]:
+            self.assertTrue(np.all(np.diff(gpu_replicas) >= 0))
+        self.assertTrue(np.all(sweep["tail_latency_ms"][~np.isnan(sweep["tail_latency_ms"])] <= 1000))
+    
+    def test_plan_infeasible(self):
+        """Test that unreachable latency targets are reported"""
+        plan = plan_realtime_capacity("XL", 5, 256, 50, resources=self.resources, heuristics=self.heuristics)
+        
+        self.assertFalse(plan["feasible"])
+        self.assertGreater(plan["min_service_ms"], 50)
+    
+    def test_recommendation_uses_capacity_plan(self):
+        """Test that the engine sizes real-time deployments from traffic"""
+        result = generate_recommendation(self.test_input)
+        plan = result["capacity_plan"]
+        
+        self.assertTrue(plan["feasible"])
+        self.assertEqual(result["gpu_count"], plan["gpu_count"])
+        self.assertLessEqual(plan["tail_latency_ms"], 1000)
+        self.assertTrue(result["estimated_time"].startswith("p95 latency"))
+        self.assertTrue(result["justification"][-1].startswith("**Capacity Plan:**"))
+
+    def test_budget_is_checked_against_the_pool(self):
+        """Test that a pool over the budget is kept and flagged, and one within it is not"""
+        over = generate_recommendation(dict(
+            self.test_input, model_size="Large", priority="Minimize Cost", budget_limit=5, request_rate=50,
+            tokens_per_request=256, latency_target_ms=2000
+        ))
+        self.assertTrue(over["capacity_plan"]["feasible"])
+        self.assertGreater(over["estimated_cost"], 5)
+        self.assertTrue(any(line.startswith("**Budget Warning:**") for line in over["justification"]))
+        self.assertFalse(any(line.startswith("**Budget Consideration:**") for line in over["justification"]))
+
+        within = generate_recommendation(dict(self.test_input, budget_limit=1000))
+        self.assertLessEqual(within["estimated_cost"], 1000)
+        self.assertTrue(any(line.startswith("**Budget Consideration:**") for line in within["justification"]))
+        self.assertFalse(any(line.startswith("**Budget Warning:**") for line in within["justification"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import copy
+import datetime
+import json
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.recommendation_ids import (
+    REVALIDATE, canonical_inputs, canonical_json, clear_store, entity_tag, get_figure, get_recommendation, matches_etag, recommend,
+    recommendation_id, respond, respond_by_id
+)
+
+class TestRecommendationIds(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+        clear_store()
+
+    def tearDown(self):
+        clear_store()
+
+    def test_canonical_json(self):
+        """Test that serialization sorts keys, drops whitespace and rejects NaN"""
+        self.assertEqual(canonical_json({"b": [1, 2.5], "a": "é"}), b'{"a":"\\u00e9","b":[1,2.5]}')
+        self.assertEqual(canonical_json({"b": (1, 2.5), "a": "é"}), canonical_json({"a": "é", "b": [1, 2.5]}))
+        with self.assertRaises(ValueError):
+            canonical_json({"cost": float("nan")})
+
+        recommendation = generate_recommendation(self.test_input, self.resources, self.pricing)
+        self.assertEqual(json.loads(canonical_json(recommendation)), recommendation)
+
+    def test_id_follows_inputs_and_catalogs(self):
+        """Test that IDs ignore key order but track inputs, missing keys and catalog versions"""
+        identifier = recommendation_id(self.test_input, self.resources, self.pricing)
+        reordered = dict(reversed(list(self.test_input.items())))
+        missing = {name: value for name, value in self.test_input.items() if value is not None}
+
+        self.assertEqual(recommendation_id(reordered, self.resources, self.pricing), identifier)
+        self.assertNotEqual(recommendation_id(missing, self.resources, self.pricing), identifier)
+        self.assertNotEqual(recommendation_id(dict(self.test_input, budget_limit=5.0), self.resources, self.pricing), identifier)
+
+        resources = copy.deepcopy(self.resources)
+        resources["version"] = "next"
+        self.assertNotEqual(recommendation_id(self.test_input, resources, self.pricing), identifier)
+
+    def test_deadlines_are_canonical_hours(self):
+        """Test that timedelta and calendar deadlines are hashed as hours"""
+        hours = dict(self.test_input, deadline=36.0)
+        duration = dict(self.test_input, deadline=datetime.timedelta(hours=36))
+        self.assertEqual(canonical_inputs(duration), hours)
+        self.assertEqual(recommendation_id(duration, self.resources, self.pricing),
+                         recommendation_id(hours, self.resources, self.pricing))
+
+        # A calendar deadline is hours from now, so its ID moves with time
+        # while each ID keeps naming the same content
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        for deadline in (tomorrow, datetime.datetime.combine(tomorrow, datetime.time()), tomorrow.isoformat()):
+            dated = dict(self.test_input, deadline=deadline)
+            canonical = canonical_inputs(dated)
+            self.assertIsInstance(canonical["deadline"], float)
+            self.assertGreater(canonical["deadline"], 0)
+            self.assertEqual(canonical_inputs(canonical), canonical)
+            self.assertNotEqual(recommendation_id(dated, self.resources, self.pricing),
+                                recommendation_id(dated, self.resources, self.pricing))
+
+            identifier, recommendation = recommend(dated, self.resources, self.pricing)
+            self.assertEqual(get_recommendation(identifier), recommendation)
+            deadline_hours = recommendation["deadline_check"]["deadline_hours"]
+            self.assertEqual(recommendation, generate_recommendation(
+                dict(self.test_input, deadline=deadline_hours), self.resources, self.pricing))
+
+            status, headers, body = respond(dated, None, self.resources, self.pricing)
+            self.assertEqual(status, 200)
+            self.assertNotEqual(headers["ETag"], entity_tag(identifier))
+
+    def test_etag_matching(self):
+        """Test If-None-Match parsing"""
+        tag = entity_tag("abc")
+        self.assertTrue(matches_etag('"abc"', tag))
+        self.assertTrue(matches_etag('"old", W/"abc"', tag))
+        self.assertTrue(matches_etag("*", tag))
+        self.assertFalse(matches_etag('"abc-resources"', tag))
+        self.assertFalse(matches_etag(None, tag))
+
+    def test_conditional_responses(self):
+        """Test 200 then 304 by inputs, and fetching the recommendation and figures by ID"""
+        status, headers, body = respond(self.test_input, resources=self.resources, pricing=self.pricing)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), generate_recommendation(self.test_input, self.resources, self.pricing))
+        identifier = recommendation_id(self.test_input, self.resources, self.pricing)
+        self.assertEqual(headers["ETag"], entity_tag(identifier))
+
+        status, headers, not_modified = respond(self.test_input, headers["ETag"], self.resources, self.pricing)
+        self.assertEqual((status, not_modified), (304, b""))
+        self.assertEqual(headers, {"ETag": entity_tag(identifier), "Cache-Control": REVALIDATE})
+
+        self.assertEqual(respond_by_id(identifier)[2], body)
+        self.assertEqual(get_recommendation(identifier), json.loads(body))
+        self.assertEqual(respond_by_id(identifier, if_none_match=entity_tag(identifier))[0], 304)
+        status, headers, figure = respond_by_id(identifier, "resources")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["ETag"], entity_tag(identifier, "resources"))
+        self.assertIn("data", json.loads(figure))
+
+        self.assertEqual(respond_by_id("unknown")[0], 404)
+        with self.assertRaises(KeyError):
+            get_recommendation("unknown")
+        with self.assertRaises(ValueError):
+            get_figure(identifier, "sensitivity")
+
+    def test_recommend_reuses_stored(self):
+        """Test that stored recommendations are returned as independent copies"""
+        identifier, first = recommend(self.test_input, self.resources, self.pricing)
+        first["gpu_count"] = 99
+
+        second_id, second = recommend(self.test_input, self.resources, self.pricing)
+        self.assertEqual(second_id, identifier)
+        self.assertEqual(second, generate_recommendation(self.test_input, self.resources, self.pricing))
+        self.assertIsNotNone(get_figure(identifier, "cost_time"))
+
+        # Inputs the engine rejects are not answered from the store
+        missing = {name: value for name, value in self.test_input.items() if value is not None}
+        with self.assertRaises(KeyError):
+            recommend(missing, self.resources, self.pricing)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import datetime
+import tempfile
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.recommendation_store import (
+    RECOMMENDATION_OPTION, append_recommendations, budget_miss_rate, compact_day, load_vocabulary, read_columns,
+    share, total_by
+)
+
+class TestRecommendationStore(unittest.TestCase):
+
+    def setUp(self):
+        """Log a cheap and a budget-constrained recommendation on two days"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = self.directory.name
+
+        base = {
+            "task_type": "Training",
+            "model_size": "Medium",
+            "dataset_size": "Medium (1GB-10GB)",
+            "priority": "Minimize Cost",
+            "budget_limit": None,
+            "deadline": None
+        }
+        self.records = []
+        for input_data in (base, dict(base, model_size="XL", priority="Minimize Time", budget_limit=1.0)):
+            self.records.append((input_data, generate_recommendation(input_data, self.resources, self.pricing)))
+
+        self.first_day = datetime.datetime(2026, 10, 1, 12, tzinfo=datetime.timezone.utc)
+        self.second_day = datetime.datetime(2026, 10, 2, 12, tzinfo=datetime.timezone.utc)
+        append_recommendations(self.store, self.records, self.first_day)
+        append_recommendations(self.store, self.records[:1], self.second_day)
+        append_recommendations(self.store, self.records[:1], self.second_day)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_rows_are_flat_and_coded(self):
+        """Test that every option becomes a row with numeric hours and coded categories"""
+        rows = read_columns(self.store, ("record_id", "option", "gpu_type", "estimated_hours"), alternatives=True)
+        expected = sum(len(recommendation["alternatives"]) + 1 for _, recommendation in self.records)
+        expected += 2 * (len(self.records[0][1]["alternatives"]) + 1)
+
+        self.assertEqual(len(rows["record_id"]), expected)
+        self.assertEqual(rows["gpu_type"].dtype.kind, "i")
+        self.assertEqual(len(set(rows["record_id"].tolist())), 4)
+        self.assertGreater(rows["estimated_hours"].min(), 0)
+
+        vocabulary = load_vocabulary(self.store)
+        self.assertEqual(vocabulary["option"][0], RECOMMENDATION_OPTION)
+        self.assertEqual(len(read_columns(self.store, ("option",))["option"]), 4)
+
+    def test_aggregations(self):
+        """Test cost per GPU type, instance share and budget misses against the records"""
+        (cheap_input, cheap), (budget_input, constrained) = self.records
+
+        expected = {}
+        for recommendation in (cheap, constrained, cheap, cheap):
+            gpu_type = recommendation["gpu_type"]
+            expected[gpu_type] = expected.get(gpu_type, 0.0) + recommendation["estimated_total_cost"]
+        totals = total_by(self.store, "projected_cost", "gpu_type")
+        self.assertEqual(totals.keys(), expected.keys())
+        for gpu_type, total in expected.items():
+            self.assertAlmostEqual(totals[gpu_type], total)
+
+        economy = sum(recommendation["instance_type"] == "flex-economy" for recommendation in (cheap, constrained, cheap, cheap))
+        self.assertAlmostEqual(share(self.store, "instance_type", "flex-economy"), economy / 4)
+        self.assertEqual(share(self.store, "instance_type", "unknown"), 0.0)
+
+        missed = constrained["estimated_cost"] > budget_input["budget_limit"]
+        self.assertEqual(budget_miss_rate(self.store), float(missed))
+
+    def test_day_range_and_compaction(self):
+        """Test that day filters select partitions and compaction keeps every row"""
+        self.assertEqual(len(read_columns(self.store, ("record_id",), start_day="2026-10-02")["record_id"]), 2)
+        self.assertEqual(len(read_columns(self.store, ("record_id",), end_day="2026-10-01")["record_id"]), 2)
+
+        before = total_by(self.store, "projected_cost", "gpu_type", alternatives=True)
+        self.assertEqual(compact_day(self.store, self.second_day.date()), 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.store, "day=2026-10-02"))), 1)
+        self.assertEqual(total_by(self.store, "projected_cost", "gpu_type", alternatives=True), before)
+
+if __name__ == "__main__":
+    unittest.main()
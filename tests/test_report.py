@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import base64
+import json
+import tempfile
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.report import CHARTS, build_figure, figure_spec, fleet_totals, generate_report, load_workloads, plan_jobs
+
+def decode_arrays(value):
+    """Replace plotly's base64 typed arrays with plain lists"""
+    if isinstance(value, dict):
+        if set(value) == {"dtype", "bdata"}:
+            return np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"]).tolist()
+        return {key: decode_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_arrays(item) for item in value]
+    return value
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small batch with repeated workloads"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        base = {
+            "task_type": "Training",
+            "model_size": "Large",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced"
+        }
+        self.workloads = [
+            dict(base, name="llm-a"),
+            dict(base, name="llm-b"),
+            dict(base, model_size="Small", priority="Minimize Cost"),
+            dict(base, model_size="XL", dataset_size="Very Large (>1TB)", deadline=12),
+            dict(base, task_type="Real-time Inference", model_size="Medium")
+        ]
+
+    def test_patched_specs_match_plotly(self):
+        """Test that skeleton patching reproduces the plotly figures"""
+        skeletons = {}
+        for workload in self.workloads + [dict(self.workloads[0], budget_limit=5.0)]:
+            _, _, recommendation = plan_jobs([workload], self.resources, self.pricing)[0]
+            for chart in CHARTS:
+                figure = build_figure(chart, recommendation, self.resources)
+                patched = figure_spec(chart, recommendation, self.resources, skeletons)
+                if figure is None:
+                    self.assertIsNone(patched)
+                    continue
+
+                expected = decode_arrays(json.loads(figure.to_json()))
+                template = expected["layout"].pop("template")
+                self.assertEqual(patched[0], expected)
+                self.assertEqual(json.loads(patched[1]), template)
+
+    def test_report_shares_plotlyjs_and_figures(self):
+        """Test that plotly.js and identical figures are written once"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.html")
+            stats = generate_report(self.workloads, path, self.resources, self.pricing, plotlyjs="cdn")
+            with open(path) as f:
+                report = f.read()
+
+        self.assertEqual(stats["jobs"], 5)
+        self.assertEqual(report.count("<script src="), 1)
+        self.assertEqual(report.count('id="template-'), 1)
+        # llm-a and llm-b share all three figures; real-time has no cost chart
+        self.assertEqual(stats["charts"], 14)
+        self.assertEqual(stats["figures"], report.count('id="figure-'))
+        self.assertLessEqual(stats["figures"], 11)
+        self.assertIn("<h2>llm-b</h2>", report)
+        self.assertEqual(stats["bytes"], len(report.encode("utf-8")))
+
+    def test_fleet_totals(self):
+        """Test that fleet totals add up the per-job estimates"""
+        jobs = plan_jobs(self.workloads, self.resources, self.pricing)
+        totals = fleet_totals(jobs)
+
+        self.assertIs(jobs[0][2], jobs[1][2])
+        self.assertEqual(totals["jobs"], 5)
+        self.assertAlmostEqual(totals["hourly_cost"], sum(job[2]["estimated_cost"] for job in jobs))
+        self.assertEqual(sum(totals["by_gpu_type"].values()), 5)
+
+        single = generate_recommendation(dict(self.workloads[0], budget_limit=None, deadline=None), self.resources, self.pricing)
+        self.assertEqual(fleet_totals(jobs[:1])["total_cost"], single["estimated_total_cost"])
+
+    def test_load_workloads(self):
+        """Test loading JSONL workloads"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "jobs.jsonl")
+            with open(path, "w") as f:
+                f.write("\n".join(json.dumps(workload) for workload in self.workloads) + "\n")
+            self.assertEqual(load_workloads(path), self.workloads)
+
+            with self.assertRaises(ValueError):
+                load_workloads(os.path.join(directory, "jobs.csv"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.commitments import job_hours
+from src.sensitivity import enumerate_configurations, sweep_budget, sweep_deadline
+
+class TestSensitivity(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "XL",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Time",
+            "budget_limit": None,
+            "deadline": None
+        }
+    
+    def test_enumerate_configurations(self):
+        """Test that every GPU x count x instance combination is enumerated"""
+        space = enumerate_configurations(self.resources, max_gpu_count=8)
+        expected = len(self.resources["gpu_types"]) * 8 * len(self.resources["instance_types"])
+        
+        self.assertEqual(len(space["hourly_cost"]), expected)
+        self.assertEqual(space["gpu_count"].min(), 1)
+        self.assertEqual(space["gpu_count"].max(), 8)
+    
+    def test_sweep_budget_matches_engine(self):
+        """Test that each sweep segment matches a direct engine call"""
+        sweep = sweep_budget(self.test_input, (1.0, 100.0), self.resources)
+        
+        self.assertGreater(len(sweep["segments"]), 1)
+        self.assertEqual(len(sweep["breakpoints"]), len(sweep["segments"]) - 1)
+        
+        for segment in sweep["segments"]:
+            for budget in (segment["start"], (segment["start"] + segment["end"]) / 2):
+                result = generate_recommendation(dict(self.test_input, budget_limit=budget), self.resources)
+                self.assertEqual(result["gpu_type"], segment["gpu_type"])
+                self.assertEqual(result["gpu_count"], segment["gpu_count"])
+                self.assertEqual(result["instance_type"], segment["instance_type"])
+        
+        # Budgets are priced in the region the job runs in
+        test_input = dict(self.test_input, data_region="asia-east")
+        for segment in sweep_budget(test_input, (1.0, 100.0), self.resources)["segments"]:
+            for budget in (segment["start"], (segment["start"] + segment["end"]) / 2):
+                result = generate_recommendation(dict(test_input, budget_limit=budget), self.resources)
+                self.assertEqual(
+                    (result["gpu_type"], result["gpu_count"], result["instance_type"]),
+                    (segment["gpu_type"], segment["gpu_count"], segment["instance_type"])
+                )
+    
+    def test_sweep_deadline_matches_engine(self):
+        """Test that each deadline sweep segment matches a direct engine call"""
+        test_input = dict(self.test_input, priority="Minimize Cost")
+        sweep = sweep_deadline(test_input, (1.0, 168.0), self.resources)
+        
+        self.assertGreater(len(sweep["segments"]), 1)
+        self.assertEqual(sweep["segments"][0]["start"], 1.0)
+        self.assertEqual(sweep["segments"][-1]["end"], 168.0)
+        
+        for segment in sweep["segments"]:
+            for deadline in (segment["start"], (segment["start"] + segment["end"]) / 2):
+                result = generate_recommendation(dict(test_input, deadline=deadline), self.resources)
+                self.assertEqual(result["gpu_type"], segment["gpu_type"])
+                self.assertEqual(result["gpu_count"], segment["gpu_count"])
+                self.assertEqual(result["instance_type"], segment["instance_type"])
+                # Estimates include startup, storage and placement
+                self.assertEqual(result["estimated_cost"], segment["hourly_cost"])
+                self.assertEqual(job_hours(result), segment["estimated_hours"])
+                self.assertEqual(result["estimated_total_cost"], segment["total_cost"])
+        
+        # Deadline sweeps do not apply to real-time workloads
+        realtime_input = dict(self.test_input, task_type="Real-time Inference")
+        with self.assertRaises(ValueError):
+            sweep_deadline(realtime_input)
+
+    def test_sweep_deadline_follows_batch_plan(self):
+        """Test that batch inference sweeps break where the batch plan changes"""
+        test_input = dict(self.test_input, task_type="Batch Inference", model_size="Large",
+                          priority="Minimize Cost", item_count=2000000)
+        sweep = sweep_deadline(test_input, (1.0, 168.0), self.resources)
+        
+        self.assertGreater(len(sweep["segments"]), 1)
+        for segment in sweep["segments"]:
+            for deadline in (segment["start"], (segment["start"] + segment["end"]) / 2):
+                result = generate_recommendation(dict(test_input, deadline=deadline), self.resources)
+                self.assertEqual(
+                    (result["gpu_type"], result["gpu_count"], result["instance_type"]),
+                    (segment["gpu_type"], segment["gpu_count"], segment["instance_type"])
+                )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import sys
+import os
+import copy
+import subprocess
+import tempfile
+import numpy as np
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import (
+    apply_heuristics, generate_recommendation, load_heuristics, load_resource_configs, shared_resources
+)
+from src.recommendation_ids import recommendation_id
+from src.shared_catalog import SHARED_CATALOG_ENV, attach_catalog, catalog_arrays, compile_catalog_arrays, publish_catalog
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestSharedCatalog(unittest.TestCase):
+
+    def setUp(self):
+        """Publish the catalog into a temporary directory"""
+        self.resources = load_resource_configs()
+        self.heuristics = load_heuristics()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "catalog.bin")
+        self.version = publish_catalog(self.resources, self.path, self.heuristics)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_attach_is_zero_copy(self):
+        """Test that attached arrays are read-only views of the mapped file"""
+        shared = attach_catalog(self.path)
+        local = compile_catalog_arrays(self.resources, self.heuristics)
+
+        self.assertEqual(shared["version"], self.version)
+        self.assertEqual(shared["gpu_types"], local["gpu_types"])
+        for name in ("gpu_hourly_cost", "gpu_performance", "instance_cost_multiplier", "rule_gpu_count"):
+            np.testing.assert_array_equal(shared[name], local[name])
+            self.assertFalse(shared[name].flags.writeable)
+            self.assertFalse(shared[name].flags.owndata)
+
+        # Unchanged files reuse the existing attachment
+        self.assertIs(attach_catalog(self.path), shared)
+
+    def test_republish_switches_version(self):
+        """Test that workers pick up a new version and old views stay valid"""
+        old = attach_catalog(self.path)
+        old_costs = old["gpu_hourly_cost"].copy()
+
+        updated = copy.deepcopy(self.resources)
+        updated["version"] = "price-update"
+        updated["gpu_types"]["NVIDIA H100"]["hourly_cost"] = 4.99
+        publish_catalog(updated, self.path)
+
+        new = attach_catalog(self.path)
+        self.assertEqual(new["version"], "price-update")
+        self.assertEqual(new["gpu_hourly_cost"][new["gpu_types"].index("NVIDIA H100")], 4.99)
+        np.testing.assert_array_equal(old["gpu_hourly_cost"], old_costs)
+
+    def test_catalog_arrays_follow_published_version(self):
+        """Test that lookups follow the published file unless it lacks local types"""
+        os.environ[SHARED_CATALOG_ENV] = self.path
+        try:
+            self.assertIs(catalog_arrays(self.resources), attach_catalog(self.path))
+            self.assertIs(catalog_arrays(dict(self.resources, version="other")), attach_catalog(self.path))
+
+            extended = copy.deepcopy(self.resources)
+            extended["gpu_types"]["NVIDIA B200"] = extended["gpu_types"]["NVIDIA H100"]
+            self.assertNotIn("catalog_version", catalog_arrays(extended))
+        finally:
+            del os.environ[SHARED_CATALOG_ENV]
+
+    def test_engine_follows_published_catalog(self):
+        """Test that recommendations, their IDs and the rules follow a newly published catalog"""
+        input_data = {
+            "task_type": "Training",
+            "model_size": "XL",
+            "dataset_size": "Large (10GB-100GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+        before = generate_recommendation(input_data, self.resources)
+        identifier = recommendation_id(input_data, self.resources)
+
+        updated = copy.deepcopy(self.resources)
+        updated["version"] = "price-update"
+        updated["gpu_types"]["NVIDIA H100"]["hourly_cost"] = 1.0
+        heuristics = copy.deepcopy(self.heuristics)
+        heuristics["task_type_rules"]["Training"]["XL"]["gpu_count"] = 8
+        publish_catalog(updated, self.path, heuristics)
+
+        os.environ[SHARED_CATALOG_ENV] = self.path
+        try:
+            after = generate_recommendation(input_data, self.resources)
+            self.assertNotEqual(recommendation_id(input_data, self.resources), identifier)
+            self.assertEqual(after["gpu_type"], "NVIDIA H100")
+            self.assertLess(after["estimated_cost"], before["estimated_cost"])
+            self.assertEqual(
+                apply_heuristics({}, "Training", "XL", "Small (<1GB)", shared_resources(self.resources))["gpu_count"], 8
+            )
+        finally:
+            del os.environ[SHARED_CATALOG_ENV]
+
+    def test_published_values_are_read_from_shared_arrays(self):
+        """Test that the published catalog reads prices from the mapped arrays without copying the catalog"""
+        updated = copy.deepcopy(self.resources)
+        updated["version"] = "price-update"
+        updated["gpu_types"]["NVIDIA H100"]["hourly_cost"] = 1.0
+        publish_catalog(updated, self.path)
+
+        os.environ[SHARED_CATALOG_ENV] = self.path
+        try:
+            published = shared_resources(self.resources)
+        finally:
+            del os.environ[SHARED_CATALOG_ENV]
+
+        self.assertEqual(published["version"], "price-update")
+        self.assertEqual(published["gpu_types"]["NVIDIA H100"]["hourly_cost"], 1.0)
+        self.assertEqual(published["gpu_types"]["NVIDIA H100"]["vram"], self.resources["gpu_types"]["NVIDIA H100"]["vram"])
+        self.assertEqual(list(published["gpu_types"]), list(self.resources["gpu_types"]))
+        self.assertIs(published["frameworks"], self.resources["frameworks"])
+        with self.assertRaises(TypeError):
+            published["gpu_types"]["NVIDIA H100"]["hourly_cost"] = 2.0
+
+        # Copies are ordinary dicts holding the published values
+        copied = copy.deepcopy(published)
+        copied["gpu_types"]["NVIDIA H100"]["hourly_cost"] = 2.0
+        self.assertEqual(published["gpu_types"]["NVIDIA H100"]["hourly_cost"], 1.0)
+
+    def test_other_process_attaches(self):
+        """Test that a separate worker process reads the published arrays"""
+        script = (
+            "import sys; from src.shared_catalog import attach_catalog; "
+            "c = attach_catalog(sys.argv[1]); print(c['version'], c['gpu_hourly_cost'].sum())"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script, self.path], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+
+        self.assertEqual(output[0], self.version)
+        self.assertAlmostEqual(float(output[1]), sum(g["hourly_cost"] for g in self.resources["gpu_types"].values()))
+
+if __name__ == "__main__":
+    unittest.main()
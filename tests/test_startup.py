@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import copy
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.startup import cold_start_hours, startup_latency
+
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Batch Inference",
+            "model_size": "Small",
+            "dataset_size": "Small (<1GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+
+    def test_latency_breakdown(self):
+        """Test that startup combines instance, GPU and model load times"""
+        latency = startup_latency("XL", "NVIDIA H100", "flex-standard", self.resources)
+        instance = self.resources["instance_types"]["flex-standard"]
+
+        self.assertEqual(latency["instance_seconds"], instance["startup_seconds"])
+        self.assertEqual(latency["gpu_seconds"], self.resources["gpu_types"]["NVIDIA H100"]["startup_seconds"])
+        self.assertAlmostEqual(latency["model_load_seconds"], 48 / instance["network_gb_per_s"])
+        self.assertAlmostEqual(
+            latency["total_seconds"],
+            latency["instance_seconds"] + latency["gpu_seconds"] + latency["model_load_seconds"]
+        )
+
+    def test_short_jobs_include_startup(self):
+        """Test that startup is added to the time and cost of a short job"""
+        recommendation = generate_recommendation(self.test_input, self.resources, self.pricing)
+        storage_plan = recommendation["storage_plan"]
+        startup_hours = cold_start_hours(recommendation["startup"])
+
+        self.assertGreater(startup_hours, 0)
+        self.assertAlmostEqual(storage_plan["startup_hours"], startup_hours)
+        self.assertGreaterEqual(storage_plan["job_hours"], storage_plan["compute_hours"] + startup_hours)
+
+        resources = copy.deepcopy(self.resources)
+        for entry in list(resources["instance_types"].values()) + list(resources["gpu_types"].values()):
+            entry.pop("startup_seconds")
+            entry.pop("network_gb_per_s", None)
+        cold = generate_recommendation(self.test_input, resources, self.pricing)
+        self.assertLess(cold["storage_plan"]["total_cost"], storage_plan["total_cost"])
+
+    def test_warm_pool(self):
+        """Test that a tight scale-out target keeps the burst capacity warm"""
+        realtime_input = dict(
+            self.test_input, task_type="Real-time Inference", model_size="Medium",
+            request_rate=10, peak_request_rate=40, tokens_per_request=128, latency_target_ms=1000
+        )
+
+        relaxed = generate_recommendation(dict(realtime_input, scale_out_seconds=3600), self.resources, self.pricing)
+        self.assertEqual(relaxed["warm_pool"]["warm_replicas"], 0)
+        self.assertEqual(relaxed["warm_pool"]["warm_daily_cost"], 0.0)
+
+        tight = generate_recommendation(dict(realtime_input, scale_out_seconds=10), self.resources, self.pricing)
+        pool = tight["warm_pool"]
+        plan = tight["capacity_plan"]
+        self.assertTrue(pool["meets_target"])
+        self.assertEqual(pool["warm_replicas"], pool["peak_replicas"] - plan["replicas"])
+        self.assertGreater(pool["warm_replicas"], 0)
+        self.assertAlmostEqual(pool["warm_daily_cost"] / pool["warm_replicas"], plan["daily_cost"] / plan["replicas"])
+        self.assertTrue(any(line.startswith("**Warm Pool:**") for line in tight["justification"]))
+
+        self.assertNotIn("warm_pool", generate_recommendation(realtime_input, self.resources, self.pricing))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.storage import plan_storage, read_throughput
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "Small",
+            "dataset_size": "Very Large (>1TB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Cost",
+            "budget_limit": None,
+            "deadline": None,
+            "epochs": 20
+        }
+
+    def test_throughput_limited_by_network(self):
+        """Test that reads are capped by the tier and the instance network"""
+        tiers = self.resources["storage_tiers"]
+        economy = self.resources["instance_types"]["flex-economy"]
+        performance = self.resources["instance_types"]["flex-performance"]
+
+        self.assertEqual(read_throughput(tiers["performance"], economy, 1), economy["network_gb_per_s"])
+        self.assertEqual(read_throughput(tiers["performance"], performance, 2), 2 * tiers["performance"]["read_gb_per_s"])
+
+    def test_compute_bound_job(self):
+        """Test that small datasets leave the compute estimate unchanged"""
+        plan = plan_storage("Medium (1GB-10GB)", 2.0, 10.0, 1, "flex-standard", self.resources, self.pricing)
+
+        self.assertEqual(plan["recommended_tier"], "standard")
+        self.assertFalse(plan["io_bound"])
+        self.assertEqual(plan["job_hours"], 2.0)
+        self.assertAlmostEqual(plan["total_cost"], 20.0 + 5 * 0.02 * 2.0 / 730)
+
+    def test_io_bound_job_picks_faster_tier(self):
+        """Test that an I/O-bound job moves to the performance tier"""
+        plan = plan_storage(
+            "Very Large (>1TB)", 1.0, 10.0, 1, "flex-performance", self.resources, self.pricing, {"epochs": 20}
+        )
+        standard = plan["tiers"]["standard"]
+
+        self.assertTrue(standard["io_bound"])
+        self.assertAlmostEqual(standard["job_hours"], 2000 * 20 / 1.0 / 3600)
+        self.assertEqual(plan["recommended_tier"], "performance")
+        self.assertLess(plan["total_cost"], standard["total_cost"])
+
+        # Archive pays a restore delay and a per-GB retrieval fee
+        archive = plan["tiers"]["archive"]
+        self.assertGreater(archive["job_hours"], self.resources["storage_tiers"]["archive"]["staging_hours"])
+        self.assertAlmostEqual(archive["io_cost"], 2000 * 20 * 0.02)
+
+    def test_deadline_picks_faster_tier(self):
+        """Test that a tier missing the deadline loses to a dearer one that meets it"""
+        args = ("Very Large (>1TB)", 0.1, 0.05, 1, "flex-economy", self.resources, self.pricing, {"epochs": 5})
+        self.assertEqual(plan_storage(*args)["recommended_tier"], "standard")
+
+        plan = plan_storage(*args, deadline_hours=2.5)
+        self.assertGreater(plan["tiers"]["standard"]["job_hours"], 2.5)
+        self.assertEqual(plan["recommended_tier"], "performance")
+        self.assertLessEqual(plan["job_hours"], 2.5)
+
+        # With no tier in time the cheapest still wins
+        self.assertEqual(plan_storage(*args, deadline_hours=1.0)["recommended_tier"], "standard")
+
+    def test_io_bound_deadline_is_rechecked(self):
+        """Test that the deadline check reflects the I/O-bound job time"""
+        recommendation = generate_recommendation(dict(self.test_input, deadline=8), self.resources, self.pricing)
+        deadline_check = recommendation["deadline_check"]
+
+        self.assertTrue(recommendation["storage_plan"]["io_bound"])
+        self.assertGreater(deadline_check["estimated_hours"], 8)
+        self.assertFalse(deadline_check["meets_deadline"])
+        self.assertTrue(any(line.startswith("**Deadline Warning") for line in recommendation["justification"]))
+
+        relaxed = generate_recommendation(dict(self.test_input, deadline=12), self.resources, self.pricing)
+        self.assertTrue(relaxed["deadline_check"]["meets_deadline"])
+
+    def test_recommendation_includes_storage(self):
+        """Test that the engine reports the tier and total job cost"""
+        recommendation = generate_recommendation(self.test_input, self.resources, self.pricing)
+        plan = recommendation["storage_plan"]
+
+        self.assertGreaterEqual(plan["job_hours"], plan["compute_hours"])
+        self.assertEqual(recommendation["estimated_total_cost"], round(plan["total_cost"], 2))
+        self.assertTrue(any(line.startswith("**Storage Tier") for line in recommendation["justification"]))
+
+        realtime = generate_recommendation(dict(self.test_input, task_type="Real-time Inference"), self.resources)
+        self.assertNotIn("storage_plan", realtime)
+
+if __name__ == "__main__":
+    unittest.main()
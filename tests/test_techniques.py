@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_pricing, load_resource_configs
+from src.techniques import DEFAULT_TECHNIQUES, technique_factors
+
+class TestTechniques(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.pricing = load_pricing()
+        self.test_input = {
+            "task_type": "Fine-tuning",
+            "model_size": "XL",
+            "dataset_size": "Medium (1GB-10GB)",
+            "framework": "PyTorch",
+            "priority": "Balanced",
+            "budget_limit": None,
+            "deadline": None
+        }
+
+    def test_factors(self):
+        """Test that technique factors combine and skip other tasks"""
+        self.assertEqual(self.resources["training_techniques"], DEFAULT_TECHNIQUES)
+        self.assertIsNone(technique_factors(self.test_input, self.resources))
+
+        factors = technique_factors(dict(self.test_input, lora=True, activation_checkpointing=True), self.resources)
+        self.assertEqual(factors["techniques"], ["lora", "activation_checkpointing"])
+        self.assertAlmostEqual(factors["memory_factor"], 0.24)
+        self.assertAlmostEqual(factors["throughput_factor"], 0.975)
+
+        # Adapters only apply to fine-tuning
+        self.assertIsNone(technique_factors(dict(self.test_input, task_type="Training", qlora=True), self.resources))
+
+        with self.assertRaises(ValueError):
+            technique_factors(dict(self.test_input, lora=True, qlora=True), self.resources)
+
+    def test_qlora_right_sizes(self):
+        """Test that QLoRA fits XL fine-tuning on a single A10G"""
+        full = generate_recommendation(self.test_input, self.resources, self.pricing)
+        qlora = generate_recommendation(dict(self.test_input, qlora=True), self.resources, self.pricing)
+
+        self.assertEqual((full["gpu_type"], full["gpu_count"]), ("NVIDIA A100", 2))
+        self.assertEqual((qlora["gpu_type"], qlora["gpu_count"]), ("NVIDIA A10G", 1))
+        self.assertEqual(qlora["techniques"]["memory_gb"], 24)
+        self.assertLess(qlora["estimated_total_cost"], full["estimated_total_cost"])
+        self.assertTrue(any("QLoRA" in line for line in qlora["justification"]))
+
+        # Minimizing time keeps the configuration and only scales the time
+        fast = generate_recommendation(dict(self.test_input, qlora=True, priority="Minimize Time"), self.resources, self.pricing)
+        baseline = generate_recommendation(dict(self.test_input, priority="Minimize Time"), self.resources, self.pricing)
+        self.assertEqual((fast["gpu_type"], fast["gpu_count"]), (baseline["gpu_type"], baseline["gpu_count"]))
+        self.assertAlmostEqual(
+            fast["storage_plan"]["compute_hours"] * 0.9, baseline["storage_plan"]["compute_hours"], places=6
+        )
+
+    def test_flop_estimates(self):
+        """Test that mixed precision sets the FLOP precision instead of scaling time"""
+        flop_input = dict(self.test_input, parameters=7e9, training_tokens=1e9, mixed_precision=True)
+        fp32 = generate_recommendation(dict(flop_input, precision="fp32"), self.resources, self.pricing)
+        bf16 = generate_recommendation(flop_input, self.resources, self.pricing)
+
+        self.assertEqual(fp32["gpu_type"], bf16["gpu_type"])
+        self.assertEqual(fp32["gpu_count"], bf16["gpu_count"])
+        self.assertLess(bf16["storage_plan"]["compute_hours"], fp32["storage_plan"]["compute_hours"] / 10)
+
+    def test_deadline_uses_technique_time(self):
+        """Test that the deadline stage sees the technique-adjusted time"""
+        recommendation = generate_recommendation(dict(self.test_input, qlora=True, deadline=5), self.resources, self.pricing)
+
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+        self.assertLessEqual(recommendation["storage_plan"]["compute_hours"], 5)
+
+if __name__ == "__main__":
+    unittest.main()
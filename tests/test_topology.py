@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+import copy
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advisor_engine import generate_recommendation, load_resource_configs
+from src.deadline import solve_deadline
+from src.time_model import estimate_hours
+from src.topology import estimate_cluster_hours, parallel_layout
+
+class TestTopology(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test resources and inputs"""
+        self.resources = load_resource_configs()
+        self.test_input = {
+            "task_type": "Training",
+            "model_size": "XL",
+            "dataset_size": "Very Large (>1TB)",
+            "framework": "PyTorch",
+            "priority": "Minimize Time",
+            "budget_limit": None,
+            "deadline": None
+        }
+
+    def test_single_node_matches_time_model(self):
+        """Test that jobs within one node keep the time model unchanged"""
+        for gpu_count in range(1, 9):
+            hours, layout = estimate_cluster_hours(
+                "Training", "XL", "Very Large (>1TB)", "NVIDIA T4", gpu_count, "flex-economy", self.resources
+            )
+            self.assertEqual(hours, estimate_hours("Training", "XL", "Very Large (>1TB)", 1.0, gpu_count))
+            self.assertEqual(layout["nodes"], 1)
+            self.assertEqual(layout["time_factor"], 1.0)
+
+        # 120 GB of XL training state needs all eight 16 GB GPUs
+        layout = parallel_layout("Training", "XL", "NVIDIA T4", 8, "flex-economy", self.resources)
+        self.assertEqual((layout["tensor_parallel"], layout["data_parallel"]), (8, 1))
+
+    def test_multi_node_overheads(self):
+        """Test all-reduce and pipeline costs across nodes"""
+        slow = parallel_layout("Training", "Large", "NVIDIA H100", 32, "flex-economy", self.resources)
+        fast = parallel_layout("Training", "Large", "NVIDIA H100", 32, "flex-performance", self.resources)
+
+        self.assertEqual(slow["nodes"], 4)
+        self.assertGreater(slow["all_reduce_overhead"], fast["all_reduce_overhead"])
+        self.assertGreater(slow["time_factor"], fast["time_factor"])
+
+        # Inference has no gradient all-reduce
+        inference = parallel_layout("Batch Inference", "Large", "NVIDIA H100", 32, "flex-economy", self.resources)
+        self.assertEqual(inference["all_reduce_overhead"], 0.0)
+
+        # A model that does not fit in a 4-GPU node is pipelined across nodes
+        resources = copy.deepcopy(self.resources)
+        resources["version"] = "four-gpu-nodes"
+        resources["instance_types"]["flex-economy"]["topology"]["gpus_per_node"] = 4
+        layout = parallel_layout("Training", "XL", "NVIDIA T4", 16, "flex-economy", resources)
+        self.assertEqual((layout["tensor_parallel"], layout["pipeline_parallel"], layout["data_parallel"]), (4, 2, 2))
+        self.assertEqual(layout["pipeline_bubble"], 1 / 8)
+
+    def test_recommendation_spans_nodes(self):
+        """Test that large jobs are no longer capped at one node"""
+        recommendation = generate_recommendation(self.test_input, self.resources)
+
+        self.assertGreater(recommendation["gpu_count"], 8)
+        self.assertEqual(recommendation["parallelism"]["nodes"], 2)
+
+        hours, _ = estimate_cluster_hours(
+            "Training", "XL", "Very Large (>1TB)", recommendation["gpu_type"],
+            recommendation["gpu_count"], recommendation["instance_type"], self.resources
+        )
+        self.assertEqual(recommendation["estimated_time"], f"{hours:.1f} hours")
+
+    def test_deadline_scales_past_one_node(self):
+        """Test that the solver adds nodes when one node is too slow"""
+        solution = solve_deadline("Training", "XL", "Very Large (>1TB)", 2.0, self.resources)
+
+        self.assertTrue(solution["feasible"])
+        for option in solution["options"]:
+            self.assertGreater(option["gpu_count"], 8)
+            self.assertLessEqual(option["estimated_hours"], 2.0)
+            fewer, _ = estimate_cluster_hours(
+                "Training", "XL", "Very Large (>1TB)", option["gpu_type"],
+                option["gpu_count"] - 1, option["instance_type"], self.resources
+            )
+            self.assertGreater(fewer, 2.0)
+
+        recommendation = generate_recommendation(dict(self.test_input, deadline=2), self.resources)
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+        self.assertGreater(recommendation["parallelism"]["nodes"], 1)
+
+    def test_deadline_reachable_only_across_nodes(self):
+        """Test deadlines whose single-node minimum exceeds every allowed count"""
+        solution = solve_deadline("Training", "XL", "Very Large (>1TB)", 0.854, self.resources)
+
+        self.assertTrue(solution["feasible"])
+        self.assertLessEqual(solution["fastest_hours"], 0.854)
+        self.assertGreater(solution["best"]["gpu_count"], 8)
+        self.assertLessEqual(solution["best"]["estimated_hours"], 0.854)
+
+        recommendation = generate_recommendation(
+            dict(self.test_input, priority="Balanced", deadline=0.854), self.resources
+        )
+        self.assertTrue(recommendation["deadline_check"]["meets_deadline"])
+        self.assertGreater(recommendation["parallelism"]["nodes"], 1)
+
+    def test_deadline_layout_uses_memory_factor(self):
+        """Test that multi-node deadline options are timed with the techniques' memory footprint"""
+        resources = copy.deepcopy(self.resources)
+        resources["gpu_types"]["NVIDIA T4"]["vram"] = "8 GB"
+        
+        solution = solve_deadline("Training", "XL", "Very Large (>1TB)", 8.0, resources, memory_factor=0.25)
+        options = [option for option in solution["options"] if option["gpu_type"] == "NVIDIA T4"]
+        self.assertTrue(options)
+        for option in options:
+            self.assertGreater(option["gpu_count"], 8)
+            hours, _ = estimate_cluster_hours(
+                "Training", "XL", "Very Large (>1TB)", "NVIDIA T4",
+                option["gpu_count"], option["instance_type"], resources, 0.25
+            )
+            self.assertEqual(option["estimated_hours"], hours)
+            fewer, _ = estimate_cluster_hours(
+                "Training", "XL", "Very Large (>1TB)", "NVIDIA T4",
+                option["gpu_count"] - 1, option["instance_type"], resources, 0.25
+            )
+            self.assertGreater(fewer, 8.0)
+        
+        # The sweep times multi-node candidates the same way
+        from src.sensitivity import sweep_deadline
+        test_input = dict(self.test_input, task_type="Fine-tuning", priority="Minimize Cost", qlora=True,
+                          constraints=["gpu_type == T4"])
+        for segment in sweep_deadline(test_input, (4.0, 24.0), resources)["segments"]:
+            for deadline in (segment["start"], (segment["start"] + segment["end"]) / 2):
+                result = generate_recommendation(dict(test_input, deadline=deadline), resources)
+                self.assertEqual(
+                    (result["gpu_type"], result["gpu_count"], result["instance_type"]),
+                    (segment["gpu_type"], segment["gpu_count"], segment["instance_type"])
+                )
+
+if __name__ == "__main__":
+    unittest.main()